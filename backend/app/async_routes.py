@@ -0,0 +1,117 @@
+"""
+Async versions of the API routers
+
+In async mode (DB_MODE=async) every route that takes a database session is
+served by an `async def` endpoint on the event loop instead of a sync one
+in AnyIO's threadpool. The endpoint receives an AsyncSession (asyncpg) and
+runs the original handler through AsyncSession.run_sync: the handler code
+is shared between both modes, but each query is awaited on the event loop,
+so a request waiting on Postgres no longer holds a threadpool slot.
+
+The handler's Python code still runs on the event loop, between queries,
+and holds up every other request while it runs. Routes that spend their
+time pricing rather than waiting on Postgres (batch calculation, price
+curves, quote creation, rate impact) are marked @cpu_bound and stay sync
+routes in the threadpool, with a psycopg2 session, in both modes.
+
+The handler's return value is converted to its response model (or plain
+JSON data) inside run_sync, before the session is released. Async sessions
+never lazy load (see app.db.AsyncModeSession): a relationship the handler
+did not load up front (joinedload/selectinload, as the sync routes do for
+their own queries) raises sqlalchemy.exc.InvalidRequestError, and the
+request fails with a 500 instead of emitting SQL from pydantic's validator.
+"""
+import inspect
+from functools import wraps
+from typing import Any, Callable, Optional
+
+from fastapi import APIRouter, Depends, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.routing import APIRoute
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from .db import get_db, get_async_db
+
+
+def _session_parameter(endpoint: Callable) -> Optional[str]:
+    """Name of the endpoint's Depends(get_db) parameter, if any"""
+    for parameter in inspect.signature(endpoint).parameters.values():
+        if getattr(parameter.default, "dependency", None) is get_db:
+            return parameter.name
+    return None
+
+
+def cpu_bound(endpoint: Callable) -> Callable:
+    """Keep a route whose handler is mostly computation in the threadpool in async mode"""
+    endpoint.cpu_bound = True
+    return endpoint
+
+
+def _materialize(result: Any, adapter: Optional[TypeAdapter]) -> Any:
+    """Load everything the response needs while the session is usable"""
+    if isinstance(result, Response):
+        return result
+    if adapter is not None:
+        return adapter.validate_python(result, from_attributes=True)
+    return jsonable_encoder(result)
+
+
+def async_endpoint(endpoint: Callable, response_model: Any = None) -> Callable:
+    """Wrap a sync endpoint taking Depends(get_db) into an async one taking an AsyncSession"""
+    db_name = _session_parameter(endpoint)
+    adapter = TypeAdapter(response_model) if response_model is not None else None
+
+    @wraps(endpoint)
+    async def wrapper(**kwargs):
+        db: AsyncSession = kwargs.pop(db_name)
+
+        def call(session: Session) -> Any:
+            return _materialize(endpoint(**kwargs, **{db_name: session}), adapter)
+
+        return await db.run_sync(call)
+
+    signature = inspect.signature(endpoint)
+    wrapper.__signature__ = signature.replace(
+        parameters=[
+            parameter.replace(annotation=AsyncSession, default=Depends(get_async_db))
+            if parameter.name == db_name else parameter
+            for parameter in signature.parameters.values()
+        ],
+        return_annotation=inspect.Signature.empty,
+    )
+    return wrapper
+
+
+def async_router(router: APIRouter) -> APIRouter:
+    """Copy of router whose database routes are served by async endpoints"""
+    converted = APIRouter()
+    for route in router.routes:
+        if (
+            not isinstance(route, APIRoute)
+            or _session_parameter(route.endpoint) is None
+            or getattr(route.endpoint, "cpu_bound", False)
+        ):
+            converted.routes.append(route)
+            continue
+
+        converted.add_api_route(
+            route.path,
+            async_endpoint(route.endpoint, route.response_model),
+            methods=route.methods,
+            response_model=route.response_model,
+            status_code=route.status_code,
+            tags=route.tags,
+            dependencies=route.dependencies,
+            summary=route.summary,
+            description=route.description,
+            response_description=route.response_description,
+            responses=route.responses,
+            deprecated=route.deprecated,
+            name=route.name,
+            operation_id=route.operation_id,
+            response_class=route.response_class,
+            include_in_schema=route.include_in_schema,
+        )
+    return converted
@@ -0,0 +1,164 @@
+"""
+Caching for quote calculations
+
+Revisions are tracked at two levels. Write endpoints bump the revision of
+whatever entity (part, machine, material) they change in this process,
+and database triggers bump a per kind generation in the revision_counters
+table on any write, from any API worker or from outside the API.
+RevisionRegistry.sync reads those generations; callers sync before they
+look anything up.
+
+Every cached calculation remembers both levels for the part, machines
+and material it was computed from. An entry whose dependencies have moved
+on is treated as a miss and dropped, so writes invalidate the cache
+without having to know which keys they affect. The entries themselves
+live in the process; each API worker keeps its own cache, but a write on
+one worker invalidates the others' entries at their next sync.
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from .models import RevisionCounter
+
+QUOTE_CACHE_MAX_ENTRIES = int(os.getenv("QUOTE_CACHE_MAX_ENTRIES", "2048"))
+QUOTE_CACHE_TTL_SECONDS = float(os.getenv("QUOTE_CACHE_TTL_SECONDS", "300"))
+
+Dependency = Tuple[str, int]  # ("part" | "machine" | "material", id)
+
+MISSING = object()
+
+
+class RevisionRegistry:
+    """Monotonic revision counters for cached entities"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._revisions: Dict[Dependency, int] = {}
+        # Per kind generations from revision_counters, as of the last sync
+        self._generations: Dict[str, int] = {}
+        # Incremented on every bump and on every generation a sync finds
+        # moved; lets callers detect writes during a load
+        self.epoch = 0
+
+    def get(self, kind: str, entity_id: int) -> int:
+        return self._revisions.get((kind, entity_id), 0)
+
+    def generation(self, kind: str) -> int:
+        """Shared write count for any entity of this kind, as of the last sync"""
+        return self._generations.get(kind, 0)
+
+    def sync(self, db: Session) -> None:
+        """Read the shared generations, picking up writes made by other processes"""
+        rows = db.execute(select(RevisionCounter.kind, RevisionCounter.generation)).all()
+        with self._lock:
+            for kind, generation in rows:
+                if self._generations.get(kind) != generation:
+                    self._generations[kind] = generation
+                    self.epoch += 1
+
+    def bump(self, kind: str, entity_id: int) -> None:
+        """Record a write to an entity, invalidating everything derived from it"""
+        with self._lock:
+            key = (kind, entity_id)
+            self._revisions[key] = self._revisions.get(key, 0) + 1
+            self.epoch += 1
+
+    def snapshot(self, deps: Iterable[Dependency]) -> Tuple[Tuple[str, int, int, int], ...]:
+        return tuple(
+            (kind, entity_id, self.get(kind, entity_id), self.generation(kind)) for kind, entity_id in deps
+        )
+
+    def is_current(self, snapshot: Tuple[Tuple[str, int, int, int], ...]) -> bool:
+        return all(
+            self.get(kind, entity_id) == rev and self.generation(kind) == generation
+            for kind, entity_id, rev, generation in snapshot
+        )
+
+
+class VersionedLRUCache:
+    """Bounded LRU cache with TTL whose entries are validated against revisions"""
+
+    def __init__(self, revisions: RevisionRegistry, max_entries: int = 2048, ttl_seconds: float = 300):
+        self.revisions = revisions
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, Tuple[Any, tuple, float]]" = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def get(self, key: Hashable) -> Any:
+        """Return the cached value for key, or MISSING (sync the registry first)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return MISSING
+
+            value, snapshot, expires_at = entry
+            if time.monotonic() >= expires_at:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return MISSING
+            if not self.revisions.is_current(snapshot):
+                del self._entries[key]
+                self.invalidations += 1
+                self.misses += 1
+                return MISSING
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any, deps: Iterable[Dependency], epoch: int) -> None:
+        """
+        Store a value computed from deps.
+
+        epoch is the registry epoch read after syncing and before the data
+        was loaded. If any write has been seen since then the value may be
+        stale and is not stored.
+        """
+        if self.max_entries <= 0 or epoch != self.revisions.epoch:
+            return
+
+        snapshot = self.revisions.snapshot(deps)
+        with self._lock:
+            self._entries[key] = (value, snapshot, time.monotonic() + self.ttl_seconds)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
+
+
+revisions = RevisionRegistry()
+quote_cache = VersionedLRUCache(revisions, QUOTE_CACHE_MAX_ENTRIES, QUOTE_CACHE_TTL_SECONDS)
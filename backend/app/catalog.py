@@ -0,0 +1,112 @@
+"""
+In-process catalog of machine and material rates
+
+Machines and materials are a few dozen rows that change rarely, yet every
+quote calculation needs their rates. The catalog loads both tables once
+into an immutable snapshot and reloads it when the machine or material
+revision generation moves, so quoting paths only have to query parts and
+operations. The generations come from the revision_counters table (see
+app.cache.RevisionRegistry), which triggers bump on any write to machines
+or materials: rates changed by another API worker, a seed, a migration or
+plain SQL are picked up at the next snapshot() in every process.
+"""
+
+import threading
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from . import models
+from .cache import RevisionRegistry, revisions
+
+
+@dataclass(frozen=True)
+class MachineRates:
+    id: int
+    name: str
+    machine_rate_per_hr: float
+    labor_rate_per_hr: float
+
+
+@dataclass(frozen=True)
+class MaterialRates:
+    id: int
+    name: str
+    cost_per_lb: float
+
+
+@dataclass(frozen=True)
+class CatalogSnapshot:
+    machines: Dict[int, MachineRates]
+    materials: Dict[int, MaterialRates]
+
+    def has(self, machine_ids: Iterable[int] = (), material_ids: Iterable[int] = ()) -> bool:
+        return (
+            all(machine_id in self.machines for machine_id in machine_ids)
+            and all(material_id in self.materials for material_id in material_ids)
+        )
+
+
+class RateCatalog:
+    """Lazily loaded, revision-checked snapshot of machine and material rates"""
+
+    def __init__(self, revisions: RevisionRegistry):
+        self.revisions = revisions
+        self._lock = threading.Lock()
+        self._snapshot: Optional[CatalogSnapshot] = None
+        self._generations: Tuple[int, int] = (-1, -1)
+        self.loads = 0
+
+    def _current_generations(self) -> Tuple[int, int]:
+        return (self.revisions.generation("machine"), self.revisions.generation("material"))
+
+    def snapshot(self, db: Session) -> CatalogSnapshot:
+        """
+        Return the current snapshot of every machine and material.
+
+        Costs one query on revision_counters, plus a reload when a machine
+        or material has been written since the last load. Any insert moves
+        the generation, so an id the current snapshot lacks does not exist;
+        callers check the snapshot for the ids they need.
+        """
+        self.revisions.sync(db)
+        generations = self._current_generations()
+        snapshot = self._snapshot
+        if snapshot is not None and self._generations == generations:
+            return snapshot
+
+        # Load without holding the lock: in async mode the queries yield to the
+        # event loop, and another request blocking on the lock from the same
+        # thread would never let them finish. Concurrent misses may each load;
+        # the last to finish is published along with the generations it saw
+        # before loading, so a stale one is simply reloaded on the next call.
+        snapshot = self._load(db)
+        with self._lock:
+            self._snapshot = snapshot
+            self._generations = generations
+        return snapshot
+
+    def _load(self, db: Session) -> CatalogSnapshot:
+        self.loads += 1
+        machines = {
+            row.id: MachineRates(row.id, row.name, row.machine_rate_per_hr, row.labor_rate_per_hr)
+            for row in db.query(
+                models.Machine.id,
+                models.Machine.name,
+                models.Machine.machine_rate_per_hr,
+                models.Machine.labor_rate_per_hr,
+            )
+        }
+        materials = {
+            row.id: MaterialRates(row.id, row.name, row.cost_per_lb)
+            for row in db.query(models.Material.id, models.Material.name, models.Material.cost_per_lb)
+        }
+        return CatalogSnapshot(machines=machines, materials=materials)
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._snapshot = None
+
+
+catalog = RateCatalog(revisions)
@@ -0,0 +1,218 @@
+"""
+gzip / brotli response compression
+
+CompressionMiddleware compresses JSON and text responses of at least
+COMPRESSION_MIN_BYTES with the best coding the client accepts: brotli when
+the brotli package is installed, else gzip. Streamed responses
+(calculate-batch) are compressed chunk by chunk and flushed as they go.
+
+A strong ETag names one exact representation, so when a coding is
+negotiated the ETag gets it appended ("...-br"). The suffix is stripped from
+If-None-Match on the way in, so app.http_cache compares against the
+identity ETag; tags carrying another coding are dropped. A 304 carries the ETag of the representation this request
+would have received: the suffix of the coding negotiated from its own
+Accept-Encoding, not the one the client sent back.
+"""
+
+import os
+import zlib
+from typing import List, Optional, Tuple
+
+try:
+    import brotli
+except ImportError:  # optional: gzip only
+    brotli = None
+
+COMPRESSION_MIN_BYTES = int(os.getenv("COMPRESSION_MIN_BYTES", "1024"))
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 4  # favours speed; responses are compressed per request
+
+COMPRESSIBLE_TYPES = (b"application/json", b"application/x-ndjson", b"text/")
+# Event streams are left alone: proxies and clients expect them unbuffered
+UNCOMPRESSED_TYPES = (b"text/event-stream",)
+CODINGS = ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def choose_coding(accept_encoding: str) -> Optional[str]:
+    """Preferred coding the client accepts (q > 0), or None"""
+    accepted = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[coding.strip().lower()] = q
+    for coding in CODINGS:
+        if accepted.get(coding, accepted.get("*", 0.0)) > 0:
+            return coding
+    return None
+
+
+class _Compressor:
+    def __init__(self, coding: str):
+        if coding == "br":
+            self._br = brotli.Compressor(quality=BROTLI_QUALITY)
+            self._zlib = None
+        else:
+            self._br = None
+            self._zlib = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def chunk(self, data: bytes) -> bytes:
+        """Compress data and flush it so the client can decode it now"""
+        if self._br is not None:
+            return self._br.process(data) + self._br.flush()
+        return self._zlib.compress(data) + self._zlib.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self, data: bytes = b"") -> bytes:
+        if self._br is not None:
+            return self._br.process(data) + self._br.finish()
+        return self._zlib.compress(data) + self._zlib.flush()
+
+
+def _header(headers: List[Tuple[bytes, bytes]], name: bytes) -> Optional[bytes]:
+    for key, value in headers:
+        if key.lower() == name:
+            return value
+    return None
+
+
+def _replace_header(headers: List[Tuple[bytes, bytes]], name: bytes, value: Optional[bytes]) -> List[Tuple[bytes, bytes]]:
+    result = [(key, v) for key, v in headers if key.lower() != name]
+    if value is not None:
+        result.append((name, value))
+    return result
+
+
+def _add_vary(headers: List[Tuple[bytes, bytes]]) -> List[Tuple[bytes, bytes]]:
+    """Add Accept-Encoding to Vary, keeping what CORS put there"""
+    vary = _header(headers, b"vary")
+    if vary and b"accept-encoding" in vary.lower():
+        return headers
+    return _replace_header(headers, b"vary", vary + b", Accept-Encoding" if vary else b"Accept-Encoding")
+
+
+def _with_suffix(etag: bytes, coding: str) -> bytes:
+    if not etag.endswith(b'"'):
+        return etag
+    return etag[:-1] + b"-" + coding.encode() + b'"'
+
+
+def _identity_if_none_match(if_none_match: bytes, coding: Optional[str]) -> Optional[bytes]:
+    """
+    If-None-Match with the negotiated coding's suffix stripped. ETags of
+    other codings name representations this request would not get, so they
+    are dropped rather than compared as identity ETags.
+    """
+    suffixes = {known: b"-" + known.encode() + b'"' for known in CODINGS}
+    kept = []
+    for candidate in if_none_match.split(b","):
+        candidate = candidate.strip()
+        tag_coding = next((known for known, suffix in suffixes.items() if candidate.endswith(suffix)), None)
+        if candidate == b"*":
+            kept.append(candidate)
+        elif tag_coding == coding:
+            kept.append(candidate[:-len(suffixes[coding])] + b'"' if coding else candidate)
+    return b", ".join(kept) if kept else None
+
+
+def _negotiated_etag(headers: List[Tuple[bytes, bytes]], coding: str) -> List[Tuple[bytes, bytes]]:
+    """
+    Suffix the ETag with the negotiated coding. Bodies under the minimum size
+    go out uncompressed but keep the suffix, so the ETag depends only on the
+    validator and Accept-Encoding, which is all a 304 has to go on.
+    """
+    etag = _header(headers, b"etag")
+    if not etag:
+        return headers
+    return _replace_header(headers, b"etag", _with_suffix(etag, coding))
+
+
+class CompressionMiddleware:
+    def __init__(self, app, minimum_size: int = COMPRESSION_MIN_BYTES):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_headers = scope["headers"]
+        coding = choose_coding((_header(request_headers, b"accept-encoding") or b"").decode("latin-1"))
+
+        # Conditional GETs compare identity ETags
+        if_none_match = _header(request_headers, b"if-none-match")
+        if if_none_match:
+            # Modified in place: outer middleware reads the route from this scope
+            scope["headers"] = _replace_header(
+                request_headers, b"if-none-match", _identity_if_none_match(if_none_match, coding)
+            )
+
+        start_message = None
+        compressor: Optional[_Compressor] = None
+
+        async def send_compressed(message):
+            nonlocal start_message, compressor
+
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                if message["status"] == 304:
+                    if coding is not None:
+                        headers = _add_vary(_negotiated_etag(headers, coding))
+                    await send({**message, "headers": headers})
+                    return
+                content_type = _header(headers, b"content-type") or b""
+                if (
+                    coding is None
+                    or message["status"] < 200 or message["status"] in (204, 304)
+                    or _header(headers, b"content-encoding") is not None
+                    or not content_type.startswith(COMPRESSIBLE_TYPES)
+                    or content_type.startswith(UNCOMPRESSED_TYPES)
+                ):
+                    await send(message)
+                    return
+                # Decide on the first body chunk, once the size is known
+                start_message = {**message, "headers": headers}
+                return
+
+            if message["type"] != "http.response.body" or start_message is None:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            headers = start_message["headers"]
+
+            if compressor is None:
+                if not more_body and len(body) < self.minimum_size:
+                    start_message["headers"] = _add_vary(_negotiated_etag(headers, coding))
+                    await send(start_message)
+                    await send(message)
+                    start_message = None
+                    return
+
+                compressor = _Compressor(coding)
+                headers = _replace_header(headers, b"content-encoding", coding.encode())
+                headers = _add_vary(headers)
+                headers = _negotiated_etag(headers, coding)
+                if more_body:
+                    headers = _replace_header(headers, b"content-length", None)
+                    await send({**start_message, "headers": headers})
+                    await send({"type": "http.response.body", "body": compressor.chunk(body), "more_body": True})
+                    return
+                compressed = compressor.finish(body)
+                headers = _replace_header(headers, b"content-length", str(len(compressed)).encode())
+                await send({**start_message, "headers": headers})
+                await send({"type": "http.response.body", "body": compressed})
+                return
+
+            if more_body:
+                await send({"type": "http.response.body", "body": compressor.chunk(body), "more_body": True})
+            else:
+                await send({"type": "http.response.body", "body": compressor.finish(body)})
+
+        await self.app(scope, receive, send_compressed)
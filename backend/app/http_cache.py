@@ -0,0 +1,61 @@
+"""
+ETags and conditional GET for catalog and part endpoints
+
+A list or detail response only changes when an entity of its kind is
+written, and database triggers bump that kind's generation in the
+revision_counters table on every write, whichever API worker (or script)
+makes it. The ETag is therefore just the current generations of the kinds
+a route reads, which every worker computes the same:
+
+    "part7"
+
+The conditional() dependency reads them (one small query) and compares
+the ETag with If-None-Match before the endpoint body runs, so a match
+answers 304 without loading the entities.
+"""
+
+from typing import Callable, Optional
+
+from fastapi import HTTPException, Request, Response
+
+from .cache import revisions
+from .db import run_with_session
+
+# Stored responses must be revalidated before reuse; with an ETag that is a 304
+CACHE_CONTROL = "no-cache"
+
+
+def current_etag(*kinds: str) -> str:
+    """ETag for the kinds' generations as of the registry's last sync"""
+    generations = "-".join(f"{kind}{revisions.generation(kind)}" for kind in kinds)
+    return f'"{generations}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match uses weak comparison: W/ prefixes are ignored"""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+def conditional(*kinds: str) -> Callable:
+    """
+    Route dependency: answer 304 when the client's copy is current.
+
+    Otherwise the ETag is set on the response. The generations are read
+    before the endpoint queries, so a write racing with the request can
+    only make the ETag older than the data, never newer.
+    """
+    async def dependency(request: Request, response: Response) -> None:
+        await run_with_session(revisions.sync)
+        etag = current_etag(*kinds)
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            raise HTTPException(status_code=304, headers={"ETag": etag, "Cache-Control": CACHE_CONTROL})
+        response.headers["ETag"] = etag
+        response.headers["Cache-Control"] = CACHE_CONTROL
+
+    return dependency
@@ -0,0 +1,195 @@
+"""
+In-process background job queue
+
+Long-running work (building quotes with hundreds of lines) is submitted as
+a Job and run by a bounded ThreadPoolExecutor, so the request that starts
+it returns immediately with the job id. The worker reports progress
+through job.progress(done), which is also where cancellation takes effect:
+a cancelled job raises JobCancelled out of its work function, whose
+transaction is then rolled back.
+
+At most JOB_WORKERS jobs run at once and at most JOB_MAX_PENDING wait;
+beyond that submit() raises QueueFull. Finished jobs are kept for
+inspection up to JOB_RETENTION, oldest dropped first.
+
+Like the caches, jobs live in the process: a job is polled on the worker
+that accepted it, and queued or running jobs are lost on restart (a quote
+is only written when its job completes, so nothing is left half-built).
+"""
+
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from .metrics import registry
+
+logger = logging.getLogger(__name__)
+
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+JOB_MAX_PENDING = int(os.getenv("JOB_MAX_PENDING", "50"))
+JOB_RETENTION = int(os.getenv("JOB_RETENTION", "1000"))
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+FINISHED = (SUCCEEDED, FAILED, CANCELLED)
+
+
+class JobCancelled(Exception):
+    pass
+
+
+class QueueFull(Exception):
+    pass
+
+
+class Job:
+    """One unit of background work and its observable state"""
+
+    def __init__(self, kind: str, payload: Dict[str, Any], total: int, attempt: int = 1, retry_of: Optional[str] = None):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.payload = payload
+        self.attempt = attempt
+        self.retry_of = retry_of
+        self.status = QUEUED
+        self.done = 0
+        self.total = total
+        self.result: Any = None
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        # Bumped on every change; streams compare it to know when to send
+        self.version = 0
+        self.cancel_requested = threading.Event()
+        self.future: Optional[Future] = None
+
+    def progress(self, done: int) -> None:
+        """Report progress from the worker; raises JobCancelled if cancelled"""
+        if self.cancel_requested.is_set():
+            raise JobCancelled()
+        self.done = done
+        self.version += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "done": self.done,
+            "total": self.total,
+            "attempt": self.attempt,
+            "retry_of": self.retry_of,
+            "result": self.result,
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class JobQueue:
+    """Bounded thread pool running Jobs, with a registry to look them up"""
+
+    def __init__(self, workers: int = JOB_WORKERS, max_pending: int = JOB_MAX_PENDING, retention: int = JOB_RETENTION):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.retention = retention
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+
+    def submit(self, job: Job, work: Callable[[Job], Any]) -> Job:
+        """Queue job to be run as work(job); raises QueueFull when the backlog is full"""
+        with self._lock:
+            active = sum(1 for queued in self._jobs.values() if queued.status in (QUEUED, RUNNING))
+            if active >= self.workers + self.max_pending:
+                raise QueueFull()
+            self._jobs[job.id] = job
+            self._prune()
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="job")
+            executor = self._executor
+        job.future = executor.submit(self._run, job, work)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    def cancel(self, job: Job) -> None:
+        """Cancel a queued job at once, or a running one at its next progress report"""
+        job.cancel_requested.set()
+        if job.future is not None and job.future.cancel():
+            self._finish(job, CANCELLED)
+
+    def shutdown(self) -> None:
+        """
+        Cancel every queued and running job and wait for the worker threads
+        (server shutdown). Running jobs stop at their next progress report,
+        before anything is committed.
+        """
+        with self._lock:
+            executor, self._executor = self._executor, None
+        for job in list(self._jobs.values()):
+            if job.status in (QUEUED, RUNNING):
+                self.cancel(job)
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def counts(self) -> Dict[str, int]:
+        counts = dict.fromkeys((QUEUED, RUNNING, *FINISHED), 0)
+        for job in list(self._jobs.values()):
+            counts[job.status] += 1
+        return counts
+
+    def _run(self, job: Job, work: Callable[[Job], Any]) -> None:
+        if job.cancel_requested.is_set():
+            self._finish(job, CANCELLED)
+            return
+        job.status = RUNNING
+        job.started_at = time.time()
+        job.version += 1
+        try:
+            job.result = work(job)
+        except JobCancelled:
+            self._finish(job, CANCELLED)
+        except Exception as exc:
+            # HTTPException carries the message the synchronous endpoint would return
+            job.error = str(getattr(exc, "detail", None) or exc)
+            if not hasattr(exc, "detail"):
+                logger.exception("Job %s (%s) failed", job.id, job.kind)
+            self._finish(job, FAILED)
+        else:
+            self._finish(job, SUCCEEDED)
+
+    def _finish(self, job: Job, status: str) -> None:
+        job.status = status
+        job.finished_at = time.time()
+        job.version += 1
+
+    def _prune(self) -> None:
+        """Drop the oldest finished jobs beyond the retention limit (lock held)"""
+        excess = len(self._jobs) - self.retention
+        if excess <= 0:
+            return
+        for job_id in [job_id for job_id, job in self._jobs.items() if job.status in FINISHED][:excess]:
+            del self._jobs[job_id]
+
+
+job_queue = JobQueue()
+
+
+def _job_samples():
+    for status, count in job_queue.counts().items():
+        yield "background_jobs", {"status": status}, count
+
+
+registry.collector("background_jobs", "Background jobs held by this worker, by status", "gauge", _job_samples)
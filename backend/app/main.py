@@ -1,12 +1,36 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from .db import Base, engine
-from .routers import customers, materials, machines, parts, quotes
+from fastapi.responses import PlainTextResponse
+from .routers import customers, materials, machines, parts, quote_jobs, quotes, quote_session, rate_impact
+from .pagination import NEXT_CURSOR_HEADER, TOTAL_COUNT_HEADER
+from .db import DB_MODE
+from .async_routes import async_router
+from .metrics import MetricsMiddleware, registry
+from .query_stats import QUERY_COUNT_HEADER, QueryStatsMiddleware
+from .profiling import PROFILE_STAGES, StageProfilingMiddleware
+from .serialization import FastJSONResponse
+from .compression import CompressionMiddleware
+from .jobs import job_queue
+from .services.repricing import api_repricing_pool, repricing_pool
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Stop this worker process's background threads and repricing processes
+    job_queue.shutdown()
+    api_repricing_pool.shutdown()
+    repricing_pool.shutdown()
+
 
 app = FastAPI(
     title="CNC Quoting System",
     description="Professional CNC machining quoting engine with accurate cost calculation",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=FastJSONResponse,
+    lifespan=lifespan,
 )
 
 # CORS middleware for frontend communication
@@ -20,17 +44,34 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, TOTAL_COUNT_HEADER, QUERY_COUNT_HEADER, "Server-Timing", "ETag"],
 )
 
-# Create tables on startup
-Base.metadata.create_all(bind=engine)
+# gzip/brotli for JSON bodies of COMPRESSION_MIN_BYTES or more
+app.add_middleware(CompressionMiddleware)
+
+# Per-request SQL count and DB time (Server-Timing header, N+1 warnings)
+app.add_middleware(QueryStatsMiddleware)
 
-# Include routers
-app.include_router(customers.router)
-app.include_router(materials.router)
-app.include_router(machines.router)
-app.include_router(parts.router)
-app.include_router(quotes.router)
+# Load/marshal/compute/serialize timings per quote request (PROFILE_STAGES=1)
+if PROFILE_STAGES:
+    app.add_middleware(StageProfilingMiddleware)
+
+# Request latency, status and in-flight metrics, served at /metrics
+app.add_middleware(MetricsMiddleware)
+
+# Schema is managed by migrations (python -m app.migrate), run before the server starts
+
+# Include routers (served by async endpoints when DB_MODE=async).
+# Quote jobs come before quotes so /api/quotes/jobs is not taken for /api/quotes/{quote_id}
+for router in (
+    customers.router, materials.router, machines.router, parts.router,
+    quote_jobs.router, rate_impact.router, quotes.router,
+):
+    app.include_router(async_router(router) if DB_MODE == "async" else router)
+
+# Live pricing WebSocket (opens its own short sessions in either mode)
+app.include_router(quote_session.router)
 
 @app.get("/")
 def root():
@@ -43,3 +84,8 @@ def root():
 @app.get("/health")
 def health():
     return {"status": "healthy", "service": "cnc-quoting-api"}
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus metrics for this worker process"""
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
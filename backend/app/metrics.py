@@ -0,0 +1,258 @@
+"""
+Request, database pool and engine metrics in Prometheus text format
+
+A small in-process registry: counters, gauges and histograms keep one
+preallocated child per label combination, so recording a value is a dict
+lookup and a few additions under a lock. Values that already live
+elsewhere (pool occupancy, threadpool tokens) are read by collectors at
+scrape time instead of being tracked per request.
+
+MetricsMiddleware times every HTTP request and labels it with the route
+template (/api/quotes/{quote_id}), never the raw path, so label
+cardinality stays bounded. Requests that match no route are labelled
+"unmatched".
+
+State lives in the process; each API worker exposes its own /metrics.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+ENGINE_BUCKETS = (0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.1)
+
+Sample = Tuple[str, Dict[str, str], float]  # name, labels, value
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", r"\\").replace('"', r"\"").replace("\n", r"\n")
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._lock = threading.Lock()
+        self._children: Dict[tuple, list] = {}
+
+    def _new_child(self) -> list:
+        return [0.0]
+
+    def _child(self, label_values: tuple) -> list:
+        child = self._children.get(label_values)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(label_values, self._new_child())
+        return child
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        for label_values, child in sorted(self._children.items()):
+            lines.extend(self._render_child(label_values, child))
+        return lines
+
+    def _render_child(self, label_values: tuple, child: list) -> List[str]:
+        return [f"{self.name}{_format_labels(self.labels, label_values)} {_format_value(child[0])}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, *label_values, amount: float = 1) -> None:
+        child = self._child(label_values)
+        with self._lock:
+            child[0] += amount
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def inc(self, *label_values, amount: float = 1) -> None:
+        child = self._child(label_values)
+        with self._lock:
+            child[0] += amount
+
+    def dec(self, *label_values, amount: float = 1) -> None:
+        self.inc(*label_values, amount=-amount)
+
+    def set(self, value: float, *label_values) -> None:
+        child = self._child(label_values)
+        with self._lock:
+            child[0] = value
+
+
+class _Timer:
+    """Context manager that observes its elapsed time into a histogram"""
+    __slots__ = ("histogram", "label_values", "start")
+
+    def __init__(self, histogram: "Histogram", label_values: tuple):
+        self.histogram = histogram
+        self.label_values = label_values
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self.start, *self.label_values)
+        return False
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self) -> list:
+        # Per-bucket counts (non-cumulative, plus +Inf), then sum
+        return [0] * (len(self.buckets) + 1) + [0.0]
+
+    def observe(self, value: float, *label_values) -> None:
+        child = self._child(label_values)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            child[index] += 1
+            child[-1] += value
+
+    def time(self, *label_values) -> _Timer:
+        """with histogram.time("label"): ... observes the block's duration"""
+        return _Timer(self, label_values)
+
+    def _render_child(self, label_values: tuple, child: list) -> List[str]:
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float("inf"),), child[:-1]):
+            cumulative += count
+            le = 'le="' + _format_value(bound) + '"'
+            lines.append(f"{self.name}_bucket{_format_labels(self.labels, label_values, le)} {cumulative}")
+        labels = _format_labels(self.labels, label_values)
+        lines.append(f"{self.name}_sum{labels} {_format_value(child[-1])}")
+        lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+        self._collectors: List[Tuple[str, str, str, Callable[[], Iterable[Sample]]]] = []
+
+    def counter(self, name: str, help: str, labels: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, help, labels))
+
+    def gauge(self, name: str, help: str, labels: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, help, labels))
+
+    def histogram(self, name: str, help: str, labels: Sequence[str] = (), **kwargs) -> Histogram:
+        return self._register(Histogram(name, help, labels, **kwargs))
+
+    def collector(self, name: str, help: str, kind: str, collect: Callable[[], Iterable[Sample]]) -> None:
+        """Register a metric whose samples are produced at scrape time"""
+        self._collectors.append((name, help, kind, collect))
+
+    def _register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        for name, help, kind, collect in self._collectors:
+            lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} {kind}")
+            for sample_name, labels, value in collect():
+                lines.append(f"{sample_name}{_format_labels(list(labels), list(labels.values()))} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+HTTP_REQUESTS = registry.counter(
+    "http_requests_total", "HTTP requests by route template and status code", ("method", "route", "status"),
+)
+HTTP_REQUEST_SECONDS = registry.histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template", ("method", "route"),
+)
+HTTP_IN_FLIGHT = registry.gauge(
+    "http_requests_in_flight", "HTTP requests currently being served", ("method",),
+)
+DB_POOL_WAIT_SECONDS = registry.histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time to check a connection out of the pool (including connecting a new one)",
+    ("engine",),
+)
+ENGINE_SECONDS = registry.histogram(
+    "quote_engine_seconds", "Quoting engine compute time per call", ("engine",), buckets=ENGINE_BUCKETS,
+)
+
+
+def _threadpool_samples() -> Iterable[Sample]:
+    # Sync endpoints and dependencies run on AnyIO's default thread limiter
+    try:
+        from anyio import to_thread
+        limiter = to_thread.current_default_thread_limiter()
+    except RuntimeError:  # no event loop running (e.g. rendered from a script)
+        return []
+    return [
+        ("threadpool_tokens", {"state": "in_use"}, limiter.borrowed_tokens),
+        ("threadpool_tokens", {"state": "total"}, limiter.total_tokens),
+    ]
+
+
+registry.collector(
+    "threadpool_tokens", "Threadpool slots for sync endpoints, in use and total", "gauge", _threadpool_samples,
+)
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording latency, status and in-flight HTTP requests"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        HTTP_IN_FLIGHT.inc(method)
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - start
+            HTTP_IN_FLIGHT.dec(method)
+            # The router stores the matched route in the scope it was given
+            route = scope.get("route")
+            template = getattr(route, "path", None) or "unmatched"
+            HTTP_REQUEST_SECONDS.observe(elapsed, method, template)
+            HTTP_REQUESTS.inc(method, template, str(status))
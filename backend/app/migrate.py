@@ -0,0 +1,70 @@
+"""
+Database schema migrations
+
+Wraps Alembic with the configuration built in code, so the scripts under
+app/migrations ship with the application package and no alembic.ini is
+needed at runtime.
+
+Usage (from backend/):
+    python -m app.migrate                 # upgrade to head
+    python -m app.migrate revision -m "add foo"   # new autogenerated revision
+"""
+
+import os
+import sys
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import inspect
+
+from .db import DATABASE_URL, engine
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "migrations")
+
+# Revision matching the schema Base.metadata.create_all produced before
+# migrations were introduced
+BASELINE_REVISION = "0001"
+
+
+def alembic_config() -> Config:
+    config = Config()
+    config.set_main_option("script_location", MIGRATIONS_DIR)
+    # ConfigParser interpolation treats % specially (e.g. in URL-encoded passwords)
+    config.set_main_option("sqlalchemy.url", DATABASE_URL.replace("%", "%%"))
+    return config
+
+
+def upgrade_database(revision: str = "head") -> None:
+    """
+    Bring the database schema up to revision.
+
+    Databases created by create_all before migrations existed have the
+    tables but no alembic_version; they are stamped at the baseline first
+    so the remaining revisions apply on top of them.
+    """
+    config = alembic_config()
+    tables = set(inspect(engine).get_table_names())
+    if "alembic_version" not in tables and "quotes" in tables:
+        print(f"Existing schema without migration history, stamping {BASELINE_REVISION}")
+        command.stamp(config, BASELINE_REVISION)
+    command.upgrade(config, revision)
+
+
+def main(argv) -> int:
+    if not argv or argv[0] == "upgrade":
+        upgrade_database(argv[1] if len(argv) > 1 else "head")
+    elif argv[0] == "revision":
+        message = argv[argv.index("-m") + 1] if "-m" in argv else None
+        command.revision(alembic_config(), message=message, autogenerate=True)
+    elif argv[0] == "downgrade":
+        command.downgrade(alembic_config(), argv[1])
+    elif argv[0] == "current":
+        command.current(alembic_config(), verbose=True)
+    else:
+        print(f"Unknown command: {argv[0]}", file=sys.stderr)
+        return 2
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
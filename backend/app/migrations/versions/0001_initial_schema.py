@@ -0,0 +1,107 @@
+"""Initial schema (as previously created by Base.metadata.create_all)
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "customers",
+        sa.Column("id", sa.Integer, primary_key=True),
+        sa.Column("name", sa.String(200), nullable=False),
+        sa.Column("email", sa.String(200)),
+        sa.Column("phone", sa.String(50)),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+    )
+    op.create_table(
+        "materials",
+        sa.Column("id", sa.Integer, primary_key=True),
+        sa.Column("name", sa.String(120), nullable=False),
+        sa.Column("cost_per_lb", sa.Float, nullable=False),
+        sa.Column("density_lb_in3", sa.Float, nullable=False),
+        sa.Column("description", sa.String(400)),
+    )
+    op.create_table(
+        "machines",
+        sa.Column("id", sa.Integer, primary_key=True),
+        sa.Column("name", sa.String(120), nullable=False),
+        sa.Column("machine_type", sa.String(50), nullable=False),
+        sa.Column("machine_rate_per_hr", sa.Float, nullable=False),
+        sa.Column("labor_rate_per_hr", sa.Float, nullable=False),
+        sa.Column("description", sa.String(400)),
+    )
+    op.create_table(
+        "parts",
+        sa.Column("id", sa.Integer, primary_key=True),
+        sa.Column("part_number", sa.String(120), nullable=False, unique=True),
+        sa.Column("description", sa.String(400)),
+        sa.Column("material_id", sa.Integer, sa.ForeignKey("materials.id"), nullable=False),
+        sa.Column("stock_weight_lb", sa.Float, nullable=False),
+        sa.Column("scrap_factor", sa.Float, nullable=False),
+        sa.Column("programming_time_hr", sa.Float, nullable=False),
+        sa.Column("programming_rate_per_hr", sa.Float, nullable=False),
+        sa.Column("first_article_inspection_hr", sa.Float, nullable=False),
+        sa.Column("overhead_rate_pct", sa.Float, nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+    )
+    op.create_table(
+        "operations",
+        sa.Column("id", sa.Integer, primary_key=True),
+        sa.Column("part_id", sa.Integer, sa.ForeignKey("parts.id"), nullable=False),
+        sa.Column("machine_id", sa.Integer, sa.ForeignKey("machines.id"), nullable=False),
+        sa.Column("name", sa.String(120), nullable=False),
+        sa.Column("sequence", sa.Integer, nullable=False),
+        sa.Column("setup_time_hr", sa.Float, nullable=False),
+        sa.Column("cycle_time_hr", sa.Float, nullable=False),
+        sa.Column("allowance_pct", sa.Float, nullable=False),
+        sa.Column("operation_type", sa.String(20), nullable=False),
+        sa.Column("tool_cost_per_part", sa.Float, nullable=False),
+        sa.Column("tool_change_time_min", sa.Float, nullable=False),
+        sa.Column("inspection_time_min", sa.Float, nullable=False),
+        sa.Column("consumables_cost_per_part", sa.Float, nullable=False),
+    )
+    op.create_table(
+        "quotes",
+        sa.Column("id", sa.Integer, primary_key=True),
+        sa.Column("customer_id", sa.Integer, sa.ForeignKey("customers.id"), nullable=False),
+        sa.Column("quote_number", sa.String(50)),
+        sa.Column("status", sa.String(20), nullable=False),
+        sa.Column("notes", sa.Text),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+    )
+    op.create_table(
+        "quote_items",
+        sa.Column("id", sa.Integer, primary_key=True),
+        sa.Column("quote_id", sa.Integer, sa.ForeignKey("quotes.id"), nullable=False),
+        sa.Column("part_id", sa.Integer, sa.ForeignKey("parts.id"), nullable=False),
+        sa.Column("quantity", sa.Integer, nullable=False),
+        sa.Column("margin_pct", sa.Float, nullable=False),
+        sa.Column("material_cost_unit", sa.Float, nullable=False),
+        sa.Column("machine_cost_unit", sa.Float, nullable=False),
+        sa.Column("labor_cost_unit", sa.Float, nullable=False),
+        sa.Column("unit_cost", sa.Float, nullable=False),
+        sa.Column("unit_price", sa.Float, nullable=False),
+        sa.Column("tooling_cost_unit", sa.Float, nullable=False),
+        sa.Column("programming_cost_unit", sa.Float, nullable=False),
+        sa.Column("inspection_cost_unit", sa.Float, nullable=False),
+        sa.Column("consumables_cost_unit", sa.Float, nullable=False),
+        sa.Column("overhead_cost_unit", sa.Float, nullable=False),
+        sa.Column("setup_time_per_part", sa.Float, nullable=False),
+        sa.Column("cycle_time_per_part", sa.Float, nullable=False),
+        sa.Column("allowance_time_per_part", sa.Float, nullable=False),
+        sa.Column("total_time_per_part", sa.Float, nullable=False),
+    )
+
+
+def downgrade():
+    for table in ("quote_items", "quotes", "operations", "parts", "machines", "materials", "customers"):
+        op.drop_table(table)
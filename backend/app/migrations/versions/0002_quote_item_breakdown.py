@@ -0,0 +1,25 @@
+"""Store the detailed breakdown on quote items
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Databases created by create_all after the column was added already have it
+    columns = {column["name"] for column in sa.inspect(op.get_bind()).get_columns("quote_items")}
+    if "breakdown" not in columns:
+        op.add_column("quote_items", sa.Column("breakdown", sa.JSON))
+
+
+def downgrade():
+    with op.batch_alter_table("quote_items") as batch:
+        batch.drop_column("breakdown")
@@ -0,0 +1,84 @@
+"""Indexes for the hot query paths
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17
+
+- operations by part (quote calculations, part lists) and by machine
+- quote_items by quote (quote detail) and by part
+- quotes by customer/status with id for keyset pagination, by created_at,
+  and a partial index over each customer's draft quotes
+- parts by material with id, by created_at, and a pattern index for
+  part number prefix search
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+DRAFT_QUOTES = sa.text("status = 'draft'")
+
+
+def upgrade():
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    existing = {}
+
+    def create_index(name, table, columns, **kwargs):
+        # Databases created by create_all after the indexes were added to the
+        # models already have them
+        if table not in existing:
+            existing[table] = {index["name"] for index in inspector.get_indexes(table)}
+        if name not in existing[table]:
+            op.create_index(name, table, columns, **kwargs)
+
+    create_index("ix_operations_part_id_sequence", "operations", ["part_id", "sequence"])
+    create_index("ix_operations_machine_id", "operations", ["machine_id"])
+
+    create_index("ix_quote_items_quote_id", "quote_items", ["quote_id"])
+    create_index("ix_quote_items_part_id", "quote_items", ["part_id"])
+
+    create_index("ix_quotes_customer_id_id", "quotes", ["customer_id", "id"])
+    create_index("ix_quotes_status_id", "quotes", ["status", "id"])
+    create_index("ix_quotes_created_at", "quotes", ["created_at"])
+    create_index(
+        "ix_quotes_draft_customer_id_id", "quotes", ["customer_id", "id"],
+        postgresql_where=DRAFT_QUOTES,
+        sqlite_where=DRAFT_QUOTES,
+    )
+
+    create_index("ix_parts_material_id_id", "parts", ["material_id", "id"])
+    create_index("ix_parts_created_at", "parts", ["created_at"])
+    # Only PostgreSQL needs an operator class for LIKE 'ABC%' under a
+    # non-C collation; elsewhere the index would duplicate the unique one
+    if bind.dialect.name == "postgresql":
+        create_index(
+            "ix_parts_part_number_pattern", "parts", ["part_number"],
+            postgresql_ops={"part_number": "text_pattern_ops"},
+        )
+
+
+def downgrade():
+    existing = {
+        (index["name"], table)
+        for table in ("parts", "quotes", "quote_items", "operations")
+        for index in sa.inspect(op.get_bind()).get_indexes(table)
+    }
+    for name, table in [
+        ("ix_parts_part_number_pattern", "parts"),
+        ("ix_parts_created_at", "parts"),
+        ("ix_parts_material_id_id", "parts"),
+        ("ix_quotes_draft_customer_id_id", "quotes"),
+        ("ix_quotes_created_at", "quotes"),
+        ("ix_quotes_status_id", "quotes"),
+        ("ix_quotes_customer_id_id", "quotes"),
+        ("ix_quote_items_part_id", "quote_items"),
+        ("ix_quote_items_quote_id", "quote_items"),
+        ("ix_operations_machine_id", "operations"),
+        ("ix_operations_part_id_sequence", "operations"),
+    ]:
+        if (name, table) in existing:
+            op.drop_index(name, table_name=table)
@@ -0,0 +1,82 @@
+"""Revision counters bumped by triggers on catalog writes
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18
+
+One row per entity kind. Every insert, update or delete on the kind's
+tables bumps its generation, so each API worker can tell from a single
+query whether anything its caches were built from has changed, including
+writes made by other workers, seeds or plain SQL.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+# table -> kind whose generation a write to it bumps
+TRIGGERED_TABLES = {
+    "customers": "customer",
+    "machines": "machine",
+    "materials": "material",
+    "parts": "part",
+    "operations": "part",
+}
+KINDS = sorted(set(TRIGGERED_TABLES.values()))
+
+POSTGRES_FUNCTION = """
+CREATE FUNCTION bump_revision_counter() RETURNS trigger AS $$
+BEGIN
+    UPDATE revision_counters SET generation = generation + 1 WHERE kind = TG_ARGV[0];
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql
+"""
+
+
+def upgrade():
+    bind = op.get_bind()
+    # Databases created by create_all after the model was added already have
+    # the table, but neither its rows nor the triggers
+    if "revision_counters" in sa.inspect(bind).get_table_names():
+        counters = sa.table("revision_counters", sa.column("kind", sa.String), sa.column("generation", sa.Integer))
+        present = set(bind.execute(sa.select(counters.c.kind)).scalars())
+    else:
+        counters = op.create_table(
+            "revision_counters",
+            sa.Column("kind", sa.String(40), primary_key=True),
+            sa.Column("generation", sa.Integer, nullable=False, server_default="0"),
+        )
+        present = set()
+    op.bulk_insert(counters, [{"kind": kind, "generation": 0} for kind in KINDS if kind not in present])
+
+    if bind.dialect.name == "postgresql":
+        # Per statement, so bulk loads bump once rather than once per row
+        op.execute(POSTGRES_FUNCTION)
+        for table, kind in TRIGGERED_TABLES.items():
+            op.execute(
+                f"CREATE TRIGGER {table}_revision AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {table} "
+                f"FOR EACH STATEMENT EXECUTE FUNCTION bump_revision_counter('{kind}')"
+            )
+    else:
+        for table, kind in TRIGGERED_TABLES.items():
+            for event in ("insert", "update", "delete"):
+                op.execute(
+                    f"CREATE TRIGGER {table}_revision_{event} AFTER {event.upper()} ON {table} BEGIN "
+                    f"UPDATE revision_counters SET generation = generation + 1 WHERE kind = '{kind}'; END"
+                )
+
+
+def downgrade():
+    if op.get_bind().dialect.name == "postgresql":
+        for table in TRIGGERED_TABLES:
+            op.execute(f"DROP TRIGGER {table}_revision ON {table}")
+        op.execute("DROP FUNCTION bump_revision_counter()")
+    else:
+        for table in TRIGGERED_TABLES:
+            for event in ("insert", "update", "delete"):
+                op.execute(f"DROP TRIGGER {table}_revision_{event}")
+    op.drop_table("revision_counters")
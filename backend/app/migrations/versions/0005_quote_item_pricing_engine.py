@@ -0,0 +1,35 @@
+"""Record which engine priced each quote item
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18
+
+unit_cost/unit_price on lines saved with a breakdown come from
+calc_detailed_quote; older lines (and seeded ones) were priced by
+calc_unit_cost, which leaves out tooling, inspection, programming and
+overhead. The backfill tells them apart by the breakdown column.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Databases created by create_all after the column was added already have it
+    columns = {column["name"] for column in sa.inspect(op.get_bind()).get_columns("quote_items")}
+    if "pricing_engine" in columns:
+        return
+    op.add_column(
+        "quote_items",
+        sa.Column("pricing_engine", sa.String(20), nullable=False, server_default="unit_cost"),
+    )
+    op.execute("UPDATE quote_items SET pricing_engine = 'detailed' WHERE breakdown IS NOT NULL")
+
+
+def downgrade():
+    with op.batch_alter_table("quote_items") as batch:
+        batch.drop_column("pricing_engine")
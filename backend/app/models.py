@@ -1,6 +1,6 @@
-from sqlalchemy import String, Integer, Float, ForeignKey, DateTime, func, Text
+from sqlalchemy import String, Integer, Float, ForeignKey, DateTime, func, Text, JSON, Index, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from typing import Optional
+from typing import Optional, Any
 from datetime import datetime
 from .db import Base
 
@@ -62,6 +62,16 @@ class Part(Base):
     operations: Mapped[list["Operation"]] = relationship("Operation", back_populates="part", cascade="all, delete-orphan")
     quote_items: Mapped[list["QuoteItem"]] = relationship("QuoteItem", back_populates="part")
 
+    __table_args__ = (
+        Index("ix_parts_material_id_id", "material_id", "id"),
+        Index("ix_parts_created_at", "created_at"),
+        # Prefix search (LIKE 'ABC%') regardless of database collation; other
+        # databases use the unique index
+        Index(
+            "ix_parts_part_number_pattern", "part_number", postgresql_ops={"part_number": "text_pattern_ops"}
+        ).ddl_if(dialect="postgresql"),
+    )
+
 class Operation(Base):
     __tablename__ = "operations"
 
@@ -85,6 +95,11 @@ class Operation(Base):
     part: Mapped["Part"] = relationship("Part", back_populates="operations")
     machine: Mapped["Machine"] = relationship("Machine", back_populates="operations")
 
+    __table_args__ = (
+        Index("ix_operations_part_id_sequence", "part_id", "sequence"),
+        Index("ix_operations_machine_id", "machine_id"),
+    )
+
 class Quote(Base):
     __tablename__ = "quotes"
 
@@ -98,6 +113,18 @@ class Quote(Base):
     customer: Mapped["Customer"] = relationship("Customer", back_populates="quotes")
     items: Mapped[list["QuoteItem"]] = relationship("QuoteItem", back_populates="quote", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        Index("ix_quotes_customer_id_id", "customer_id", "id"),
+        Index("ix_quotes_status_id", "status", "id"),
+        Index("ix_quotes_created_at", "created_at"),
+        # A customer's drafts: the small, hot slice of the table the quote builder works in
+        Index(
+            "ix_quotes_draft_customer_id_id", "customer_id", "id",
+            postgresql_where=text("status = 'draft'"),
+            sqlite_where=text("status = 'draft'"),
+        ),
+    )
+
 class QuoteItem(Base):
     __tablename__ = "quote_items"
 
@@ -128,5 +155,32 @@ class QuoteItem(Base):
     allowance_time_per_part: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
     total_time_per_part: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
 
+    # Full detailed breakdown (time, cost, per-operation rows, summary, part info)
+    # as returned by /api/quotes/calculate-detailed at save time
+    breakdown: Mapped[Optional[dict[str, Any]]] = mapped_column(JSON)
+
+    # Engine that priced the stored unit_cost/unit_price: "detailed"
+    # (calc_detailed_quote, as create_quote saves lines) or "unit_cost"
+    # (calc_unit_cost: seeds, and lines saved before the breakdown was stored)
+    pricing_engine: Mapped[str] = mapped_column(String(20), nullable=False, server_default="unit_cost")
+
     quote: Mapped["Quote"] = relationship("Quote", back_populates="items")
     part: Mapped["Part"] = relationship("Part", back_populates="quote_items")
+
+    __table_args__ = (
+        Index("ix_quote_items_quote_id", "quote_id"),
+        Index("ix_quote_items_part_id", "part_id"),
+    )
+
+class RevisionCounter(Base):
+    """
+    Write count per entity kind, shared by every API worker.
+
+    Database triggers (migration 0004) bump a kind's generation on any
+    insert, update or delete of its tables, whoever makes it: API workers,
+    seeds, migrations or plain SQL. See app.cache.RevisionRegistry.
+    """
+    __tablename__ = "revision_counters"
+
+    kind: Mapped[str] = mapped_column(String(40), primary_key=True)
+    generation: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
@@ -0,0 +1,82 @@
+"""
+Keyset pagination for list endpoints
+
+List endpoints return one page as a plain JSON array and describe the rest
+in response headers:
+- X-Next-Cursor: opaque cursor for the next page (absent on the last page)
+- X-Total-Count: number of rows matching the filters (only with include_total=true)
+
+Pages are keyed on the primary key. Ids are assigned in creation order, so
+id order is also created_at order, and each page is an index range scan
+regardless of how deep the client has paged.
+"""
+
+import base64
+import json
+from dataclasses import dataclass
+from typing import List, Optional
+
+from fastapi import HTTPException, Query, Response
+from sqlalchemy.orm import Query as ORMQuery
+from sqlalchemy.orm.attributes import InstrumentedAttribute
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+TOTAL_COUNT_HEADER = "X-Total-Count"
+
+
+@dataclass
+class PageParams:
+    limit: int
+    cursor: Optional[str]
+    include_total: bool
+
+
+def page_params(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    include_total: bool = False,
+) -> PageParams:
+    """Common pagination query parameters"""
+    return PageParams(limit=limit, cursor=cursor, include_total=include_total)
+
+
+def encode_cursor(last_id: int) -> str:
+    return base64.urlsafe_b64encode(json.dumps({"id": last_id}).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        return int(json.loads(base64.urlsafe_b64decode(padded))["id"])
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def paginate(
+    query: ORMQuery,
+    key: InstrumentedAttribute,
+    page: PageParams,
+    response: Response,
+    descending: bool = False,
+) -> List:
+    """
+    Apply keyset pagination on key to a filtered query.
+
+    Fetches one extra row to detect whether another page exists and sets
+    the cursor/total headers on response.
+    """
+    if page.include_total:
+        response.headers[TOTAL_COUNT_HEADER] = str(query.order_by(None).count())
+
+    if page.cursor is not None:
+        last_id = decode_cursor(page.cursor)
+        query = query.filter(key < last_id if descending else key > last_id)
+
+    rows = query.order_by(key.desc() if descending else key.asc()).limit(page.limit + 1).all()
+    if len(rows) > page.limit:
+        rows = rows[:page.limit]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(rows[-1].id)
+    return rows
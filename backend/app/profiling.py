@@ -0,0 +1,119 @@
+"""
+Opt-in stage profiling for quote requests
+
+Quote handlers mark their stages with `with stage("load"): ...`:
+
+    load       reading the part and its rates from the database
+    marshal    building the engine's input dicts from ORM rows
+    compute    the quoting engine itself
+    serialize  to_dict() rounding and response shaping
+
+With PROFILE_STAGES=1, StageProfilingMiddleware gives every request a
+StageProfile that the marks add their elapsed time to. The totals are
+returned as Server-Timing entries (stage;dur=<ms>) and observed into the
+request_stage_seconds histogram on /metrics. When profiling is off the
+middleware is not installed and stage() returns a shared no-op context
+manager, so a mark costs one context variable lookup.
+"""
+
+import os
+import time
+from contextvars import ContextVar
+from typing import Dict, Optional
+
+from .metrics import ENGINE_BUCKETS, registry
+
+PROFILE_STAGES = os.getenv("PROFILE_STAGES", "0") == "1"
+
+STAGE_SECONDS = registry.histogram(
+    "request_stage_seconds", "Time per request spent in each profiled stage", ("route", "stage"),
+    buckets=ENGINE_BUCKETS + (0.25, 1.0),
+)
+
+
+class StageProfile:
+    """Seconds spent in each stage while serving one request"""
+    __slots__ = ("durations",)
+
+    def __init__(self):
+        self.durations: Dict[str, float] = {}
+
+    def add(self, name: str, seconds: float) -> None:
+        self.durations[name] = self.durations.get(name, 0.0) + seconds
+
+    def server_timing(self) -> str:
+        return ", ".join(f"{name};dur={seconds * 1000:.3f}" for name, seconds in self.durations.items())
+
+
+_current: ContextVar[Optional[StageProfile]] = ContextVar("stage_profile", default=None)
+
+
+class _NullStage:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+class _Stage:
+    __slots__ = ("profile", "name", "start")
+
+    def __init__(self, profile: StageProfile, name: str):
+        self.profile = profile
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.profile.add(self.name, time.perf_counter() - self.start)
+        return False
+
+
+def stage(name: str):
+    """Time a block as the named stage of the current request, if profiled"""
+    profile = _current.get()
+    if profile is None:
+        return _NULL_STAGE
+    return _Stage(profile, name)
+
+
+def current_profile() -> Optional[StageProfile]:
+    return _current.get()
+
+
+class StageProfilingMiddleware:
+    """ASGI middleware giving each request a StageProfile (PROFILE_STAGES=1)"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        profile = StageProfile()
+        token = _current.set(profile)
+
+        async def send_with_profile(message):
+            if message["type"] == "http.response.start" and profile.durations:
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", profile.server_timing().encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_profile)
+        finally:
+            _current.reset(token)
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            for name, seconds in profile.durations.items():
+                STAGE_SECONDS.observe(seconds, route, name)
@@ -0,0 +1,146 @@
+"""
+Per-request SQL statement counts, database time and N+1 detection
+
+QueryStatsMiddleware opens a RequestQueryStats for every HTTP request in a
+context variable; SQLAlchemy cursor events on the engines add each
+statement and its duration to it. The context variable follows the
+request into AnyIO's threadpool (sync mode) and into AsyncSession.run_sync
+greenlets (async mode), so both database modes are counted.
+
+Every response carries the totals in a Server-Timing header
+(db;dur=<ms>;desc="<n> queries"), which browser dev tools display, and in
+X-DB-Queries. A request is logged when it exceeds SLOW_REQUEST_QUERIES
+statements or SLOW_REQUEST_DB_MS of database time, or when one statement
+text runs with N_PLUS_ONE_THRESHOLD or more distinct parameter sets (a
+likely N+1: a query issued per row instead of one for all rows). Parameter
+sets are told apart by a hash of their repr; the same query re-run with the
+same parameters is only counted once, and executemany batches not at all.
+"""
+
+import logging
+import os
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+QUERY_STATS_ENABLED = os.getenv("QUERY_STATS", "1") != "0"
+SLOW_REQUEST_QUERIES = int(os.getenv("SLOW_REQUEST_QUERIES", "25"))
+SLOW_REQUEST_DB_MS = float(os.getenv("SLOW_REQUEST_DB_MS", "250"))
+N_PLUS_ONE_THRESHOLD = int(os.getenv("N_PLUS_ONE_THRESHOLD", "5"))
+
+QUERY_COUNT_HEADER = "X-DB-Queries"
+
+logger = logging.getLogger(__name__)
+
+
+class RequestQueryStats:
+    """Statements executed while serving one request"""
+    __slots__ = ("count", "db_seconds", "statements", "parameter_sets")
+
+    def __init__(self):
+        self.count = 0
+        self.db_seconds = 0.0
+        self.statements: Counter = Counter()
+        self.parameter_sets: Dict[str, Set[int]] = {}
+
+    def record(self, statement: str, seconds: float, parameters=None, executemany: bool = False) -> None:
+        self.count += 1
+        self.db_seconds += seconds
+        self.statements[statement] += 1
+        if not executemany:
+            self.parameter_sets.setdefault(statement, set()).add(hash(repr(parameters)))
+
+    def repeated(self, threshold: int = N_PLUS_ONE_THRESHOLD) -> List[Tuple[str, int, int]]:
+        """
+        (statement, runs, distinct parameter sets) for statements run with at
+        least threshold distinct parameter sets: likely N+1 queries
+        """
+        return [
+            (statement, n, len(self.parameter_sets[statement]))
+            for statement, n in self.statements.most_common()
+            if len(self.parameter_sets.get(statement, ())) >= threshold
+        ]
+
+    def server_timing(self) -> str:
+        return f'db;dur={self.db_seconds * 1000:.1f};desc="{self.count} queries"'
+
+
+_current: ContextVar[Optional[RequestQueryStats]] = ContextVar("request_query_stats", default=None)
+
+
+def current_stats() -> Optional[RequestQueryStats]:
+    """Stats of the request being served, or None outside a request"""
+    return _current.get()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        conn.info.setdefault("query_stats_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    if stats is not None:
+        starts = conn.info.get("query_stats_start")
+        if starts:
+            stats.record(statement, time.perf_counter() - starts.pop(), parameters, executemany)
+
+
+def _handle_error(exception_context):
+    starts = exception_context.connection.info.get("query_stats_start") if exception_context.connection else None
+    if starts:
+        starts.pop()
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Count this engine's statements against the current request"""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+def _report(method: str, path: str, stats: RequestQueryStats) -> None:
+    repeated = stats.repeated()
+    for statement, n, distinct in repeated:
+        logger.warning(
+            "Likely N+1 in %s %s: statement ran %d times with %d different parameters: %s",
+            method, path, n, distinct, " ".join(statement.split())[:300],
+        )
+    if stats.count > SLOW_REQUEST_QUERIES or stats.db_seconds * 1000 > SLOW_REQUEST_DB_MS:
+        logger.warning(
+            "%s %s issued %d queries taking %.1f ms", method, path, stats.count, stats.db_seconds * 1000
+        )
+
+
+class QueryStatsMiddleware:
+    """ASGI middleware collecting per-request SQL stats into response headers"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not QUERY_STATS_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestQueryStats()
+        token = _current.set(stats)
+
+        async def send_with_stats(message):
+            if message["type"] == "http.response.start":
+                # Streamed bodies may query after this point; the log below has the final totals
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", stats.server_timing().encode("latin-1")))
+                headers.append((QUERY_COUNT_HEADER.lower().encode("latin-1"), str(stats.count).encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_stats)
+        finally:
+            _current.reset(token)
+            _report(scope["method"], scope["path"], stats)
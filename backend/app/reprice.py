@@ -0,0 +1,106 @@
+"""
+Full-catalog repricing (nightly)
+
+Prices every part at a set of quantities and writes the result as a CSV
+price list (part_id, part_number, quantity, unit_cost, unit_price).
+
+Parts and operations are read in id-ordered chunks of --chunk-size parts
+as plain columns, without building ORM objects, and turned straight into
+BatchInputs with the current machine and material rates. Each chunk is
+priced by the batch engine sharded over the repricing worker processes
+(app.services.repricing, REPRICE_WORKERS), so a chunk should be several
+times REPRICE_MIN_SHARD_PARTS for every worker to get a shard. Nothing is
+written to the database.
+
+Usage (from backend/):
+    python -m app.reprice --output prices.csv
+    python -m app.reprice --quantities 1 100 1000 --margin 0.2 --output -   # CSV to stdout
+    python -m app.reprice                                                  # timing only
+"""
+
+import argparse
+import csv
+import sys
+import time
+from typing import Iterator, Sequence
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from .catalog import catalog
+from .services.part_columns import load_columns
+from .services.repricing import RepricingPool, repricing_pool
+
+# The quote page's default price breaks
+DEFAULT_QUANTITIES = [1, 10, 50, 100, 500, 1000]
+CHUNK_PARTS = 50_000
+
+
+def reprice_catalog(
+    db: Session,
+    quantities: Sequence[int] = DEFAULT_QUANTITIES,
+    margin_pct: float = 0.15,
+    chunk_size: int = CHUNK_PARTS,
+    pool: RepricingPool = repricing_pool,
+) -> Iterator[tuple]:
+    """
+    Yield (PartColumns, BatchQuoteResult) for every chunk of the catalog, in
+    part id order. The next chunk is read while the workers price this one.
+    """
+    rates = catalog.snapshot(db)
+    pending = None
+    after_id = 0
+    while True:
+        columns = load_columns(db, rates, after_id=after_id, limit=chunk_size)
+        if pending is not None:
+            yield pending[0], pending[1].result()
+        if not len(columns.part_id):
+            return
+        pending = (columns, pool.submit(columns.inputs, quantities, margin_pct, keep_operations=False))
+        after_id = int(columns.part_id[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Price every part at a set of quantities")
+    parser.add_argument("--quantities", type=int, nargs="+", default=DEFAULT_QUANTITIES)
+    parser.add_argument("--margin", type=float, default=0.15)
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_PARTS, help="parts read and priced at a time")
+    parser.add_argument("--output", help="CSV price list path, or - for stdout")
+    args = parser.parse_args()
+
+    from .db import SessionLocal
+
+    start = time.perf_counter()
+    parts = operations = 0
+    out = None
+    if args.output:
+        out = sys.stdout if args.output == "-" else open(args.output, "w", newline="")
+    db = SessionLocal()
+    try:
+        writer = csv.writer(out) if out else None
+        if writer:
+            writer.writerow(["part_id", "part_number", "quantity", "unit_cost", "unit_price"])
+        for columns, result in reprice_catalog(db, args.quantities, args.margin, args.chunk_size):
+            parts += len(columns.part_id)
+            operations += columns.inputs.n_ops
+            if writer:
+                unit_cost = np.round(result.unit_cost, 2)
+                unit_price = np.round(result.unit_price, 2)
+                for row, (part_id, part_number) in enumerate(zip(columns.part_id.tolist(), columns.part_number)):
+                    for q, quantity in enumerate(result.quantities.tolist()):
+                        writer.writerow([part_id, part_number, quantity, unit_cost[row, q], unit_price[row, q]])
+    finally:
+        db.close()
+        if out is not None and out is not sys.stdout:
+            out.close()
+
+    elapsed = time.perf_counter() - start
+    print(
+        f"✓ Repriced {parts} parts ({operations} operations) at {len(args.quantities)} quantities "
+        f"in {elapsed:.1f}s with {repricing_pool.workers} workers",
+        file=sys.stderr,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.orm import Session
 from typing import List
 from pydantic import BaseModel
 from ..db import get_db
 from .. import models
+from ..http_cache import conditional
+from ..pagination import PageParams, page_params, paginate
+from ..cache import revisions
 
 router = APIRouter(prefix="/api/customers", tags=["customers"])
 
@@ -21,10 +24,10 @@ class CustomerResponse(BaseModel):
     class Config:
         from_attributes = True
 
-@router.get("", response_model=List[CustomerResponse])
-def list_customers(db: Session = Depends(get_db)):
-    """Get all customers"""
-    return db.query(models.Customer).all()
+@router.get("", dependencies=[Depends(conditional("customer"))], response_model=List[CustomerResponse])
+def list_customers(response: Response, page: PageParams = Depends(page_params), db: Session = Depends(get_db)):
+    """Get a page of customers"""
+    return paginate(db.query(models.Customer), models.Customer.id, page, response)
 
 @router.post("", response_model=CustomerResponse)
 def create_customer(payload: CustomerCreate, db: Session = Depends(get_db)):
@@ -32,10 +35,11 @@ def create_customer(payload: CustomerCreate, db: Session = Depends(get_db)):
     customer = models.Customer(**payload.model_dump())
     db.add(customer)
     db.commit()
+    revisions.bump("customer", customer.id)
     db.refresh(customer)
     return customer
 
-@router.get("/{customer_id}", response_model=CustomerResponse)
+@router.get("/{customer_id}", dependencies=[Depends(conditional("customer"))], response_model=CustomerResponse)
 def get_customer(customer_id: int, db: Session = Depends(get_db)):
     """Get a specific customer"""
     customer = db.get(models.Customer, customer_id)
@@ -1,9 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.orm import Session
 from typing import List
 from pydantic import BaseModel
 from ..db import get_db
 from .. import models
+from ..http_cache import conditional
+from ..pagination import PageParams, page_params, paginate
+from ..cache import revisions
 
 router = APIRouter(prefix="/api/machines", tags=["machines"])
 
@@ -25,10 +28,10 @@ class MachineResponse(BaseModel):
     class Config:
         from_attributes = True
 
-@router.get("", response_model=List[MachineResponse])
-def list_machines(db: Session = Depends(get_db)):
-    """Get all machines"""
-    return db.query(models.Machine).all()
+@router.get("", dependencies=[Depends(conditional("machine"))], response_model=List[MachineResponse])
+def list_machines(response: Response, page: PageParams = Depends(page_params), db: Session = Depends(get_db)):
+    """Get a page of machines"""
+    return paginate(db.query(models.Machine), models.Machine.id, page, response)
 
 @router.post("", response_model=MachineResponse)
 def create_machine(payload: MachineCreate, db: Session = Depends(get_db)):
@@ -36,10 +39,11 @@ def create_machine(payload: MachineCreate, db: Session = Depends(get_db)):
     machine = models.Machine(**payload.model_dump())
     db.add(machine)
     db.commit()
+    revisions.bump("machine", machine.id)
     db.refresh(machine)
     return machine
 
-@router.get("/{machine_id}", response_model=MachineResponse)
+@router.get("/{machine_id}", dependencies=[Depends(conditional("machine"))], response_model=MachineResponse)
 def get_machine(machine_id: int, db: Session = Depends(get_db)):
     """Get a specific machine"""
     machine = db.get(models.Machine, machine_id)
@@ -1,9 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.orm import Session
 from typing import List
 from pydantic import BaseModel
 from ..db import get_db
 from .. import models
+from ..http_cache import conditional
+from ..pagination import PageParams, page_params, paginate
+from ..cache import revisions
 
 router = APIRouter(prefix="/api/materials", tags=["materials"])
 
@@ -23,10 +26,10 @@ class MaterialResponse(BaseModel):
     class Config:
         from_attributes = True
 
-@router.get("", response_model=List[MaterialResponse])
-def list_materials(db: Session = Depends(get_db)):
-    """Get all materials"""
-    return db.query(models.Material).all()
+@router.get("", dependencies=[Depends(conditional("material"))], response_model=List[MaterialResponse])
+def list_materials(response: Response, page: PageParams = Depends(page_params), db: Session = Depends(get_db)):
+    """Get a page of materials"""
+    return paginate(db.query(models.Material), models.Material.id, page, response)
 
 @router.post("", response_model=MaterialResponse)
 def create_material(payload: MaterialCreate, db: Session = Depends(get_db)):
@@ -34,10 +37,11 @@ def create_material(payload: MaterialCreate, db: Session = Depends(get_db)):
     material = models.Material(**payload.model_dump())
     db.add(material)
     db.commit()
+    revisions.bump("material", material.id)
     db.refresh(material)
     return material
 
-@router.get("/{material_id}", response_model=MaterialResponse)
+@router.get("/{material_id}", dependencies=[Depends(conditional("material"))], response_model=MaterialResponse)
 def get_material(material_id: int, db: Session = Depends(get_db)):
     """Get a specific material"""
     material = db.get(models.Material, material_id)
@@ -1,9 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.orm import Session, joinedload
 from typing import List
+from datetime import datetime
 from pydantic import BaseModel
 from ..db import get_db
 from .. import models
+from ..cache import revisions
+from ..http_cache import conditional
+from ..pagination import PageParams, page_params, paginate
+from ..serialization import json_response, shape_nested
 
 router = APIRouter(prefix="/api/parts", tags=["parts"])
 
@@ -78,10 +83,48 @@ class PartResponse(BaseModel):
     class Config:
         from_attributes = True
 
-@router.get("", response_model=List[PartResponse])
-def list_parts(db: Session = Depends(get_db)):
-    """Get all parts with operations"""
-    return db.query(models.Part).options(joinedload(models.Part.operations)).all()
+# Columns read by list_parts, in response field order
+PART_FIELDS = [name for name in PartResponse.model_fields if name != "operations"]
+OPERATION_FIELDS = list(OperationResponse.model_fields)
+
+@router.get("", dependencies=[Depends(conditional("part"))], response_model=List[PartResponse])
+def list_parts(
+    response: Response,
+    material_id: int | None = None,
+    part_number_prefix: str | None = None,
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
+    page: PageParams = Depends(page_params),
+    db: Session = Depends(get_db),
+):
+    """
+    Get a page of parts with operations, optionally filtered.
+
+    Reads plain columns and shapes them straight into the PartResponse
+    layout (no ORM objects or response validation); output is identical.
+    """
+    query = db.query(*(getattr(models.Part, name) for name in PART_FIELDS))
+    if material_id is not None:
+        query = query.filter(models.Part.material_id == material_id)
+    if part_number_prefix:
+        query = query.filter(models.Part.part_number.startswith(part_number_prefix, autoescape=True))
+    if created_from is not None:
+        query = query.filter(models.Part.created_at >= created_from)
+    if created_to is not None:
+        query = query.filter(models.Part.created_at < created_to)
+    rows = paginate(query, models.Part.id, page, response)
+
+    operation_rows = []
+    if rows:
+        operation_rows = db.query(
+            models.Operation.part_id, *(getattr(models.Operation, name) for name in OPERATION_FIELDS)
+        ).filter(models.Operation.part_id.in_([row.id for row in rows])).all()
+
+    return json_response(shape_nested(rows, PART_FIELDS, operation_rows, OPERATION_FIELDS, "operations"), response)
+
+def _part_with_operations(db: Session, part_id: int):
+    """Load a part with its operations eagerly, ready to serialize"""
+    return db.query(models.Part).options(joinedload(models.Part.operations)).filter(models.Part.id == part_id).first()
 
 @router.post("", response_model=PartResponse)
 def create_part(payload: PartCreate, db: Session = Depends(get_db)):
@@ -104,13 +147,13 @@ def create_part(payload: PartCreate, db: Session = Depends(get_db)):
         db.add(operation)
 
     db.commit()
-    db.refresh(part)
-    return part
+    revisions.bump("part", part.id)
+    return _part_with_operations(db, part.id)
 
-@router.get("/{part_id}", response_model=PartResponse)
+@router.get("/{part_id}", dependencies=[Depends(conditional("part"))], response_model=PartResponse)
 def get_part(part_id: int, db: Session = Depends(get_db)):
     """Get a specific part with operations"""
-    part = db.query(models.Part).options(joinedload(models.Part.operations)).filter(models.Part.id == part_id).first()
+    part = _part_with_operations(db, part_id)
     if not part:
         raise HTTPException(status_code=404, detail="Part not found")
     return part
@@ -128,8 +171,8 @@ def update_part(part_id: int, payload: PartUpdate, db: Session = Depends(get_db)
         setattr(part, field, value)
 
     db.commit()
-    db.refresh(part)
-    return part
+    revisions.bump("part", part.id)
+    return _part_with_operations(db, part.id)
 
 @router.put("/{part_id}/operations/{operation_id}")
 def update_operation(part_id: int, operation_id: int, payload: OperationCreate, db: Session = Depends(get_db)):
@@ -148,5 +191,6 @@ def update_operation(part_id: int, operation_id: int, payload: OperationCreate,
         setattr(operation, field, value)
 
     db.commit()
+    revisions.bump("part", part_id)
     db.refresh(operation)
     return operation
@@ -0,0 +1,126 @@
+"""
+Background quote jobs (/api/quotes/jobs)
+
+Jobs live in the memory of the API process that accepted them (see
+app.jobs): polling, streaming, cancelling or retrying a job on another
+process answers 404. Run the API with a single worker process, or route
+every /api/quotes/jobs request for a job to the process that created it
+(sticky sessions); quotes themselves are saved to the database as usual.
+"""
+
+import asyncio
+import json
+from typing import Any, Dict
+
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+from ..db import SessionLocal
+from ..jobs import CANCELLED, FAILED, FINISHED, Job, QueueFull, job_queue
+from .quotes import QuoteCreate, _build_quote
+
+router = APIRouter(prefix="/api/quotes/jobs", tags=["quotes"])
+
+# How often an event stream checks its job for changes
+EVENT_POLL_SECONDS = 0.25
+
+class JobResponse(BaseModel):
+    id: str
+    kind: str
+    status: str
+    done: int
+    total: int
+    attempt: int
+    retry_of: str | None
+    result: Dict[str, Any] | None
+    error: str | None
+    created_at: float
+    started_at: float | None
+    finished_at: float | None
+
+def _build_quote_job(job: Job) -> Dict[str, Any]:
+    """Worker side of a quote job: POST /api/quotes in its own session"""
+    db = SessionLocal()
+    try:
+        quote_id = _build_quote(db, QuoteCreate(**job.payload), progress=job.progress)
+    finally:
+        db.close()
+    return {"quote_id": quote_id}
+
+def _submit(job: Job) -> Job:
+    try:
+        return job_queue.submit(job, _build_quote_job)
+    except QueueFull:
+        raise HTTPException(status_code=503, detail="Job queue is full", headers={"Retry-After": "5"})
+
+def _get_job(job_id: str) -> Job:
+    job = job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+@router.post("", response_model=JobResponse, status_code=202)
+async def submit_quote_job(payload: QuoteCreate):
+    """
+    Build and save a quote in the background.
+
+    Returns at once with a job to poll (GET /api/quotes/jobs/{id}) or
+    stream (GET /api/quotes/jobs/{id}/events). The quote is priced and
+    saved exactly as POST /api/quotes does; on success the job's result
+    holds its quote_id. Validation errors (unknown customer or part) fail
+    the job with the message the synchronous endpoint would return.
+    """
+    return _submit(Job("quote", payload.model_dump(), total=len(payload.items))).to_dict()
+
+@router.get("/{job_id}", response_model=JobResponse)
+async def get_quote_job(job_id: str):
+    """Current status and progress of a job"""
+    return _get_job(job_id).to_dict()
+
+@router.get("/{job_id}/events")
+async def stream_quote_job(job_id: str, request: Request):
+    """
+    Server-sent events with the job's state: a `progress` event whenever
+    it changes and a final `done` event once it has finished.
+    """
+    job = _get_job(job_id)
+
+    async def events():
+        version = None
+        while not await request.is_disconnected():
+            if job.version != version:
+                version = job.version
+                finished = job.status in FINISHED
+                yield f"event: {'done' if finished else 'progress'}\ndata: {json.dumps(job.to_dict())}\n\n"
+                if finished:
+                    return
+            await asyncio.sleep(EVENT_POLL_SECONDS)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@router.post("/{job_id}/cancel", response_model=JobResponse)
+async def cancel_quote_job(job_id: str):
+    """
+    Cancel a queued or running job. A running job stops after its current
+    line item, or right before saving, and writes nothing; the response may
+    still show it running. Once the quote is being committed it is too late.
+    """
+    job = _get_job(job_id)
+    if job.status in FINISHED:
+        raise HTTPException(status_code=409, detail=f"Job already {job.status}")
+    job_queue.cancel(job)
+    return job.to_dict()
+
+@router.post("/{job_id}/retry", response_model=JobResponse, status_code=202)
+async def retry_quote_job(job_id: str):
+    """Run a failed or cancelled job again, as a new job with the same payload"""
+    job = _get_job(job_id)
+    if job.status not in (FAILED, CANCELLED):
+        raise HTTPException(status_code=409, detail=f"Only failed or cancelled jobs can be retried, job is {job.status}")
+    retry = Job(job.kind, job.payload, total=job.total, attempt=job.attempt + 1, retry_of=job.id)
+    return _submit(retry).to_dict()
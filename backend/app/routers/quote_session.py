@@ -0,0 +1,374 @@
+"""
+Live pricing over a WebSocket (/ws/quote-session)
+
+The client subscribes to a part, or to a quote draft, and then streams
+edits. The session keeps the parts and rates it loaded in memory and only
+touches the database again when one of them is written (checked against
+the revision registry), so an edit costs one engine pass.
+
+Client messages (JSON):
+
+    {"type": "subscribe", "part_id": 7, "quantity": 100, "margin_pct": 0.15}
+    {"type": "subscribe", "quote_id": 12}            one line per quote item
+    {"type": "update", "seq": 3, "line": 0, "quantity": 250,
+     "overrides": {"operations": [{"id": 41, "cycle_time_hr": 0.3}]}}
+
+An update changes quantity, margin_pct, include and/or adds to the line's
+unsaved overrides (the calculate-detailed `overrides` format; "reset": true
+drops them first). Server messages:
+
+    {"type": "snapshot", "seq": 0, "lines": [{"part_id": ..., "result": {...}}]}
+    {"type": "delta", "seq": 3, "lines": {"0": {"summary": {"unit_price": 12.5}}}}
+    {"type": "error", "seq": 3, "detail": "..."}
+
+Results have the calculate-full shape. A delta only carries the fields
+that changed: nested objects are diffed key by key, lists are sent whole,
+and keys an object no longer has are listed under "$removed" in it (a null
+value is a value). Edits that arrive while a previous batch is being priced
+are coalesced and answered by one delta whose seq is the last one applied.
+Frames that are not a JSON object (binary, invalid JSON, null, ...) are
+answered with an error and otherwise ignored, as are failures while
+loading or pricing; the connection stays open. Pricing runs in the
+threadpool, off the event loop.
+"""
+
+import asyncio
+import json
+import logging
+from dataclasses import dataclass, field
+from typing import Annotated, Any, Dict, List, Literal, Optional, Set, Union
+
+from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect
+from pydantic import BaseModel, Field, TypeAdapter, ValidationError
+from sqlalchemy.orm import Session, selectinload
+from starlette.concurrency import run_in_threadpool
+
+from .. import models
+from ..cache import revisions
+from ..catalog import CatalogSnapshot, catalog
+from ..db import run_with_session
+from .parts import PartUpdate
+from .quotes import QuoteOverrides, QuoteSection, _full_result, _merge_overrides, _part_copy, _part_dependencies
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(tags=["quotes"])
+
+ALL_SECTIONS: List[QuoteSection] = ["summary", "detailed", "operations"]
+
+
+class SubscribeMessage(BaseModel):
+    type: Literal["subscribe"]
+    seq: int = 0
+    part_id: int | None = None
+    quote_id: int | None = None
+    quantity: int = 1
+    margin_pct: float = 0.15
+    include: List[QuoteSection] = ALL_SECTIONS
+
+
+class UpdateMessage(BaseModel):
+    type: Literal["update"]
+    seq: int = 0
+    line: int = 0
+    quantity: int | None = None
+    margin_pct: float | None = None
+    include: List[QuoteSection] | None = None
+    overrides: QuoteOverrides | None = None
+    reset: bool = False
+
+
+ClientMessage = TypeAdapter(Annotated[Union[SubscribeMessage, UpdateMessage], Field(discriminator="type")])
+
+# Key listing the keys a diffed object dropped
+REMOVED_KEY = "$removed"
+# Detail of the error frame sent for unexpected failures (logged server side)
+INTERNAL_ERROR = "Internal error"
+
+
+class _InvalidFrame:
+    """Queued in place of a frame that is not a JSON object"""
+
+    def __init__(self, detail: str):
+        self.detail = detail
+
+
+# Queued by the reader when it stops: the client left or receiving failed
+_CLOSED = object()
+
+
+def merge_overrides(current: QuoteOverrides, delta: QuoteOverrides) -> QuoteOverrides:
+    """Accumulate one edit's overrides onto a line's earlier ones"""
+    part = None
+    if current.part is not None or delta.part is not None:
+        part = PartUpdate(**{
+            **(current.part.model_dump(exclude_none=True) if current.part else {}),
+            **(delta.part.model_dump(exclude_none=True) if delta.part else {}),
+        })
+
+    operations = {patch.id: patch.model_dump(exclude_none=True) for patch in current.operations}
+    for patch in delta.operations:
+        operations.setdefault(patch.id, {}).update(patch.model_dump(exclude_none=True))
+
+    machine_rates = {machine_id: rates.model_dump(exclude_none=True) for machine_id, rates in current.machine_rates.items()}
+    for machine_id, rates in delta.machine_rates.items():
+        machine_rates.setdefault(machine_id, {}).update(rates.model_dump(exclude_none=True))
+
+    return QuoteOverrides(
+        part=part,
+        operations=list(operations.values()),
+        add_operations=[*current.add_operations, *delta.add_operations],
+        remove_operations=list(dict.fromkeys([*current.remove_operations, *delta.remove_operations])),
+        machine_rates=machine_rates,
+        material_cost_per_lb={**current.material_cost_per_lb, **delta.material_cost_per_lb},
+    )
+
+
+def diff(old: Any, new: Any) -> Any:
+    """
+    What changed from old to new: nested dicts are compared key by key
+    (dropped keys are listed under REMOVED_KEY), anything else is returned
+    whole.
+    """
+    changes = {}
+    for key, value in new.items():
+        previous = old.get(key)
+        if isinstance(value, dict) and isinstance(previous, dict):
+            nested = diff(previous, value)
+            if nested:
+                changes[key] = nested
+        elif key not in old or previous != value:
+            changes[key] = value
+    removed = sorted(old.keys() - new.keys())
+    if removed:
+        changes[REMOVED_KEY] = removed
+    return changes
+
+
+@dataclass
+class SessionLine:
+    part_id: int
+    quantity: int
+    margin_pct: float
+    include: frozenset
+    overrides: QuoteOverrides = field(default_factory=QuoteOverrides)
+    result: Optional[Dict[str, Any]] = None
+
+    def describe(self) -> Dict[str, Any]:
+        return {"part_id": self.part_id, "quantity": self.quantity, "margin_pct": self.margin_pct, "result": self.result}
+
+
+class QuoteSession:
+    """Parts, rates and line state of one WebSocket connection"""
+
+    def __init__(self):
+        self.lines: List[SessionLine] = []
+        self.parts = {}
+        self.rates: Optional[CatalogSnapshot] = None
+        self.snapshot: tuple = ()
+
+    def subscribe(self, db: Session, message: SubscribeMessage) -> None:
+        """Load the lines and everything pricing them needs (runs with a session)"""
+        include = frozenset(message.include)
+        if message.quote_id is not None:
+            items = db.query(
+                models.QuoteItem.part_id, models.QuoteItem.quantity, models.QuoteItem.margin_pct
+            ).filter(models.QuoteItem.quote_id == message.quote_id).order_by(models.QuoteItem.id).all()
+            if not items:
+                raise HTTPException(status_code=404, detail="Quote not found or has no items")
+            lines = [SessionLine(item.part_id, item.quantity, item.margin_pct, include) for item in items]
+        elif message.part_id is not None:
+            if message.quantity < 1:
+                raise HTTPException(status_code=400, detail="Quantity must be at least 1")
+            lines = [SessionLine(message.part_id, message.quantity, message.margin_pct, include)]
+        else:
+            raise HTTPException(status_code=400, detail="Subscribe needs part_id or quote_id")
+        self.load(db, {line.part_id for line in lines})
+        self.lines = lines
+
+    def load(self, db: Session, part_ids: Set[int]) -> None:
+        """(Re)load the parts as plain copies, plus the rates they use"""
+        epoch = revisions.epoch
+        parts = db.query(models.Part).options(selectinload(models.Part.operations)).filter(
+            models.Part.id.in_(part_ids)
+        ).all()
+        missing = sorted(part_ids - {part.id for part in parts})
+        if missing:
+            raise HTTPException(status_code=404, detail=f"Parts {missing} not found")
+        deps = [dep for part in parts for dep in _part_dependencies(part)]
+        self.rates = catalog.snapshot(db)
+        self.parts = {part.id: _part_copy(part) for part in parts}
+        # A write during the load leaves the snapshot stale, so the next price reloads
+        self.snapshot = revisions.snapshot(deps) if epoch == revisions.epoch else ()
+
+    def is_stale(self, db: Session) -> bool:
+        revisions.sync(db)
+        return not self.snapshot or not revisions.is_current(self.snapshot)
+
+    def needs_rates(self, message: UpdateMessage) -> bool:
+        """Whether the edit names a machine or material the rates were loaded without"""
+        overrides = message.overrides
+        if overrides is None or self.rates is None:
+            return False
+        machine_ids = {op.machine_id for op in overrides.add_operations} | overrides.machine_rates.keys()
+        material_ids = set(overrides.material_cost_per_lb)
+        if overrides.part is not None and overrides.part.material_id is not None:
+            material_ids.add(overrides.part.material_id)
+        return not self.rates.has(machine_ids, material_ids)
+
+    def refresh_rates(self, db: Session) -> None:
+        """Take the current rates, e.g. for a machine created after the session loaded"""
+        self.rates = catalog.snapshot(db)
+
+    def update(self, message: UpdateMessage) -> int:
+        """Apply an edit to its line; raises HTTPException (nothing changed) if invalid"""
+        if not 0 <= message.line < len(self.lines):
+            raise HTTPException(status_code=400, detail=f"No line {message.line}")
+        line = self.lines[message.line]
+        if message.quantity is not None and message.quantity < 1:
+            raise HTTPException(status_code=400, detail="Quantity must be at least 1")
+
+        overrides = line.overrides
+        if message.reset:
+            overrides = QuoteOverrides()
+        if message.overrides is not None:
+            overrides = merge_overrides(overrides, message.overrides)
+            _merge_overrides(self.parts[line.part_id], self.rates, overrides)
+
+        line.overrides = overrides
+        if message.quantity is not None:
+            line.quantity = message.quantity
+        if message.margin_pct is not None:
+            line.margin_pct = message.margin_pct
+        if message.include is not None:
+            line.include = frozenset(message.include)
+        return message.line
+
+    def price_all(self) -> None:
+        """Price every line from scratch (after a subscribe)"""
+        for index, line in enumerate(self.lines):
+            line.result = None
+            self.price(index)
+
+    def price(self, index: int) -> Dict[str, Any]:
+        """Price a line, returning the fields that changed since it was last priced"""
+        line = self.lines[index]
+        part, rates = _merge_overrides(self.parts[line.part_id], self.rates, line.overrides)
+        result = _full_result(part, rates, line.quantity, line.margin_pct, line.include)
+        changes = diff(line.result or {}, result)
+        line.result = result
+        return changes
+
+
+async def _handle(websocket: WebSocket, session: QuoteSession, batch: List[Any]) -> None:
+    """Apply a batch of coalesced messages and answer with one snapshot or delta"""
+    subscribed = False
+    changed: Set[int] = set()
+    seq = None
+
+    for raw in batch:
+        if isinstance(raw, _InvalidFrame):
+            await websocket.send_json({"type": "error", "seq": None, "detail": raw.detail})
+            continue
+        try:
+            message = ClientMessage.validate_python(raw)
+        except ValidationError as exc:
+            await websocket.send_json({"type": "error", "seq": raw.get("seq"), "detail": json.loads(exc.json(include_url=False))})
+            continue
+        try:
+            if isinstance(message, SubscribeMessage):
+                await run_with_session(lambda db: session.subscribe(db, message))
+                subscribed = True
+                changed.clear()
+            elif not session.lines:
+                raise HTTPException(status_code=400, detail="Subscribe before sending updates")
+            else:
+                if session.needs_rates(message):
+                    # Unknown to this session's rates, not necessarily to the database
+                    await run_with_session(session.refresh_rates)
+                changed.add(session.update(message))
+            seq = message.seq
+        except HTTPException as exc:
+            await websocket.send_json({"type": "error", "seq": message.seq, "detail": exc.detail})
+        except Exception:
+            logger.exception("Quote session message failed")
+            await websocket.send_json({"type": "error", "seq": message.seq, "detail": INTERNAL_ERROR})
+
+    if not session.lines or (not subscribed and not changed):
+        return
+
+    try:
+        if not subscribed and await run_with_session(session.is_stale):
+            # A part, machine or material was written (by any worker): reload and re-price everything
+            await run_with_session(lambda db: session.load(db, set(session.parts)))
+            changed = set(range(len(session.lines)))
+
+        if subscribed:
+            await run_in_threadpool(session.price_all)
+            await websocket.send_json({"type": "snapshot", "seq": seq, "lines": [line.describe() for line in session.lines]})
+            return
+    except HTTPException as exc:
+        await websocket.send_json({"type": "error", "seq": seq, "detail": exc.detail})
+        return
+    except Exception:
+        logger.exception("Quote session reload failed")
+        await websocket.send_json({"type": "error", "seq": seq, "detail": INTERNAL_ERROR})
+        return
+
+    deltas = {}
+    for index in sorted(changed):
+        try:
+            changes = await run_in_threadpool(session.price, index)
+        except HTTPException as exc:
+            await websocket.send_json({"type": "error", "seq": seq, "detail": exc.detail})
+            continue
+        except Exception:
+            logger.exception("Quote session pricing failed")
+            await websocket.send_json({"type": "error", "seq": seq, "detail": INTERNAL_ERROR})
+            continue
+        if changes:
+            deltas[str(index)] = changes
+    await websocket.send_json({"type": "delta", "seq": seq, "lines": deltas})
+
+
+@router.websocket("/ws/quote-session")
+async def quote_session(websocket: WebSocket):
+    """Live pricing session; see the module docstring for the protocol"""
+    await websocket.accept()
+    session = QuoteSession()
+    inbox: asyncio.Queue = asyncio.Queue()
+
+    async def read():
+        try:
+            while True:
+                frame = await websocket.receive()
+                if frame["type"] == "websocket.disconnect":
+                    break
+                if frame.get("text") is None:
+                    inbox.put_nowait(_InvalidFrame("Binary frames are not supported"))
+                    continue
+                try:
+                    message = json.loads(frame["text"])
+                except ValueError:
+                    inbox.put_nowait(_InvalidFrame("Message is not JSON"))
+                    continue
+                inbox.put_nowait(message if isinstance(message, dict) else _InvalidFrame("Message must be a JSON object"))
+        except Exception:
+            logger.exception("Quote session reader failed")
+        finally:
+            inbox.put_nowait(_CLOSED)
+
+    reader = asyncio.create_task(read())
+    try:
+        while True:
+            # Wait for one message, then take whatever else arrived meanwhile
+            batch = [await inbox.get()]
+            while not inbox.empty():
+                batch.append(inbox.get_nowait())
+            if _CLOSED in batch:
+                break
+            await _handle(websocket, session, batch)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        reader.cancel()
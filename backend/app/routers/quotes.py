@@ -1,11 +1,28 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session, joinedload
-from typing import List, Dict, Any
-from pydantic import BaseModel
+from fastapi import APIRouter, Depends, HTTPException, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import insert, or_
+from sqlalchemy.orm import Session, joinedload, selectinload
+from typing import List, Dict, Any, Literal, Callable, Iterator, Tuple
+from types import SimpleNamespace
+import dataclasses
+from datetime import datetime
+from pydantic import BaseModel, Field
+from ..async_routes import cpu_bound
 from ..db import get_db
 from .. import models
+from ..cache import Dependency, MISSING, quote_cache, revisions
+from ..catalog import CatalogSnapshot, catalog
+from ..metrics import ENGINE_SECONDS
+from ..profiling import stage
+from ..serialization import dumps, encoded_response, json_response, shape_nested
+from ..pagination import PageParams, page_params, paginate
 from ..services.quoting import calc_unit_cost
-from ..services.quoting_enhanced import calc_detailed_quote
+from ..services.quoting_enhanced import calc_detailed_quote, calc_unified_quote
+from ..services.price_curve import PartCostModel, price_curve, optimal_batch_size
+from ..services.quoting_batch import BatchInputs
+from ..services.repricing import api_repricing_pool
+from .customers import CustomerResponse
+from .parts import OperationCreate, PartUpdate
 
 router = APIRouter(prefix="/api/quotes", tags=["quotes"])
 
@@ -22,6 +39,76 @@ class CalculateResponse(BaseModel):
     unit_price: float
     total_time_hr: float
 
+class OperationOverride(BaseModel):
+    """Changes to one of the part's operations; omitted fields keep their value"""
+    id: int
+    machine_id: int | None = None
+    name: str | None = None
+    sequence: int | None = None
+    setup_time_hr: float | None = None
+    cycle_time_hr: float | None = None
+    allowance_pct: float | None = None
+    operation_type: str | None = None
+    tool_cost_per_part: float | None = None
+    tool_change_time_min: float | None = None
+    inspection_time_min: float | None = None
+    consumables_cost_per_part: float | None = None
+
+class MachineRateOverride(BaseModel):
+    machine_rate_per_hr: float | None = None
+    labor_rate_per_hr: float | None = None
+
+class QuoteOverrides(BaseModel):
+    """Unsaved edits to price the part with; nothing is written"""
+    part: PartUpdate | None = None
+    operations: List[OperationOverride] = []
+    add_operations: List[OperationCreate] = []
+    remove_operations: List[int] = []
+    machine_rates: Dict[int, MachineRateOverride] = {}
+    material_cost_per_lb: Dict[int, float] = {}
+
+class CalculateDetailedRequest(CalculateRequest):
+    overrides: QuoteOverrides | None = None
+
+QuoteSection = Literal["summary", "detailed", "operations"]
+
+class CalculateFullRequest(CalculateRequest):
+    include: List[QuoteSection] = ["summary", "detailed", "operations"]
+
+class QuantityRange(BaseModel):
+    start: int
+    stop: int
+    step: int = 1
+
+class PriceCurveRequest(BaseModel):
+    part_id: int
+    margin_pct: float = Field(0.15, ge=0)
+    quantities: List[int] | None = None
+    quantity_range: QuantityRange | None = None
+    # Batch size suggestion inputs
+    fixed_share_target: float = Field(0.05, gt=0, le=1)
+    annual_demand: int | None = Field(None, ge=1)
+    holding_cost_pct: float = Field(0.25, ge=0)
+
+DEFAULT_PRICE_BREAKS = [1, 10, 50, 100, 500, 1000]
+MAX_PRICE_CURVE_POINTS = 5000
+
+MAX_ITEM_QUANTITIES = 100
+MAX_BATCH_QUANTITIES = 500  # distinct quantities across all items of a request
+
+class BatchCalculateItem(BaseModel):
+    part_id: int | None = None
+    part_number: str | None = None
+    quantities: List[int] = Field(min_length=1, max_length=MAX_ITEM_QUANTITIES)
+    margin_pct: float = 0.15
+
+class BatchCalculateRequest(BaseModel):
+    items: List[BatchCalculateItem]
+    format: Literal["json", "ndjson"] = "json"
+    detail: Literal["summary", "full"] = "full"
+
+MAX_BATCH_ITEMS = 2000
+
 class QuoteItemCreate(BaseModel):
     part_id: int
     quantity: int
@@ -42,10 +129,23 @@ class QuoteItemResponse(BaseModel):
     labor_cost_unit: float
     unit_cost: float
     unit_price: float
+    pricing_engine: str
+    tooling_cost_unit: float
+    programming_cost_unit: float
+    inspection_cost_unit: float
+    consumables_cost_unit: float
+    overhead_cost_unit: float
+    setup_time_per_part: float
+    cycle_time_per_part: float
+    allowance_time_per_part: float
+    total_time_per_part: float
 
     class Config:
         from_attributes = True
 
+class QuoteItemDetailResponse(QuoteItemResponse):
+    breakdown: Dict[str, Any] | None = None
+
 class QuoteResponse(BaseModel):
     id: int
     customer_id: int
@@ -57,43 +157,254 @@ class QuoteResponse(BaseModel):
     class Config:
         from_attributes = True
 
-@router.post("/calculate", response_model=CalculateResponse)
-def calculate(payload: CalculateRequest, db: Session = Depends(get_db)):
-    """
-    Calculate cost breakdown for a part without saving.
-    Used for real-time quote preview.
-    """
-    part = db.query(models.Part).options(
-        joinedload(models.Part.operations).joinedload(models.Operation.machine),
-        joinedload(models.Part.material)
-    ).filter(models.Part.id == payload.part_id).first()
+class QuoteDetailResponse(QuoteResponse):
+    items: List[QuoteItemDetailResponse] = []
+
+class QuoteViewPart(BaseModel):
+    id: int
+    part_number: str
+    description: str | None
+    material_id: int
+    material_name: str
+
+class QuoteViewItem(QuoteItemDetailResponse):
+    part: QuoteViewPart
+
+class QuoteViewResponse(BaseModel):
+    id: int
+    customer_id: int
+    quote_number: str | None
+    status: str
+    notes: str | None
+    customer: CustomerResponse
+    items: List[QuoteViewItem] = []
+
+# Columns read by list_quotes, in response field order
+QUOTE_FIELDS = [name for name in QuoteResponse.model_fields if name != "items"]
+QUOTE_ITEM_FIELDS = list(QuoteItemResponse.model_fields)
+
+# Columns read by get_quote_view
+CUSTOMER_FIELDS = list(CustomerResponse.model_fields)
+QUOTE_VIEW_PART_FIELDS = [name for name in QuoteViewPart.model_fields if name != "material_name"]
+
+def _load_part(db: Session, part_id: int) -> models.Part:
+    """Load a part with its operations for quoting (rates come from the catalog)"""
+    with stage("load"):
+        part = db.query(models.Part).options(
+            joinedload(models.Part.operations)
+        ).filter(models.Part.id == part_id).first()
 
     if not part:
         raise HTTPException(status_code=404, detail="Part not found")
+    return part
 
-    ops = []
-    for op in part.operations:
-        ops.append({
-            "setup_time_hr": op.setup_time_hr,
-            "cycle_time_hr": op.cycle_time_hr,
-            "allowance_pct": op.allowance_pct,
-            "machine_rate_per_hr": op.machine.machine_rate_per_hr,
-            "labor_rate_per_hr": op.machine.labor_rate_per_hr,
-        })
+def _rates(db: Session) -> CatalogSnapshot:
+    """Current catalog snapshot, with every machine and material"""
+    with stage("load"):
+        return catalog.snapshot(db)
 
-    breakdown = calc_unit_cost(
-        quantity=payload.quantity,
-        stock_weight_lb=part.stock_weight_lb,
-        cost_per_lb=part.material.cost_per_lb,
-        scrap_factor=part.scrap_factor,
-        ops=ops,
-        margin_pct=payload.margin_pct,
-    )
+def _part_info(part: models.Part, rates: CatalogSnapshot) -> Dict[str, Any]:
+    return {
+        "part_number": part.part_number,
+        "description": part.description,
+        "material_name": rates.materials[part.material_id].name,
+    }
+
+def _detailed_inputs(part: models.Part, rates: CatalogSnapshot) -> Dict[str, Any]:
+    """Build the enhanced engine's keyword arguments for a loaded part"""
+    with stage("marshal"):
+        ops = []
+        for op in part.operations:
+            ops.append({
+                "name": op.name,
+                "sequence": op.sequence,
+                "operation_type": op.operation_type,
+                "setup_time_hr": op.setup_time_hr,
+                "cycle_time_hr": op.cycle_time_hr,
+                "allowance_pct": op.allowance_pct,
+                "tool_change_time_min": op.tool_change_time_min,
+                "inspection_time_min": op.inspection_time_min,
+                "tool_cost_per_part": op.tool_cost_per_part,
+                "consumables_cost_per_part": op.consumables_cost_per_part,
+                "machine_rate_per_hr": rates.machines[op.machine_id].machine_rate_per_hr,
+                "labor_rate_per_hr": rates.machines[op.machine_id].labor_rate_per_hr,
+            })
+
+        return {
+            "stock_weight_lb": part.stock_weight_lb,
+            "cost_per_lb": rates.materials[part.material_id].cost_per_lb,
+            "scrap_factor": part.scrap_factor,
+            "ops": ops,
+            "programming_time_hr": part.programming_time_hr,
+            "programming_rate_per_hr": part.programming_rate_per_hr,
+            "first_article_inspection_hr": part.first_article_inspection_hr,
+            "overhead_rate_pct": part.overhead_rate_pct,
+        }
+
+def _part_dependencies(part: models.Part) -> List[Dependency]:
+    """Entities whose revisions a cached calculation for this part depends on"""
+    deps: List[Dependency] = [("part", part.id), ("material", part.material_id)]
+    deps.extend(("machine", machine_id) for machine_id in {op.machine_id for op in part.operations})
+    return deps
+
+PART_OVERRIDE_FIELDS = list(PartUpdate.model_fields)
+OPERATION_OVERRIDE_FIELDS = list(OperationCreate.model_fields)
+
+def _part_copy(part: models.Part) -> SimpleNamespace:
+    """Plain copy of a loaded part and its operations, detached from the session"""
+    fields = {name: getattr(part, name) for name in PART_OVERRIDE_FIELDS}
+    operations = [
+        SimpleNamespace(id=op.id, **{name: getattr(op, name) for name in OPERATION_OVERRIDE_FIELDS})
+        for op in part.operations
+    ]
+    return SimpleNamespace(id=part.id, **fields, operations=operations)
+
+def _merge_overrides(
+    part: SimpleNamespace, rates: CatalogSnapshot, overrides: QuoteOverrides
+) -> Tuple[SimpleNamespace, CatalogSnapshot]:
+    """
+    Part and rates with unsaved edits applied, as new objects.
+
+    Works on plain copies (see _part_copy), so no ORM object is changed and
+    nothing can be flushed. Raises 400 for operations the part does not
+    have and for machines or materials missing from the rates.
+    """
+    fields = {name: getattr(part, name) for name in PART_OVERRIDE_FIELDS}
+    if overrides.part is not None:
+        fields.update(overrides.part.model_dump(exclude_none=True))
+
+    ops = {op.id: {name: getattr(op, name) for name in OPERATION_OVERRIDE_FIELDS} for op in part.operations}
+    unknown = sorted({*overrides.remove_operations, *(patch.id for patch in overrides.operations)} - ops.keys())
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Operations {unknown} do not belong to part {part.id}")
+    for operation_id in overrides.remove_operations:
+        ops.pop(operation_id, None)
+    for patch in overrides.operations:
+        if patch.id in ops:
+            ops[patch.id].update(patch.model_dump(exclude_none=True, exclude={"id"}))
+    op_list = [
+        *(SimpleNamespace(id=operation_id, **op) for operation_id, op in ops.items()),
+        *(SimpleNamespace(id=None, **op.model_dump()) for op in overrides.add_operations),
+    ]
+
+    machine_ids = {op.machine_id for op in op_list} | overrides.machine_rates.keys()
+    material_ids = {fields["material_id"]} | overrides.material_cost_per_lb.keys()
+    missing_machines = sorted(machine_ids - rates.machines.keys())
+    if missing_machines:
+        raise HTTPException(status_code=400, detail=f"Machines {missing_machines} not found")
+    missing_materials = sorted(material_ids - rates.materials.keys())
+    if missing_materials:
+        raise HTTPException(status_code=400, detail=f"Materials {missing_materials} not found")
+
+    machines, materials = rates.machines, rates.materials
+    if overrides.machine_rates:
+        machines = dict(machines)
+        for machine_id, override in overrides.machine_rates.items():
+            machines[machine_id] = dataclasses.replace(machines[machine_id], **override.model_dump(exclude_none=True))
+    if overrides.material_cost_per_lb:
+        materials = dict(materials)
+        for material_id, cost_per_lb in overrides.material_cost_per_lb.items():
+            materials[material_id] = dataclasses.replace(materials[material_id], cost_per_lb=cost_per_lb)
+
+    what_if = SimpleNamespace(id=part.id, **fields, operations=op_list)
+    return what_if, CatalogSnapshot(machines=machines, materials=materials)
+
+def _apply_overrides(
+    db: Session, part: models.Part, overrides: QuoteOverrides
+) -> Tuple[SimpleNamespace, CatalogSnapshot]:
+    """Merge unsaved edits into a copy of a loaded part and the catalog rates"""
+    return _merge_overrides(_part_copy(part), _rates(db), overrides)
+
+def _full_result(
+    part: models.Part, rates: CatalogSnapshot, quantity: int, margin_pct: float, include: frozenset
+) -> Dict[str, Any]:
+    """The calculate-full response: one unified engine pass, shaped by `include`"""
+    inputs = _detailed_inputs(part, rates)
+    with stage("compute"), ENGINE_SECONDS.time("unified"):
+        quote = calc_unified_quote(
+            quantity=quantity,
+            margin_pct=margin_pct,
+            include_detailed=bool(include & {"detailed", "operations"}),
+            **inputs,
+        )
 
-    return breakdown.to_dict()
+    with stage("serialize"):
+        result: Dict[str, Any] = {}
+        if "summary" in include:
+            result["summary"] = quote.summary.to_dict()
+        if quote.detailed is not None:
+            detailed = quote.detailed.to_dict()
+            if "operations" not in include:
+                detailed.pop("operations")
+            detailed["part_info"] = _part_info(part, rates)
+            result["detailed"] = detailed
+
+    return result
+
+def _cached_calculation(
+    key: tuple,
+    db: Session,
+    part_id: int,
+    compute: Callable[[models.Part, CatalogSnapshot], Dict[str, Any]],
+) -> Response:
+    """
+    Serve a calculation from the quote cache, or load the part and compute it.
+
+    Entries are validated against the part, material and machine revisions
+    and the shared generations in revision_counters, so writes made through
+    any worker, or outside the API, are never served stale. The cache holds
+    the encoded JSON body, so a hit costs one small query and no
+    serialization work at all.
+    """
+    with stage("load"):
+        revisions.sync(db)
+    body = quote_cache.get(key)
+    if body is MISSING:
+        epoch = revisions.epoch
+        part = _load_part(db, part_id)
+        result = compute(part, _rates(db))
+        with stage("serialize"):
+            body = dumps(result)
+        quote_cache.put(key, body, _part_dependencies(part), epoch)
+    return encoded_response(body)
+
+@router.post("/calculate", response_model=CalculateResponse)
+def calculate(payload: CalculateRequest, db: Session = Depends(get_db)):
+    """
+    Calculate cost breakdown for a part without saving.
+    Used for real-time quote preview.
+    """
+    def compute(part: models.Part, rates: CatalogSnapshot) -> Dict[str, Any]:
+        with stage("marshal"):
+            ops = []
+            for op in part.operations:
+                machine = rates.machines[op.machine_id]
+                ops.append({
+                    "setup_time_hr": op.setup_time_hr,
+                    "cycle_time_hr": op.cycle_time_hr,
+                    "allowance_pct": op.allowance_pct,
+                    "machine_rate_per_hr": machine.machine_rate_per_hr,
+                    "labor_rate_per_hr": machine.labor_rate_per_hr,
+                })
+
+        with stage("compute"), ENGINE_SECONDS.time("unit_cost"):
+            breakdown = calc_unit_cost(
+                quantity=payload.quantity,
+                stock_weight_lb=part.stock_weight_lb,
+                cost_per_lb=rates.materials[part.material_id].cost_per_lb,
+                scrap_factor=part.scrap_factor,
+                ops=ops,
+                margin_pct=payload.margin_pct,
+            )
+
+        with stage("serialize"):
+            return breakdown.to_dict()
+
+    key = ("summary", payload.part_id, payload.quantity, payload.margin_pct)
+    return _cached_calculation(key, db, payload.part_id, compute)
 
 @router.post("/calculate-detailed")
-def calculate_detailed(payload: CalculateRequest, db: Session = Depends(get_db)) -> Dict[str, Any]:
+def calculate_detailed(payload: CalculateDetailedRequest, db: Session = Depends(get_db)) -> Response:
     """
     Calculate DETAILED cost breakdown for a part without saving.
 
@@ -104,61 +415,224 @@ def calculate_detailed(payload: CalculateRequest, db: Session = Depends(get_db))
     - Summary with extended totals
 
     Implements Rules 2, 3, and 4 with full itemization.
+
+    `overrides` prices unsaved edits (part fields, operation changes,
+    added/removed operations, machine and material rates) merged in memory
+    with the stored part. These what-if results are not cached.
+    """
+    def compute(part: models.Part, rates: CatalogSnapshot) -> Dict[str, Any]:
+        # Calculate detailed breakdown
+        inputs = _detailed_inputs(part, rates)
+        with stage("compute"), ENGINE_SECONDS.time("detailed"):
+            detailed_breakdown = calc_detailed_quote(
+                quantity=payload.quantity,
+                margin_pct=payload.margin_pct,
+                **inputs,
+            )
+
+        # Add part and material metadata
+        with stage("serialize"):
+            result = detailed_breakdown.to_dict()
+            result["part_info"] = _part_info(part, rates)
+
+        return result
+
+    if payload.overrides is not None:
+        part, rates = _apply_overrides(db, _load_part(db, payload.part_id), payload.overrides)
+        result = compute(part, rates)
+        with stage("serialize"):
+            return encoded_response(dumps(result))
+
+    key = ("detailed", payload.part_id, payload.quantity, payload.margin_pct)
+    return _cached_calculation(key, db, payload.part_id, compute)
+
+@router.post("/calculate-full")
+def calculate_full(payload: CalculateFullRequest, db: Session = Depends(get_db)) -> Response:
     """
-    part = db.query(models.Part).options(
-        joinedload(models.Part.operations).joinedload(models.Operation.machine),
-        joinedload(models.Part.material)
-    ).filter(models.Part.id == payload.part_id).first()
+    Calculate the summary and detailed breakdowns in one request.
 
-    if not part:
-        raise HTTPException(status_code=404, detail="Part not found")
+    Loads the part once and runs a single engine pass. `include` selects
+    the sections to return:
+    - summary: same fields as /calculate
+    - detailed: same shape as /calculate-detailed
+    - operations: per-operation rows inside the detailed section
+    """
+    include = frozenset(payload.include)
 
-    # Build operations list with enhanced data
-    ops = []
-    for op in part.operations:
-        ops.append({
-            "name": op.name,
-            "sequence": op.sequence,
-            "operation_type": op.operation_type,
-            "setup_time_hr": op.setup_time_hr,
-            "cycle_time_hr": op.cycle_time_hr,
-            "allowance_pct": op.allowance_pct,
-            "tool_change_time_min": op.tool_change_time_min,
-            "inspection_time_min": op.inspection_time_min,
-            "tool_cost_per_part": op.tool_cost_per_part,
-            "consumables_cost_per_part": op.consumables_cost_per_part,
-            "machine_rate_per_hr": op.machine.machine_rate_per_hr,
-            "labor_rate_per_hr": op.machine.labor_rate_per_hr,
-        })
+    def compute(part: models.Part, rates: CatalogSnapshot) -> Dict[str, Any]:
+        return _full_result(part, rates, payload.quantity, payload.margin_pct, include)
 
-    # Calculate detailed breakdown
-    detailed_breakdown = calc_detailed_quote(
-        quantity=payload.quantity,
-        stock_weight_lb=part.stock_weight_lb,
-        cost_per_lb=part.material.cost_per_lb,
-        scrap_factor=part.scrap_factor,
-        ops=ops,
-        programming_time_hr=part.programming_time_hr,
-        programming_rate_per_hr=part.programming_rate_per_hr,
-        first_article_inspection_hr=part.first_article_inspection_hr,
-        overhead_rate_pct=part.overhead_rate_pct,
-        margin_pct=payload.margin_pct,
-    )
+    key = ("full", payload.part_id, payload.quantity, payload.margin_pct, include)
+    return _cached_calculation(key, db, payload.part_id, compute)
 
-    # Add part and material metadata
-    result = detailed_breakdown.to_dict()
-    result["part_info"] = {
-        "part_number": part.part_number,
-        "description": part.description,
-        "material_name": part.material.name,
-    }
+@router.get("/cache/stats")
+def cache_stats() -> Dict[str, Any]:
+    """Hit/miss/eviction counters for the calculation cache"""
+    return quote_cache.stats()
 
-    return result
+@router.post("/calculate-batch")
+@cpu_bound
+def calculate_batch(payload: BatchCalculateRequest, db: Session = Depends(get_db)):
+    """
+    Calculate breakdowns for many parts at many quantities (RFQ import).
+
+    Each item names a part by `part_id` or `part_number` and lists the
+    quantities to price. All parts and operations are loaded in a fixed
+    number of queries and priced by the vectorized batch engine, sharded
+    over the repricing worker processes when the batch is large enough.
+
+    Results stream back in request order as a JSON array or, with
+    `format: "ndjson"`, one JSON object per line. Everything is priced
+    before the response starts, so a failure is an error status rather
+    than a truncated body; only the encoding is streamed. An item that
+    cannot be priced carries an `error` instead of `results`; the rest of
+    the batch is unaffected. `detail: "summary"` returns only the summary
+    section per quantity.
+    """
+    if len(payload.items) > MAX_BATCH_ITEMS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_ITEMS} items can be calculated per request")
+    if len({q for item in payload.items for q in item.quantities}) > MAX_BATCH_QUANTITIES:
+        raise HTTPException(
+            status_code=400, detail=f"At most {MAX_BATCH_QUANTITIES} distinct quantities can be calculated per request"
+        )
 
-@router.post("", response_model=QuoteResponse)
-def create_quote(payload: QuoteCreate, db: Session = Depends(get_db)):
+    part_ids = {item.part_id for item in payload.items if item.part_id is not None}
+    part_numbers = {item.part_number for item in payload.items if item.part_id is None and item.part_number}
+
+    with stage("load"):
+        parts = db.query(models.Part).options(
+            selectinload(models.Part.operations)
+        ).filter(
+            or_(models.Part.id.in_(part_ids), models.Part.part_number.in_(part_numbers))
+        ).all()
+    by_id = {part.id: part for part in parts}
+    by_number = {part.part_number: part for part in parts}
+    rates = _rates(db)
+
+    # Resolve every item to an error or a row of the group pricing its
+    # quantity set: each group is priced at its own quantities only, not
+    # every part at every quantity in the request
+    groups: Dict[Tuple[int, ...], Tuple[List[Dict[str, Any]], List[float]]] = {}
+    resolved: List[Any] = []
+    part_infos: List[Dict[str, Any]] = []
+    for item in payload.items:
+        if item.part_id is not None:
+            part = by_id.get(item.part_id)
+            missing = f"Part {item.part_id} not found"
+        elif item.part_number:
+            part = by_number.get(item.part_number)
+            missing = f"Part {item.part_number} not found"
+        else:
+            resolved.append("Item must include part_id or part_number")
+            continue
+
+        if part is None:
+            resolved.append(missing)
+        elif min(item.quantities) < 1:
+            resolved.append("Quantities must be at least 1")
+        else:
+            quantity_set = tuple(sorted(set(item.quantities)))
+            rows, margins = groups.setdefault(quantity_set, ([], []))
+            resolved.append((quantity_set, len(rows), len(part_infos)))
+            rows.append(_detailed_inputs(part, rates))
+            margins.append(item.margin_pct)
+            part_infos.append({"part_id": part.id, **_part_info(part, rates)})
+
+    with stage("compute"), ENGINE_SECONDS.time("batch"):
+        pending = {
+            quantity_set: api_repricing_pool.submit(
+                BatchInputs.from_parts(rows), quantity_set, margins, keep_operations=payload.detail == "full"
+            )
+            for quantity_set, (rows, margins) in groups.items()
+        }
+        batches = {quantity_set: batch.result() for quantity_set, batch in pending.items()}
+
+    def results() -> Iterator[Dict[str, Any]]:
+        for index, (item, row) in enumerate(zip(payload.items, resolved)):
+            if isinstance(row, str):
+                yield {"index": index, "part_id": item.part_id, "part_number": item.part_number, "error": row}
+                continue
+
+            quantity_set, group_row, info = row
+            batch = batches[quantity_set]
+            columns = [quantity_set.index(q) for q in item.quantities]
+            if payload.detail == "full":
+                breakdowns = [batch.breakdown(group_row, column).to_dict() for column in columns]
+            else:
+                breakdowns = [{"summary": batch.summary(group_row, column)} for column in columns]
+            yield {"index": index, **part_infos[info], "results": breakdowns}
+
+    if payload.format == "ndjson":
+        body = (dumps(result) + b"\n" for result in results())
+        return StreamingResponse(body, media_type="application/x-ndjson")
+
+    def json_array() -> Iterator[bytes]:
+        yield b"["
+        for i, result in enumerate(results()):
+            yield (b"," if i else b"") + dumps(result)
+        yield b"]"
+
+    return StreamingResponse(json_array(), media_type="application/json")
+
+@router.post("/price-curve")
+@cpu_bound
+def calculate_price_curve(payload: PriceCurveRequest, db: Session = Depends(get_db)) -> Response:
     """
-    Create and save a complete quote with calculated pricing.
+    Calculate unit and extended pricing for a part across many quantities.
+
+    The part is loaded once and reduced to fixed costs (setup, programming,
+    first article inspection) and per-unit costs, so any list or range of
+    quantities is priced in a single call. Quantities come from
+    `quantities`, `quantity_range`, or default to the standard price breaks.
+    """
+    quantities = list(payload.quantities or [])
+    quantity_range = range(0)
+    if payload.quantity_range:
+        r = payload.quantity_range
+        if r.step < 1:
+            raise HTTPException(status_code=400, detail="quantity_range.step must be at least 1")
+        quantity_range = range(r.start, r.stop + 1, r.step)
+    # Checked before the range is expanded, so a huge range costs nothing
+    if len(quantities) + len(quantity_range) > MAX_PRICE_CURVE_POINTS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {MAX_PRICE_CURVE_POINTS} quantities can be priced per request"
+        )
+    quantities.extend(quantity_range)
+    if not quantities:
+        quantities = DEFAULT_PRICE_BREAKS
+
+    quantities = sorted(set(quantities))
+    if quantities[0] < 1:
+        raise HTTPException(status_code=400, detail="Quantities must be at least 1")
+
+    part = _load_part(db, payload.part_id)
+    rates = _rates(db)
+    inputs = _detailed_inputs(part, rates)
+    with stage("compute"), ENGINE_SECONDS.time("price_curve"):
+        model = PartCostModel.from_inputs(**inputs)
+        price_breaks = price_curve(inputs, quantities, payload.margin_pct)
+
+    return json_response({
+        "part_info": _part_info(part, rates),
+        "margin_pct": round(payload.margin_pct * 100, 1),
+        "cost_model": model.to_dict(),
+        "price_breaks": price_breaks,
+        "optimal_batch": optimal_batch_size(
+            model,
+            fixed_share_target=payload.fixed_share_target,
+            annual_demand=payload.annual_demand,
+            holding_cost_pct=payload.holding_cost_pct,
+        ),
+    })
+
+def _build_quote(db: Session, payload: QuoteCreate, progress: Callable[[int], None] | None = None) -> int:
+    """
+    Price and save a quote in one transaction; returns the new quote's id.
+
+    progress(n) is called after each priced line item and once more right
+    before the commit (background jobs report it and abort by raising from
+    it, which leaves nothing written).
     """
 
     # Verify customer exists
@@ -166,6 +640,22 @@ def create_quote(payload: QuoteCreate, db: Session = Depends(get_db)):
     if not customer:
         raise HTTPException(status_code=404, detail="Customer not found")
 
+    # Load every referenced part in one query (operations via one selectin load)
+    part_ids = {item.part_id for item in payload.items}
+    with stage("load"):
+        parts = {
+            part.id: part
+            for part in db.query(models.Part).options(
+                selectinload(models.Part.operations)
+            ).filter(models.Part.id.in_(part_ids))
+        }
+    missing = [item.part_id for item in payload.items if item.part_id not in parts]
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Part {missing[0]} not found")
+
+    # Machine and material rates come from the catalog
+    rates = _rates(db)
+
     # Create quote
     quote = models.Quote(
         customer_id=payload.customer_id,
@@ -178,61 +668,160 @@ def create_quote(payload: QuoteCreate, db: Session = Depends(get_db)):
     # Generate quote number
     quote.quote_number = f"Q-{quote.id:05d}"
 
-    # Process each line item
-    for item_data in payload.items:
-        part = db.query(models.Part).options(
-            joinedload(models.Part.operations).joinedload(models.Operation.machine),
-            joinedload(models.Part.material)
-        ).filter(models.Part.id == item_data.part_id).first()
-
-        if not part:
-            raise HTTPException(status_code=404, detail=f"Part {item_data.part_id} not found")
-
-        # Calculate costs
-        ops = [{
-            "setup_time_hr": op.setup_time_hr,
-            "cycle_time_hr": op.cycle_time_hr,
-            "allowance_pct": op.allowance_pct,
-            "machine_rate_per_hr": op.machine.machine_rate_per_hr,
-            "labor_rate_per_hr": op.machine.labor_rate_per_hr,
-        } for op in part.operations]
-
-        breakdown = calc_unit_cost(
-            quantity=item_data.quantity,
-            stock_weight_lb=part.stock_weight_lb,
-            cost_per_lb=part.material.cost_per_lb,
-            scrap_factor=part.scrap_factor,
-            ops=ops,
-            margin_pct=item_data.margin_pct,
-        )
+    # Calculate each line item with the detailed engine and keep every component
+    item_rows = []
+    for index, item_data in enumerate(payload.items):
+        part = parts[item_data.part_id]
+        inputs = _detailed_inputs(part, rates)
+        with stage("compute"), ENGINE_SECONDS.time("detailed"):
+            detailed = calc_detailed_quote(
+                quantity=item_data.quantity,
+                margin_pct=item_data.margin_pct,
+                **inputs,
+            )
+        time = detailed.time_breakdown
+        cost = detailed.cost_breakdown
+
+        with stage("serialize"):
+            breakdown = detailed.to_dict()
+            breakdown["part_info"] = _part_info(part, rates)
+
+        item_rows.append({
+            "quote_id": quote.id,
+            "part_id": part.id,
+            "quantity": item_data.quantity,
+            "margin_pct": item_data.margin_pct,
+            "material_cost_unit": cost.material_total,
+            "machine_cost_unit": cost.machine_cost,
+            "labor_cost_unit": cost.labor_cost,
+            "unit_cost": detailed.unit_cost,
+            "unit_price": detailed.unit_price,
+            "tooling_cost_unit": cost.tooling_cost,
+            "programming_cost_unit": cost.programming_cost,
+            "inspection_cost_unit": cost.inspection_cost,
+            "consumables_cost_unit": cost.consumables_cost,
+            "overhead_cost_unit": cost.overhead_cost,
+            "setup_time_per_part": time.setup_time_per_part,
+            "cycle_time_per_part": time.cycle_time,
+            "allowance_time_per_part": time.allowance_time,
+            "total_time_per_part": time.total_time_per_part,
+            "breakdown": breakdown,
+            "pricing_engine": "detailed",
+        })
+        if progress is not None:
+            progress(index + 1)
 
-        # Create quote item with calculated values
-        quote_item = models.QuoteItem(
-            quote_id=quote.id,
-            part_id=part.id,
-            quantity=item_data.quantity,
-            margin_pct=item_data.margin_pct,
-            material_cost_unit=breakdown.material_unit,
-            machine_cost_unit=breakdown.machine_unit,
-            labor_cost_unit=breakdown.labor_unit,
-            unit_cost=breakdown.unit_cost,
-            unit_price=breakdown.unit_price,
-        )
-        db.add(quote_item)
+    # Write all line items with a single bulk insert
+    if item_rows:
+        db.execute(insert(models.QuoteItem), item_rows)
 
+    # Last check before anything becomes visible: a cancel that arrived
+    # during the insert still writes nothing
+    if progress is not None:
+        progress(len(item_rows))
     db.commit()
-    db.refresh(quote)
-    return quote
+    return quote.id
+
+@router.post("", response_model=QuoteResponse)
+@cpu_bound
+def create_quote(payload: QuoteCreate, db: Session = Depends(get_db)):
+    """
+    Create and save a complete quote with calculated pricing.
+
+    Each line item stores every detailed cost and time component plus the
+    full breakdown, so the quote can be served later without recomputing.
+    For quotes with many lines, see POST /api/quotes/jobs.
+    """
+    quote_id = _build_quote(db, payload)
+    # Reload with items so serializing the response needs no lazy loads
+    return db.query(models.Quote).options(selectinload(models.Quote.items)).filter(models.Quote.id == quote_id).one()
 
 @router.get("", response_model=List[QuoteResponse])
-def list_quotes(db: Session = Depends(get_db)):
-    """Get all quotes"""
-    return db.query(models.Quote).options(joinedload(models.Quote.items)).all()
+def list_quotes(
+    response: Response,
+    status: str | None = None,
+    customer_id: int | None = None,
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
+    page: PageParams = Depends(page_params),
+    db: Session = Depends(get_db),
+):
+    """
+    Get a page of quotes, newest first, optionally filtered.
 
-@router.get("/{quote_id}", response_model=QuoteResponse)
-def get_quote(quote_id: int, db: Session = Depends(get_db)):
-    """Get a specific quote with all line items"""
+    Reads plain columns and shapes them straight into the QuoteResponse
+    layout (no ORM objects or response validation); output is identical.
+    """
+    query = db.query(*(getattr(models.Quote, name) for name in QUOTE_FIELDS))
+    if status is not None:
+        query = query.filter(models.Quote.status == status)
+    if customer_id is not None:
+        query = query.filter(models.Quote.customer_id == customer_id)
+    if created_from is not None:
+        query = query.filter(models.Quote.created_at >= created_from)
+    if created_to is not None:
+        query = query.filter(models.Quote.created_at < created_to)
+    rows = paginate(query, models.Quote.id, page, response, descending=True)
+
+    item_rows = []
+    if rows:
+        item_rows = db.query(
+            models.QuoteItem.quote_id, *(getattr(models.QuoteItem, name) for name in QUOTE_ITEM_FIELDS)
+        ).filter(models.QuoteItem.quote_id.in_([row.id for row in rows])).all()
+
+    return json_response(shape_nested(rows, QUOTE_FIELDS, item_rows, QUOTE_ITEM_FIELDS, "items"), response)
+
+@router.get("/{quote_id}", response_model=QuoteDetailResponse | QuoteResponse)
+def get_quote(quote_id: int, detail: Literal["summary", "full"] = "summary", db: Session = Depends(get_db)):
+    """
+    Get a specific quote with all line items.
+
+    With ?detail=full each item includes the breakdown stored when the
+    quote was saved; nothing is recalculated.
+    """
     quote = db.query(models.Quote).options(joinedload(models.Quote.items)).filter(models.Quote.id == quote_id).first()
     if not quote:
         raise HTTPException(status_code=404, detail="Quote not found")
-    return quote
+    if detail == "full":
+        return QuoteDetailResponse.model_validate(quote)
+    return QuoteResponse.model_validate(quote)
+
+@router.get("/{quote_id}/view", response_model=QuoteViewResponse)
+def get_quote_view(quote_id: int, db: Session = Depends(get_db)) -> Response:
+    """
+    Everything the quote page shows, in two queries.
+
+    The quote with its customer, then its line items with their stored
+    breakdowns and the summary fields of the parts they reference, so the
+    cost follows the size of the quote rather than of the parts catalog.
+    """
+    quote = db.query(
+        *(getattr(models.Quote, name) for name in QUOTE_FIELDS),
+        *(getattr(models.Customer, name) for name in CUSTOMER_FIELDS),
+    ).join(models.Quote.customer).filter(models.Quote.id == quote_id).first()
+    if not quote:
+        raise HTTPException(status_code=404, detail="Quote not found")
+
+    item_rows = db.query(
+        *(getattr(models.QuoteItem, name) for name in QUOTE_ITEM_FIELDS),
+        models.QuoteItem.breakdown,
+        *(getattr(models.Part, name) for name in QUOTE_VIEW_PART_FIELDS),
+        models.Material.name,
+    ).join(models.QuoteItem.part).join(models.Part.material).filter(
+        models.QuoteItem.quote_id == quote_id
+    ).order_by(models.QuoteItem.id).all()
+
+    quote_fields = len(QUOTE_FIELDS)
+    result = dict(zip(QUOTE_FIELDS, quote[:quote_fields]))
+    result["customer"] = dict(zip(CUSTOMER_FIELDS, quote[quote_fields:]))
+
+    item_fields = len(QUOTE_ITEM_FIELDS)
+    items = []
+    for row in item_rows:
+        item = dict(zip(QUOTE_ITEM_FIELDS, row[:item_fields]))
+        item["breakdown"] = row[item_fields]
+        item["part"] = dict(zip(QUOTE_VIEW_PART_FIELDS, row[item_fields + 1:-1]))
+        item["part"]["material_name"] = row[-1]
+        items.append(item)
+    result["items"] = items
+    return json_response(result)
@@ -0,0 +1,275 @@
+from dataclasses import replace
+from typing import Any, Dict, List
+
+import numpy as np
+from fastapi import APIRouter, Depends, HTTPException, Response
+from pydantic import BaseModel, Field
+from sqlalchemy import BigInteger, ColumnElement, any_, cast, literal, or_, select
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from .. import models
+from ..async_routes import cpu_bound
+from ..catalog import CatalogSnapshot, catalog
+from ..db import get_db
+from ..profiling import stage
+from ..serialization import json_response
+from ..services.part_columns import load_columns, rate_column
+from ..services.quoting_batch import calc_cost_model_batch
+from .quotes import MachineRateOverride
+
+router = APIRouter(prefix="/api/quotes/rate-impact", tags=["quotes"])
+
+# Quotes whose prices can still change
+OPEN_QUOTE_STATUSES = ("draft", "sent")
+MAX_IMPACT_ROWS = 1000
+
+class RateImpactRequest(BaseModel):
+    material_cost_per_lb: Dict[int, float] = {}
+    machine_rates: Dict[int, MachineRateOverride] = {}
+    # Parts have no quantity of their own: they are compared at this one
+    quantity: int = Field(100, ge=1)
+    margin_pct: float = Field(0.15, ge=0)
+    limit: int = Field(100, ge=0, le=MAX_IMPACT_ROWS)
+
+class PartImpact(BaseModel):
+    part_id: int
+    part_number: str
+    unit_price: float
+    proposed_unit_price: float
+    delta: float
+    delta_pct: float
+
+class QuoteItemImpact(BaseModel):
+    id: int
+    quote_id: int
+    part_id: int
+    part_number: str
+    quantity: int
+    margin_pct: float
+    quoted_unit_price: float
+    pricing_engine: str
+    unit_price: float
+    proposed_unit_price: float
+    delta: float
+    extended_delta: float
+
+class QuoteImpact(BaseModel):
+    quote_id: int
+    quote_number: str | None
+    status: str
+    customer_id: int
+    items: int
+    quoted_extended_price: float
+    extended_price: float
+    proposed_extended_price: float
+    delta: float
+    delta_pct: float
+
+class ImpactSummary(BaseModel):
+    parts: int
+    quote_items: int
+    quotes: int
+    extended_price: float
+    proposed_extended_price: float
+    delta: float
+
+class RateImpactResponse(BaseModel):
+    summary: ImpactSummary
+    parts: List[PartImpact]
+    quotes: List[QuoteImpact]
+    quote_items: List[QuoteItemImpact]
+
+def _proposed_rates(rates: CatalogSnapshot, payload: RateImpactRequest) -> CatalogSnapshot:
+    """The catalog snapshot with the proposed rates applied"""
+    machines = dict(rates.machines)
+    for machine_id, change in payload.machine_rates.items():
+        machines[machine_id] = replace(machines[machine_id], **change.model_dump(exclude_none=True))
+    materials = dict(rates.materials)
+    for material_id, cost_per_lb in payload.material_cost_per_lb.items():
+        materials[material_id] = replace(materials[material_id], cost_per_lb=cost_per_lb)
+    return CatalogSnapshot(machines=machines, materials=materials)
+
+def _pct(delta: np.ndarray, base: np.ndarray) -> np.ndarray:
+    return np.divide(delta * 100, base, out=np.zeros(len(delta)), where=base != 0)
+
+def _id_in(connection: Connection, column, ids: List[int]) -> ColumnElement[bool]:
+    """column IN ids; on PostgreSQL one array literal, far cheaper to send and parse than a parameter per id"""
+    if connection.dialect.name == "postgresql":
+        return column == any_(cast(literal("{" + ",".join(map(str, ids)) + "}"), ARRAY(BigInteger)))
+    return column.in_(ids)
+
+def _ranked(values: np.ndarray, limit: int) -> np.ndarray:
+    """Indices of the `limit` largest absolute values, largest first"""
+    return np.argsort(-np.abs(values), kind="stable")[:limit]
+
+@router.post("", response_model=RateImpactResponse)
+@cpu_bound
+def rate_impact(payload: RateImpactRequest, db: Session = Depends(get_db)) -> Response:
+    """
+    What proposed material and machine rate changes would do to prices.
+
+    Every part using a changed material or machine is repriced with the
+    current and the proposed rates, at `quantity`. So is every line of a
+    draft or sent quote for those parts, at its own quantity and margin;
+    `quoted_unit_price` is the price stored on the line and `pricing_engine`
+    the engine that priced it: only "detailed" lines are comparable with
+    `unit_price`, as "unit_cost" lines leave out tooling, inspection,
+    programming and overhead. Parts, quotes and lines are ranked by
+    absolute change (lines and quotes by extended price) and cut to
+    `limit`; the summary covers all of them. Nothing is written.
+    """
+    if not payload.material_cost_per_lb and not payload.machine_rates:
+        raise HTTPException(status_code=400, detail="No rate changes given")
+    proposed_values = [
+        *payload.material_cost_per_lb.values(),
+        *(value for change in payload.machine_rates.values() for value in change.model_dump(exclude_none=True).values()),
+    ]
+    if any(value < 0 for value in proposed_values):
+        raise HTTPException(status_code=400, detail="Rates cannot be negative")
+
+    rates = catalog.snapshot(db)
+    missing_materials = sorted(set(payload.material_cost_per_lb) - set(rates.materials))
+    missing_machines = sorted(set(payload.machine_rates) - set(rates.machines))
+    if missing_materials:
+        raise HTTPException(status_code=404, detail=f"Materials {missing_materials} not found")
+    if missing_machines:
+        raise HTTPException(status_code=404, detail=f"Machines {missing_machines} not found")
+    proposed = _proposed_rates(rates, payload)
+
+    with stage("load"):
+        # Parts using a changed material or machine. Those on a changed machine are
+        # looked up once here: as a subquery, every query below would scan operations again
+        connection = db.connection()
+        affected = []
+        if payload.material_cost_per_lb:
+            affected.append(models.Part.material_id.in_(payload.material_cost_per_lb))
+        if payload.machine_rates:
+            machine_part_ids = connection.execute(
+                select(models.Operation.part_id).where(models.Operation.machine_id.in_(payload.machine_rates)).distinct()
+            ).scalars().all()
+            affected.append(_id_in(connection, models.Part.id, machine_part_ids))
+        where = or_(*affected)
+
+        columns = load_columns(db, rates, where=where)
+        items = connection.execute(
+            select(
+                models.QuoteItem.id, models.QuoteItem.quote_id, models.QuoteItem.part_id,
+                models.QuoteItem.quantity, models.QuoteItem.margin_pct, models.QuoteItem.unit_price,
+                models.QuoteItem.pricing_engine,
+            )
+            .join(models.Quote, models.Quote.id == models.QuoteItem.quote_id)
+            .where(models.Quote.status.in_(OPEN_QUOTE_STATUSES), models.QuoteItem.part_id.in_(select(models.Part.id).where(where)))
+            .order_by(models.QuoteItem.id)
+        ).all()
+
+    with stage("compute"):
+        current_inputs = columns.inputs
+        proposed_inputs = replace(
+            current_inputs,
+            cost_per_lb=rate_column(columns.material_id, proposed.materials, "cost_per_lb"),
+            machine_rate_per_hr=rate_column(columns.op_machine_id, proposed.machines, "machine_rate_per_hr"),
+            labor_rate_per_hr=rate_column(columns.op_machine_id, proposed.machines, "labor_rate_per_hr"),
+        )
+        current_fixed, current_variable = calc_cost_model_batch(current_inputs)
+        proposed_fixed, proposed_variable = calc_cost_model_batch(proposed_inputs)
+
+        def unit_price(fixed, variable, rows, quantity, margin):
+            unit_cost = variable[rows] + fixed[rows] / quantity
+            return unit_cost + unit_cost * margin
+
+        # Parts at the reference quantity
+        all_rows = np.arange(len(columns.part_id))
+        part_price = unit_price(current_fixed, current_variable, all_rows, payload.quantity, payload.margin_pct)
+        part_proposed = unit_price(proposed_fixed, proposed_variable, all_rows, payload.quantity, payload.margin_pct)
+        part_delta = part_proposed - part_price
+
+        # Open quote lines at their own quantity and margin
+        item_columns = list(zip(*items)) or [()] * 7
+        item_id, quote_id, item_part_id, quantity, margin, quoted, engine = (np.array(column) for column in item_columns)
+        quantity = quantity.astype(np.float64)
+        rows = np.searchsorted(columns.part_id, item_part_id.astype(np.int64))
+        item_price = unit_price(current_fixed, current_variable, rows, quantity, margin)
+        item_proposed = unit_price(proposed_fixed, proposed_variable, rows, quantity, margin)
+        item_delta = item_proposed - item_price
+
+        # Quotes: sums over their affected lines
+        quote_ids, quote_index = np.unique(quote_id.astype(np.int64), return_inverse=True)
+        quote_items = np.bincount(quote_index, minlength=len(quote_ids))
+        quote_quoted = np.bincount(quote_index, quoted.astype(np.float64) * quantity, minlength=len(quote_ids))
+        quote_price = np.bincount(quote_index, item_price * quantity, minlength=len(quote_ids))
+        quote_proposed = np.bincount(quote_index, item_proposed * quantity, minlength=len(quote_ids))
+        quote_delta = quote_proposed - quote_price
+
+    top_parts = _ranked(part_delta, payload.limit)
+    top_items = _ranked(item_delta * quantity, payload.limit)
+    top_quotes = _ranked(quote_delta, payload.limit)
+
+    with stage("load"):
+        quote_info = {
+            row.id: row for row in db.execute(
+                select(models.Quote.id, models.Quote.quote_number, models.Quote.status, models.Quote.customer_id)
+                .where(models.Quote.id.in_(quote_ids[top_quotes].tolist()))
+            )
+        }
+
+    part_number = columns.part_number
+    part_pct = _pct(part_delta, part_price)
+    quote_pct = _pct(quote_delta, quote_price)
+    result: Dict[str, Any] = {
+        "summary": {
+            "parts": len(columns.part_id),
+            "quote_items": len(item_id),
+            "quotes": len(quote_ids),
+            "extended_price": round(float(quote_price.sum()), 2),
+            "proposed_extended_price": round(float(quote_proposed.sum()), 2),
+            "delta": round(float(quote_delta.sum()), 2),
+        },
+        "parts": [
+            {
+                "part_id": int(columns.part_id[row]),
+                "part_number": part_number[row],
+                "unit_price": round(float(part_price[row]), 2),
+                "proposed_unit_price": round(float(part_proposed[row]), 2),
+                "delta": round(float(part_delta[row]), 2),
+                "delta_pct": round(float(part_pct[row]), 1),
+            }
+            for row in top_parts.tolist()
+        ],
+        "quotes": [
+            {
+                "quote_id": int(quote_ids[row]),
+                "quote_number": quote_info[int(quote_ids[row])].quote_number,
+                "status": quote_info[int(quote_ids[row])].status,
+                "customer_id": quote_info[int(quote_ids[row])].customer_id,
+                "items": int(quote_items[row]),
+                "quoted_extended_price": round(float(quote_quoted[row]), 2),
+                "extended_price": round(float(quote_price[row]), 2),
+                "proposed_extended_price": round(float(quote_proposed[row]), 2),
+                "delta": round(float(quote_delta[row]), 2),
+                "delta_pct": round(float(quote_pct[row]), 1),
+            }
+            for row in top_quotes.tolist()
+        ],
+        "quote_items": [
+            {
+                "id": int(item_id[row]),
+                "quote_id": int(quote_id[row]),
+                "part_id": int(item_part_id[row]),
+                "part_number": part_number[rows[row]],
+                "quantity": int(quantity[row]),
+                "margin_pct": float(margin[row]),
+                "quoted_unit_price": round(float(quoted[row]), 2),
+                "pricing_engine": str(engine[row]),
+                "unit_price": round(float(item_price[row]), 2),
+                "proposed_unit_price": round(float(item_proposed[row]), 2),
+                "delta": round(float(item_delta[row]), 2),
+                "extended_delta": round(float(item_delta[row] * quantity[row]), 2),
+            }
+            for row in top_items.tolist()
+        ],
+    }
+    with stage("serialize"):
+        # Validated here, as a JSON response skips FastAPI's response_model check
+        return json_response(RateImpactResponse.model_validate(result).model_dump())
@@ -0,0 +1,91 @@
+"""
+Columnar part loading for the batch engine
+
+Reads parts and their operations as plain columns, without building ORM
+objects, and turns them straight into BatchInputs with the rates of a
+catalog snapshot. Used by the nightly repricing run (app.reprice) and
+the rate impact endpoint.
+"""
+
+from dataclasses import dataclass
+from typing import List, Optional
+
+import numpy as np
+from sqlalchemy import ColumnElement, select
+from sqlalchemy.orm import Session
+
+from .. import models
+from ..catalog import CatalogSnapshot
+from .quoting_batch import PART_FIELDS, BatchInputs
+
+PART_COLUMNS = [name for name in PART_FIELDS if name != "cost_per_lb"]
+OPERATION_COLUMNS = [
+    "setup_time_hr", "cycle_time_hr", "allowance_pct", "tool_change_time_min",
+    "inspection_time_min", "tool_cost_per_part", "consumables_cost_per_part",
+]
+
+
+@dataclass
+class PartColumns:
+    """Quoting inputs for a set of parts, as columns, with the ids they came from"""
+    part_id: np.ndarray
+    part_number: List[str]
+    material_id: np.ndarray
+    op_machine_id: np.ndarray
+    inputs: BatchInputs
+
+
+def rate_column(ids: np.ndarray, rates: dict, attribute: str) -> np.ndarray:
+    """Look a rate up for every id, once per distinct id"""
+    unique, inverse = np.unique(ids, return_inverse=True)
+    return np.array([getattr(rates[int(key)], attribute) for key in unique], dtype=np.float64)[inverse]
+
+
+def load_columns(
+    db: Session,
+    rates: CatalogSnapshot,
+    after_id: int = 0,
+    limit: Optional[int] = None,
+    where: Optional[ColumnElement[bool]] = None,
+) -> PartColumns:
+    """
+    Read parts with id > after_id (up to limit, in id order) and their
+    operations as columns, optionally only the parts matching `where`.
+    """
+    part_query = select(
+        models.Part.id, models.Part.part_number, models.Part.material_id,
+        *(getattr(models.Part, name) for name in PART_COLUMNS),
+    ).where(models.Part.id > after_id).order_by(models.Part.id).limit(limit)
+    if where is not None:
+        part_query = part_query.where(where)
+    # Through the session's connection: plain Core rows, skipping the ORM's per-row processing
+    connection = db.connection()
+    part_rows = connection.execute(part_query).all()
+
+    part_columns = list(zip(*part_rows)) or [()] * (3 + len(PART_COLUMNS))
+    part_id = np.array(part_columns[0], dtype=np.int64)
+    material_id = np.array(part_columns[2], dtype=np.int64)
+
+    op_query = select(
+        models.Operation.part_id, models.Operation.machine_id,
+        *(getattr(models.Operation, name) for name in OPERATION_COLUMNS),
+    ).order_by(models.Operation.part_id, models.Operation.sequence, models.Operation.id)
+    if len(part_id):
+        op_query = op_query.where(models.Operation.part_id.between(int(part_id[0]), int(part_id[-1])))
+    if where is not None:
+        op_query = op_query.where(models.Operation.part_id.in_(select(models.Part.id).where(where)))
+    op_rows = connection.execute(op_query).all() if len(part_id) else []
+
+    op_columns = list(zip(*op_rows)) or [()] * (2 + len(OPERATION_COLUMNS))
+    op_part_id = np.array(op_columns[0], dtype=np.int64)
+    op_machine_id = np.array(op_columns[1], dtype=np.int64)
+
+    inputs = BatchInputs(
+        op_part_index=np.searchsorted(part_id, op_part_id).astype(np.intp),
+        cost_per_lb=rate_column(material_id, rates.materials, "cost_per_lb"),
+        machine_rate_per_hr=rate_column(op_machine_id, rates.machines, "machine_rate_per_hr"),
+        labor_rate_per_hr=rate_column(op_machine_id, rates.machines, "labor_rate_per_hr"),
+        **{name: np.array(part_columns[3 + i], dtype=np.float64) for i, name in enumerate(PART_COLUMNS)},
+        **{name: np.array(op_columns[2 + i], dtype=np.float64) for i, name in enumerate(OPERATION_COLUMNS)},
+    )
+    return PartColumns(part_id, list(part_columns[1]), material_id, op_machine_id, inputs)
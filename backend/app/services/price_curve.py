@@ -0,0 +1,224 @@
+"""
+Quantity Price-Break Curve
+
+Every cost in calc_detailed_quote is either a fixed cost that is amortized
+over the run (setup time, programming, first article inspection) or a
+per-unit cost, so:
+
+    unit_cost(q) = variable_unit_cost + fixed_cost / q
+
+PartCostModel reduces a part to those two numbers, which describe the
+curve and drive the batch size suggestion. The price columns themselves
+come from the batch engine, which follows calc_detailed_quote term for
+term, and are rounded the way DetailedQuoteBreakdown.to_dict() rounds, so
+a price break never differs from /calculate-detailed at that quantity.
+"""
+
+from dataclasses import dataclass
+from math import ceil, sqrt
+from typing import List, Dict, Optional, Sequence
+
+import numpy as np
+
+from .quoting_batch import BatchInputs, calc_detailed_quote_batch
+
+
+@dataclass
+class PartCostModel:
+    """Fixed and per-unit cost components for one part"""
+    # Fixed costs per production run (amortized over quantity)
+    setup_machine: float
+    setup_labor: float
+    setup_overhead: float
+    programming: float
+    first_article: float
+
+    # Per-unit costs
+    material: float
+    run_machine: float
+    run_labor: float
+    run_overhead: float
+    tooling: float
+    consumables: float
+
+    @property
+    def setup_cost(self) -> float:
+        """Cost that recurs with every batch (machine setup incl. overhead)"""
+        return self.setup_machine + self.setup_labor + self.setup_overhead
+
+    @property
+    def fixed_cost(self) -> float:
+        return self.setup_cost + self.programming + self.first_article
+
+    @property
+    def variable_unit_cost(self) -> float:
+        return (
+            self.material +
+            self.run_machine +
+            self.run_labor +
+            self.run_overhead +
+            self.tooling +
+            self.consumables
+        )
+
+    @classmethod
+    def from_inputs(
+        cls,
+        *,
+        stock_weight_lb: float,
+        cost_per_lb: float,
+        scrap_factor: float,
+        ops: List[Dict],
+        programming_time_hr: float = 0.0,
+        programming_rate_per_hr: float = 75.0,
+        first_article_inspection_hr: float = 0.0,
+        overhead_rate_pct: float = 1.5,
+    ) -> "PartCostModel":
+        """
+        Split a part into fixed and per-unit costs.
+
+        Takes the same inputs as calc_detailed_quote, minus quantity and margin.
+        """
+        setup_machine = setup_labor = 0.0
+        run_machine = run_labor = 0.0
+        tooling = consumables = 0.0
+
+        for op in ops:
+            run_time = (
+                op["cycle_time_hr"]
+                + op["cycle_time_hr"] * op["allowance_pct"]
+                + op.get("tool_change_time_min", 0.0) / 60.0
+                + op.get("inspection_time_min", 0.0) / 60.0
+            )
+            setup_machine += op["setup_time_hr"] * op["machine_rate_per_hr"]
+            setup_labor += op["setup_time_hr"] * op["labor_rate_per_hr"]
+            run_machine += run_time * op["machine_rate_per_hr"]
+            run_labor += run_time * op["labor_rate_per_hr"]
+            tooling += op.get("tool_cost_per_part", 0.0)
+            consumables += op.get("consumables_cost_per_part", 0.0)
+
+        # Overhead is applied to machine + labor, as in calc_detailed_quote
+        overhead_factor = overhead_rate_pct - 1.0
+
+        return cls(
+            setup_machine=setup_machine,
+            setup_labor=setup_labor,
+            setup_overhead=(setup_machine + setup_labor) * overhead_factor,
+            programming=max(programming_time_hr, 0.0) * programming_rate_per_hr,
+            first_article=max(first_article_inspection_hr, 0.0) * programming_rate_per_hr,
+            material=stock_weight_lb * cost_per_lb * (1.0 + scrap_factor),
+            run_machine=run_machine,
+            run_labor=run_labor,
+            run_overhead=(run_machine + run_labor) * overhead_factor,
+            tooling=tooling,
+            consumables=consumables,
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            "fixed": {
+                "setup_machine": round(self.setup_machine, 2),
+                "setup_labor": round(self.setup_labor, 2),
+                "setup_overhead": round(self.setup_overhead, 2),
+                "programming": round(self.programming, 2),
+                "first_article": round(self.first_article, 2),
+                "total": round(self.fixed_cost, 2),
+            },
+            "per_unit": {
+                "material": round(self.material, 2),
+                "machine": round(self.run_machine, 2),
+                "labor": round(self.run_labor, 2),
+                "overhead": round(self.run_overhead, 2),
+                "tooling": round(self.tooling, 2),
+                "consumables": round(self.consumables, 2),
+                "total": round(self.variable_unit_cost, 2),
+            },
+        }
+
+
+def _round(values: np.ndarray, digits: int) -> List[float]:
+    """
+    Round exactly as round(value, digits) does in the scalar engine's
+    to_dict(). np.round scales by 10**digits first, which is only inexact
+    when the scaled value sits next to a half; those few go through round().
+    """
+    scaled = values * 10.0 ** digits
+    rounded = np.round(values, digits).tolist()
+    tolerance = np.maximum(np.spacing(np.abs(scaled)) * 8, 1e-9)
+    for i in np.flatnonzero(np.abs(scaled - np.floor(scaled) - 0.5) <= tolerance).tolist():
+        rounded[i] = round(float(values[i]), digits)
+    return rounded
+
+
+def price_curve(
+    inputs: Dict,
+    quantities: Sequence[int],
+    margin_pct: float = 0.15,
+) -> Dict[str, list]:
+    """
+    Price a part at every requested quantity.
+
+    Takes the same inputs as calc_detailed_quote, minus quantity and margin.
+    Returns parallel columns (one entry per quantity) with unit and extended
+    cost/price, equal to the summary calc_detailed_quote gives at each
+    quantity, and the share of the unit cost that is amortized fixed cost.
+    """
+    batch = calc_detailed_quote_batch(
+        BatchInputs.from_parts([inputs]), quantities, margin_pct, keep_operations=False
+    )
+    q = batch.quantities.astype(np.float64)
+    unit_cost = batch.unit_cost[0]
+    fixed_unit = PartCostModel.from_inputs(**inputs).fixed_cost / q
+    fixed_share = np.divide(fixed_unit, unit_cost, out=np.zeros_like(q), where=unit_cost > 0)
+
+    return {
+        "quantity": batch.quantities.tolist(),
+        "unit_cost": _round(unit_cost, 2),
+        "unit_price": _round(batch.unit_price[0], 2),
+        "extended_cost": _round(batch.extended_cost[0], 2),
+        "extended_price": _round(batch.extended_price[0], 2),
+        "fixed_share_pct": _round(fixed_share * 100, 1),
+    }
+
+
+def optimal_batch_size(
+    model: PartCostModel,
+    *,
+    fixed_share_target: float = 0.05,
+    annual_demand: Optional[int] = None,
+    holding_cost_pct: float = 0.25,
+) -> dict:
+    """
+    Suggest a batch size for the part.
+
+    The break-even quantity is the smallest run at which amortized fixed
+    costs fall to fixed_share_target of the unit cost; beyond it larger
+    runs barely move the price. When annual_demand is given, the economic
+    order quantity (EOQ) is also returned, treating the per-batch setup
+    cost as the order cost and holding_cost_pct of the variable unit cost
+    as the annual holding cost.
+    """
+    fixed = model.fixed_cost
+    variable = model.variable_unit_cost
+
+    if fixed <= 0:
+        break_even = 1
+    elif variable <= 0 or fixed_share_target <= 0:
+        break_even = None
+    else:
+        target = min(fixed_share_target, 1.0)
+        break_even = max(ceil(fixed * (1.0 - target) / (target * variable)), 1)
+
+    result = {
+        "fixed_share_target_pct": round(fixed_share_target * 100, 1),
+        "break_even_quantity": break_even,
+        "economic_order_quantity": None,
+    }
+
+    holding_cost = variable * holding_cost_pct
+    if annual_demand and holding_cost > 0:
+        eoq = sqrt(2.0 * annual_demand * model.setup_cost / holding_cost)
+        result["economic_order_quantity"] = max(round(eoq), 1)
+
+    result["suggested_batch_size"] = result["economic_order_quantity"] or break_even
+    return result
@@ -0,0 +1,485 @@
+"""
+Vectorized Batch Quoting Engine
+
+NumPy implementation of the enhanced quoting engine for repricing many
+parts at many quantities in one call. Operations for every part are held
+as flat columns with a part index, and every cost and time component is
+returned as a (parts x quantities) array.
+
+Arithmetic follows calc_detailed_quote term for term and accumulates
+operations in the same order, so results match the scalar engine bit for
+bit (the differential check in benchmarks/bench_engines.py verifies it).
+DetailedQuoteBreakdown objects are only built on request via
+BatchQuoteResult.breakdown().
+"""
+
+from dataclasses import dataclass, field
+from typing import List, Dict, Sequence, Tuple, Union, Optional
+
+import numpy as np
+
+from .quoting_enhanced import (
+    TimeBreakdown,
+    CostBreakdown,
+    OperationBreakdown,
+    DetailedQuoteBreakdown,
+)
+
+# Part-level inputs and the defaults used by calc_detailed_quote
+PART_FIELDS = {
+    "stock_weight_lb": None,
+    "cost_per_lb": None,
+    "scrap_factor": None,
+    "programming_time_hr": 0.0,
+    "programming_rate_per_hr": 75.0,
+    "first_article_inspection_hr": 0.0,
+    "overhead_rate_pct": 1.5,
+}
+
+# Operation-level inputs and the defaults used by calc_operation_breakdown
+OPERATION_FIELDS = {
+    "setup_time_hr": None,
+    "cycle_time_hr": None,
+    "allowance_pct": None,
+    "tool_change_time_min": 0.0,
+    "inspection_time_min": 0.0,
+    "tool_cost_per_part": 0.0,
+    "consumables_cost_per_part": 0.0,
+    "machine_rate_per_hr": None,
+    "labor_rate_per_hr": None,
+}
+
+
+def _column(rows: List[Dict], name: str, default: Optional[float]) -> np.ndarray:
+    if default is None:
+        return np.array([row[name] for row in rows], dtype=np.float64)
+    return np.array([row.get(name, default) for row in rows], dtype=np.float64)
+
+
+@dataclass
+class BatchInputs:
+    """Columnar quoting inputs for many parts.
+
+    Part columns have shape (P,). Operation columns have shape (N,) and
+    op_part_index maps every operation to its part row.
+    """
+    # Part columns
+    stock_weight_lb: np.ndarray
+    cost_per_lb: np.ndarray
+    scrap_factor: np.ndarray
+    programming_time_hr: np.ndarray
+    programming_rate_per_hr: np.ndarray
+    first_article_inspection_hr: np.ndarray
+    overhead_rate_pct: np.ndarray
+
+    # Operation columns
+    op_part_index: np.ndarray
+    setup_time_hr: np.ndarray
+    cycle_time_hr: np.ndarray
+    allowance_pct: np.ndarray
+    tool_change_time_min: np.ndarray
+    inspection_time_min: np.ndarray
+    tool_cost_per_part: np.ndarray
+    consumables_cost_per_part: np.ndarray
+    machine_rate_per_hr: np.ndarray
+    labor_rate_per_hr: np.ndarray
+
+    # Operation labels (only needed to build OperationBreakdown objects)
+    op_name: List[str] = field(default_factory=list)
+    op_sequence: List[int] = field(default_factory=list)
+    op_type: List[str] = field(default_factory=list)
+
+    @property
+    def n_parts(self) -> int:
+        return len(self.stock_weight_lb)
+
+    @property
+    def n_ops(self) -> int:
+        return len(self.op_part_index)
+
+    @classmethod
+    def from_parts(cls, parts: List[Dict]) -> "BatchInputs":
+        """
+        Build columns from part dictionaries.
+
+        Each part dictionary takes the keyword arguments of
+        calc_detailed_quote (stock_weight_lb, cost_per_lb, scrap_factor,
+        programming/FAI/overhead fields) plus an "ops" list in the same
+        format the scalar engine accepts.
+        """
+        ops: List[Dict] = []
+        op_part_index: List[int] = []
+        for index, part in enumerate(parts):
+            for op in part["ops"]:
+                ops.append(op)
+                op_part_index.append(index)
+
+        columns = {name: _column(parts, name, default) for name, default in PART_FIELDS.items()}
+        columns.update({name: _column(ops, name, default) for name, default in OPERATION_FIELDS.items()})
+
+        return cls(
+            op_part_index=np.array(op_part_index, dtype=np.intp),
+            op_name=[op.get("name", "") for op in ops],
+            op_sequence=[op.get("sequence", 0) for op in ops],
+            op_type=[op.get("operation_type", "machining") for op in ops],
+            **columns,
+        )
+
+    def operation_ranks(self) -> List[np.ndarray]:
+        """Operation rows grouped by position within their part: first operations, second, ..."""
+        order = np.argsort(self.op_part_index, kind="stable")
+        sorted_index = self.op_part_index[order]
+        starts = np.searchsorted(sorted_index, sorted_index)
+        rank = np.empty(self.n_ops, dtype=np.intp)
+        rank[order] = np.arange(self.n_ops) - starts
+        by_rank = np.argsort(rank, kind="stable")
+        bounds = np.searchsorted(rank[by_rank], np.arange(rank.max() + 2 if self.n_ops else 1))
+        return [by_rank[start:end] for start, end in zip(bounds[:-1], bounds[1:])]
+
+    def operation_indices(self, part_index: int) -> np.ndarray:
+        """Operation rows belonging to one part, in input order"""
+        if not hasattr(self, "_op_order"):
+            self._op_order = np.argsort(self.op_part_index, kind="stable")
+            self._op_bounds = np.searchsorted(
+                self.op_part_index[self._op_order], np.arange(self.n_parts + 1)
+            )
+        start, end = self._op_bounds[part_index], self._op_bounds[part_index + 1]
+        return self._op_order[start:end]
+
+
+@dataclass
+class BatchQuoteResult:
+    """Cost and time components for every (part, quantity) pair.
+
+    All summary arrays have shape (P, Q). Per-operation arrays have shape
+    (N, Q) and are only present when the batch was run with
+    keep_operations=True.
+    """
+    inputs: BatchInputs
+    quantities: np.ndarray
+    margin_pct: np.ndarray
+
+    # Time breakdown (Rule 2)
+    setup_time_per_part: np.ndarray
+    cycle_time: np.ndarray
+    allowance_time: np.ndarray
+    tool_change_time: np.ndarray
+    inspection_time: np.ndarray
+    total_time_per_part: np.ndarray
+
+    # Cost breakdown (Rule 3)
+    material_base: np.ndarray
+    material_scrap: np.ndarray
+    material_total: np.ndarray
+    machine_cost: np.ndarray
+    labor_cost: np.ndarray
+    tooling_cost: np.ndarray
+    programming_cost: np.ndarray
+    inspection_cost: np.ndarray
+    consumables_cost: np.ndarray
+    overhead_cost: np.ndarray
+    subtotal_cost: np.ndarray
+    unit_cost: np.ndarray
+    margin_amount: np.ndarray
+    unit_price: np.ndarray
+
+    # Extended totals (Rule 4)
+    extended_cost: np.ndarray
+    extended_price: np.ndarray
+    profit_amount: np.ndarray
+
+    # Per-operation components
+    op_setup_time_per_part: Optional[np.ndarray] = None
+    op_total_time: Optional[np.ndarray] = None
+    op_machine_cost: Optional[np.ndarray] = None
+    op_labor_cost: Optional[np.ndarray] = None
+    op_total_cost: Optional[np.ndarray] = None
+
+    def summary(self, part_index: int, quantity_index: int) -> dict:
+        """
+        Summary section for one (part, quantity) pair.
+
+        Same values and rounding as DetailedQuoteBreakdown.to_dict()["summary"],
+        read straight from the arrays.
+        """
+        p, q = part_index, quantity_index
+        return {
+            "quantity": int(self.quantities[q]),
+            "unit_cost": round(float(self.unit_cost[p, q]), 2),
+            "unit_price": round(float(self.unit_price[p, q]), 2),
+            "margin_pct": round(float(self.margin_pct[p]) * 100, 1),
+            "extended_cost": round(float(self.extended_cost[p, q]), 2),
+            "extended_price": round(float(self.extended_price[p, q]), 2),
+            "profit_amount": round(float(self.profit_amount[p, q]), 2),
+        }
+
+    def breakdown(self, part_index: int, quantity_index: int) -> DetailedQuoteBreakdown:
+        """
+        Build the scalar DetailedQuoteBreakdown for one (part, quantity) pair.
+
+        Produces the same object calc_detailed_quote would return for that
+        part, so callers can reuse to_dict() and the existing response shape.
+        """
+        if self.op_total_time is None:
+            raise ValueError("Batch was run without keep_operations; per-operation data is unavailable")
+
+        p, q = part_index, quantity_index
+        inputs = self.inputs
+
+        operations_breakdown = []
+        for i in inputs.operation_indices(p):
+            cycle_time = float(inputs.cycle_time_hr[i])
+            operations_breakdown.append(OperationBreakdown(
+                operation_name=inputs.op_name[i],
+                operation_type=inputs.op_type[i],
+                sequence=inputs.op_sequence[i],
+                setup_time_per_part=float(self.op_setup_time_per_part[i, q]),
+                cycle_time=cycle_time,
+                allowance_time=cycle_time * float(inputs.allowance_pct[i]),
+                tool_change_time=float(inputs.tool_change_time_min[i]) / 60.0,
+                inspection_time=float(inputs.inspection_time_min[i]) / 60.0,
+                total_time=float(self.op_total_time[i, q]),
+                machine_cost=float(self.op_machine_cost[i, q]),
+                labor_cost=float(self.op_labor_cost[i, q]),
+                tooling_cost=float(inputs.tool_cost_per_part[i]),
+                consumables_cost=float(inputs.consumables_cost_per_part[i]),
+                total_cost=float(self.op_total_cost[i, q]),
+            ))
+
+        time_breakdown = TimeBreakdown(
+            setup_time_per_part=float(self.setup_time_per_part[p, q]),
+            cycle_time=float(self.cycle_time[p, q]),
+            allowance_time=float(self.allowance_time[p, q]),
+            tool_change_time=float(self.tool_change_time[p, q]),
+            inspection_time=float(self.inspection_time[p, q]),
+            total_time_per_part=float(self.total_time_per_part[p, q]),
+        )
+
+        cost_breakdown = CostBreakdown(
+            material_base=float(self.material_base[p, q]),
+            material_scrap=float(self.material_scrap[p, q]),
+            material_total=float(self.material_total[p, q]),
+            machine_cost=float(self.machine_cost[p, q]),
+            labor_cost=float(self.labor_cost[p, q]),
+            tooling_cost=float(self.tooling_cost[p, q]),
+            programming_cost=float(self.programming_cost[p, q]),
+            inspection_cost=float(self.inspection_cost[p, q]),
+            consumables_cost=float(self.consumables_cost[p, q]),
+            overhead_cost=float(self.overhead_cost[p, q]),
+            subtotal_cost=float(self.subtotal_cost[p, q]),
+            unit_cost=float(self.unit_cost[p, q]),
+            margin_amount=float(self.margin_amount[p, q]),
+            unit_price=float(self.unit_price[p, q]),
+        )
+
+        return DetailedQuoteBreakdown(
+            time_breakdown=time_breakdown,
+            cost_breakdown=cost_breakdown,
+            operations_breakdown=operations_breakdown,
+            quantity=int(self.quantities[q]),
+            unit_cost=float(self.unit_cost[p, q]),
+            unit_price=float(self.unit_price[p, q]),
+            margin_pct=float(self.margin_pct[p]),
+            extended_cost=float(self.extended_cost[p, q]),
+            extended_price=float(self.extended_price[p, q]),
+            profit_amount=float(self.profit_amount[p, q]),
+        )
+
+
+def calc_detailed_quote_batch(
+    inputs: BatchInputs,
+    quantities: Sequence[int],
+    margin_pct: Union[float, Sequence[float]] = 0.15,
+    *,
+    keep_operations: bool = True,
+) -> BatchQuoteResult:
+    """
+    Calculate detailed quote components for every part at every quantity.
+
+    Args:
+        inputs: Columnar part and operation data
+        quantities: Quantities to price each part at (all >= 1)
+        margin_pct: Profit margin, either one value or one per part
+        keep_operations: Keep per-operation (N, Q) arrays so that
+            BatchQuoteResult.breakdown() can rebuild operation rows.
+            Disable for large repricing runs that only need totals.
+
+    Returns:
+        BatchQuoteResult with (parts x quantities) arrays
+    """
+    qty = np.asarray(quantities, dtype=np.int64).reshape(-1)
+    if qty.size and qty.min() < 1:
+        raise ValueError("Quantities must be at least 1")
+
+    n_parts, n_qty = inputs.n_parts, len(qty)
+    shape = (n_parts, n_qty)
+    margin = np.broadcast_to(np.asarray(margin_pct, dtype=np.float64), (n_parts,))
+    q = qty.astype(np.float64)
+    idx = inputs.op_part_index
+
+    # ==================== OPERATIONS (N x Q) ====================
+    setup_per_part = inputs.setup_time_hr[:, None] / q[None, :]
+    cycle_time = inputs.cycle_time_hr
+    allowance_time = cycle_time * inputs.allowance_pct
+    tool_change_time = inputs.tool_change_time_min / 60.0
+    inspection_time = inputs.inspection_time_min / 60.0
+
+    op_total_time = (
+        setup_per_part
+        + cycle_time[:, None]
+        + allowance_time[:, None]
+        + tool_change_time[:, None]
+        + inspection_time[:, None]
+    )
+    op_machine_cost = op_total_time * inputs.machine_rate_per_hr[:, None]
+    op_labor_cost = op_total_time * inputs.labor_rate_per_hr[:, None]
+
+    # ==================== PER-PART ACCUMULATION ====================
+    # Operations are added one rank at a time (every part's first operation,
+    # then every part's second, ...), so each part's running sum is built in
+    # operation order and matches the scalar engine's exactly. A rank holds
+    # at most one operation per part, so plain fancy-index adds are safe,
+    # and much faster than np.add.at.
+    rank_rows = inputs.operation_ranks()
+
+    def per_part(values: np.ndarray) -> np.ndarray:
+        out = np.zeros(shape)
+        if values.ndim == 1:
+            values = values[:, None]
+        for rows in rank_rows:
+            out[idx[rows]] += values[rows]
+        return out
+
+    total_machine_cost = per_part(op_machine_cost)
+    total_labor_cost = per_part(op_labor_cost)
+    total_tooling_cost = per_part(inputs.tool_cost_per_part)
+    total_consumables_cost = per_part(inputs.consumables_cost_per_part)
+    total_time = per_part(op_total_time)
+
+    total_setup_time = per_part(setup_per_part)
+    total_cycle_time = per_part(cycle_time)
+    total_allowance_time = per_part(allowance_time)
+    total_tool_change_time = per_part(tool_change_time)
+    total_inspection_time = per_part(inspection_time)
+
+    # ==================== MATERIAL COST ====================
+    material_base = inputs.stock_weight_lb * inputs.cost_per_lb
+    material_scrap = material_base * inputs.scrap_factor
+    material_total = material_base + material_scrap
+
+    # ==================== PROGRAMMING & INSPECTION ====================
+    programming_cost = np.where(
+        (inputs.programming_time_hr > 0)[:, None],
+        (inputs.programming_time_hr * inputs.programming_rate_per_hr)[:, None] / q[None, :],
+        0.0,
+    )
+    inspection_cost = np.where(
+        (inputs.first_article_inspection_hr > 0)[:, None],
+        (inputs.first_article_inspection_hr * inputs.programming_rate_per_hr)[:, None] / q[None, :],
+        0.0,
+    )
+
+    # ==================== OVERHEAD ALLOCATION ====================
+    direct_costs = total_machine_cost + total_labor_cost
+    overhead_cost = direct_costs * (inputs.overhead_rate_pct - 1.0)[:, None]
+
+    # ==================== TOTAL COST ====================
+    subtotal_cost = (
+        material_total[:, None] +
+        total_machine_cost +
+        total_labor_cost +
+        total_tooling_cost +
+        programming_cost +
+        inspection_cost +
+        total_consumables_cost
+    )
+    unit_cost = subtotal_cost + overhead_cost
+
+    # ==================== MARGIN & PRICE ====================
+    margin_amount = unit_cost * margin[:, None]
+    unit_price = unit_cost + margin_amount
+
+    extended_cost = unit_cost * q[None, :]
+    extended_price = unit_price * q[None, :]
+    profit_amount = extended_price - extended_cost
+
+    return BatchQuoteResult(
+        inputs=inputs,
+        quantities=qty,
+        margin_pct=np.array(margin),
+        setup_time_per_part=total_setup_time,
+        cycle_time=total_cycle_time,
+        allowance_time=total_allowance_time,
+        tool_change_time=total_tool_change_time,
+        inspection_time=total_inspection_time,
+        total_time_per_part=total_time,
+        material_base=np.broadcast_to(material_base[:, None], shape),
+        material_scrap=np.broadcast_to(material_scrap[:, None], shape),
+        material_total=np.broadcast_to(material_total[:, None], shape),
+        machine_cost=total_machine_cost,
+        labor_cost=total_labor_cost,
+        tooling_cost=total_tooling_cost,
+        programming_cost=programming_cost,
+        inspection_cost=inspection_cost,
+        consumables_cost=total_consumables_cost,
+        overhead_cost=overhead_cost,
+        subtotal_cost=subtotal_cost,
+        unit_cost=unit_cost,
+        margin_amount=margin_amount,
+        unit_price=unit_price,
+        extended_cost=extended_cost,
+        extended_price=extended_price,
+        profit_amount=profit_amount,
+        op_setup_time_per_part=setup_per_part if keep_operations else None,
+        op_total_time=op_total_time if keep_operations else None,
+        op_machine_cost=op_machine_cost if keep_operations else None,
+        op_labor_cost=op_labor_cost if keep_operations else None,
+        op_total_cost=(
+            op_machine_cost + op_labor_cost
+            + inputs.tool_cost_per_part[:, None]
+            + inputs.consumables_cost_per_part[:, None]
+        ) if keep_operations else None,
+    )
+
+
+def calc_cost_model_batch(inputs: BatchInputs) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Fixed and per-unit cost of every part, so that
+
+        unit_cost(q) = variable_unit_cost + fixed_cost / q
+
+    The vectorized counterpart of price_curve.PartCostModel: prices each
+    part at its own quantity (e.g. one per quote item) without building a
+    (parts x quantities) grid. Sums are grouped differently from
+    calc_detailed_quote_batch, so unit costs agree only within half a cent
+    (CENT_TOLERANCE, checked in benchmarks/bench_engines.py): a value near
+    a half cent can round to the neighbouring cent.
+
+    Returns:
+        (fixed_cost, variable_unit_cost), each of shape (P,)
+    """
+    n_parts, idx = inputs.n_parts, inputs.op_part_index
+    rate = inputs.machine_rate_per_hr + inputs.labor_rate_per_hr
+    run_time = (
+        inputs.cycle_time_hr
+        + inputs.cycle_time_hr * inputs.allowance_pct
+        + inputs.tool_change_time_min / 60.0
+        + inputs.inspection_time_min / 60.0
+    )
+
+    setup = np.bincount(idx, inputs.setup_time_hr * rate, minlength=n_parts)
+    run = np.bincount(idx, run_time * rate, minlength=n_parts)
+    per_unit_ops = np.bincount(idx, inputs.tool_cost_per_part + inputs.consumables_cost_per_part, minlength=n_parts)
+
+    # Overhead is applied to machine + labor, as in calc_detailed_quote
+    fixed_cost = (
+        setup * inputs.overhead_rate_pct
+        + np.maximum(inputs.programming_time_hr, 0.0) * inputs.programming_rate_per_hr
+        + np.maximum(inputs.first_article_inspection_hr, 0.0) * inputs.programming_rate_per_hr
+    )
+    variable_unit_cost = (
+        inputs.stock_weight_lb * inputs.cost_per_lb * (1.0 + inputs.scrap_factor)
+        + run * inputs.overhead_rate_pct
+        + per_unit_ops
+    )
+    return fixed_cost, variable_unit_cost
@@ -6,7 +6,9 @@ cost breakdowns satisfying Rules 2, 3, and 4.
 """
 
 from dataclasses import dataclass
-from typing import List, Dict
+from typing import List, Dict, Optional
+
+from .quoting import QuoteBreakdown, calc_unit_cost
 
 @dataclass
 class TimeBreakdown:
@@ -239,13 +241,51 @@ def calc_detailed_quote(
         DetailedQuoteBreakdown with complete cost and time analysis
     """
 
+    operations_breakdown = [
+        calc_operation_breakdown(
+            operation=op,
+            quantity=quantity,
+            machine_rate=op["machine_rate_per_hr"],
+            labor_rate=op["labor_rate_per_hr"]
+        )
+        for op in ops
+    ]
+
+    return _assemble_detailed_quote(
+        operations_breakdown,
+        quantity=quantity,
+        stock_weight_lb=stock_weight_lb,
+        cost_per_lb=cost_per_lb,
+        scrap_factor=scrap_factor,
+        programming_time_hr=programming_time_hr,
+        programming_rate_per_hr=programming_rate_per_hr,
+        first_article_inspection_hr=first_article_inspection_hr,
+        overhead_rate_pct=overhead_rate_pct,
+        margin_pct=margin_pct,
+    )
+
+
+def _assemble_detailed_quote(
+    operations_breakdown: List[OperationBreakdown],
+    *,
+    quantity: int,
+    stock_weight_lb: float,
+    cost_per_lb: float,
+    scrap_factor: float,
+    programming_time_hr: float,
+    programming_rate_per_hr: float,
+    first_article_inspection_hr: float,
+    overhead_rate_pct: float,
+    margin_pct: float,
+) -> DetailedQuoteBreakdown:
+    """Roll per-operation breakdowns up into the full quote breakdown"""
+
     # ==================== MATERIAL COST ====================
     material_base = stock_weight_lb * cost_per_lb
     material_scrap = material_base * scrap_factor
     material_total = material_base + material_scrap
 
     # ==================== OPERATIONS BREAKDOWN ====================
-    operations_breakdown = []
     total_machine_cost = 0.0
     total_labor_cost = 0.0
     total_tooling_cost = 0.0
@@ -259,16 +299,7 @@ def calc_detailed_quote(
     total_tool_change_time = 0.0
     total_inspection_time = 0.0
 
-    for op in ops:
-        op_breakdown = calc_operation_breakdown(
-            operation=op,
-            quantity=quantity,
-            machine_rate=op["machine_rate_per_hr"],
-            labor_rate=op["labor_rate_per_hr"]
-        )
-
-        operations_breakdown.append(op_breakdown)
-
+    for op_breakdown in operations_breakdown:
         # Accumulate costs
         total_machine_cost += op_breakdown.machine_cost
         total_labor_cost += op_breakdown.labor_cost
@@ -361,3 +392,97 @@ def calc_detailed_quote(
         extended_price=extended_price,
         profit_amount=profit_amount,
     )
+
+
+@dataclass
+class UnifiedQuote:
+    """Summary and detailed breakdowns produced by one engine pass"""
+    summary: QuoteBreakdown
+    detailed: Optional[DetailedQuoteBreakdown] = None
+
+
+def calc_unified_quote(
+    *,
+    quantity: int,
+    stock_weight_lb: float,
+    cost_per_lb: float,
+    scrap_factor: float,
+    ops: List[Dict],
+    programming_time_hr: float = 0.0,
+    programming_rate_per_hr: float = 75.0,
+    first_article_inspection_hr: float = 0.0,
+    overhead_rate_pct: float = 1.5,
+    margin_pct: float = 0.15,
+    include_detailed: bool = True,
+) -> UnifiedQuote:
+    """
+    Calculate the summary (calc_unit_cost) and detailed (calc_detailed_quote)
+    breakdowns in a single pass over the operations.
+
+    The summary is accumulated from the same per-operation time components
+    the detailed engine computes, so both match their standalone engines
+    exactly. With include_detailed=False only the summary is computed.
+
+    Args:
+        Same as calc_detailed_quote, plus:
+        include_detailed: Also build the DetailedQuoteBreakdown
+
+    Returns:
+        UnifiedQuote with summary and (optionally) detailed breakdowns
+    """
+    if not include_detailed:
+        return UnifiedQuote(summary=calc_unit_cost(
+            quantity=quantity,
+            stock_weight_lb=stock_weight_lb,
+            cost_per_lb=cost_per_lb,
+            scrap_factor=scrap_factor,
+            ops=ops,
+            margin_pct=margin_pct,
+        ))
+
+    operations_breakdown = []
+    machine_unit = 0.0
+    labor_unit = 0.0
+    total_time_hr = 0.0
+
+    for op in ops:
+        op_breakdown = calc_operation_breakdown(
+            operation=op,
+            quantity=quantity,
+            machine_rate=op["machine_rate_per_hr"],
+            labor_rate=op["labor_rate_per_hr"]
+        )
+        operations_breakdown.append(op_breakdown)
+
+        # Summary engine time excludes tool change and inspection time
+        t_part = op_breakdown.setup_time_per_part + op_breakdown.cycle_time + op_breakdown.allowance_time
+        machine_unit += t_part * op["machine_rate_per_hr"]
+        labor_unit += t_part * op["labor_rate_per_hr"]
+        total_time_hr += t_part
+
+    material_unit = (stock_weight_lb * cost_per_lb) * (1.0 + scrap_factor)
+    unit_cost = material_unit + machine_unit + labor_unit
+
+    summary = QuoteBreakdown(
+        material_unit=material_unit,
+        machine_unit=machine_unit,
+        labor_unit=labor_unit,
+        unit_cost=unit_cost,
+        unit_price=unit_cost * (1.0 + margin_pct),
+        total_time_hr=total_time_hr,
+    )
+
+    detailed = _assemble_detailed_quote(
+        operations_breakdown,
+        quantity=quantity,
+        stock_weight_lb=stock_weight_lb,
+        cost_per_lb=cost_per_lb,
+        scrap_factor=scrap_factor,
+        programming_time_hr=programming_time_hr,
+        programming_rate_per_hr=programming_rate_per_hr,
+        first_article_inspection_hr=first_article_inspection_hr,
+        overhead_rate_pct=overhead_rate_pct,
+        margin_pct=margin_pct,
+    )
+
+    return UnifiedQuote(summary=summary, detailed=detailed)
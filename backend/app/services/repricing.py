@@ -0,0 +1,239 @@
+"""
+Parallel Repricing Across CPU Cores
+
+Runs the vectorized batch engine over many parts in a pool of worker
+processes. A BatchInputs is cut into contiguous part shards, one per
+worker, and each shard is shipped as its NumPy columns only: no ORM
+objects and no operation labels cross the process boundary, and only the
+result arrays come back. The shard results are written back into arrays
+for the whole batch, so callers get one BatchQuoteResult, identical to a
+single calc_detailed_quote_batch call over the same inputs.
+
+submit() returns while the workers are busy, so a caller can load the
+next batch meanwhile. Worker processes are started on first use and reused. Batches smaller
+than two shards of REPRICE_MIN_SHARD_PARTS are priced in the calling
+process, where starting and feeding the workers would cost more than the
+engine itself; REPRICE_WORKERS=0 turns the pool off altogether.
+
+repricing_pool, for offline runs (app.reprice), defaults to one worker per
+core. api_repricing_pool, for API requests, only has workers when
+REPRICE_WORKERS is set: every API worker process would otherwise start its
+own pool of cpu_count processes. The API shuts both down when it stops.
+"""
+
+import dataclasses
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .quoting_batch import BatchInputs, BatchQuoteResult, calc_detailed_quote_batch
+
+logger = logging.getLogger(__name__)
+
+_REPRICE_WORKERS_SETTING = os.getenv("REPRICE_WORKERS")
+REPRICE_WORKERS = int(_REPRICE_WORKERS_SETTING or os.cpu_count() or 1)
+REPRICE_MIN_SHARD_PARTS = int(os.getenv("REPRICE_MIN_SHARD_PARTS", "1000"))
+
+# Columns a worker needs; labels (op_name, op_sequence, op_type) stay behind
+PART_COLUMNS = [
+    "stock_weight_lb", "cost_per_lb", "scrap_factor", "programming_time_hr",
+    "programming_rate_per_hr", "first_article_inspection_hr", "overhead_rate_pct",
+]
+OPERATION_COLUMNS = [
+    "setup_time_hr", "cycle_time_hr", "allowance_pct", "tool_change_time_min", "inspection_time_min",
+    "tool_cost_per_part", "consumables_cost_per_part", "machine_rate_per_hr", "labor_rate_per_hr",
+]
+OPERATION_RESULTS = [
+    "op_setup_time_per_part", "op_total_time", "op_machine_cost", "op_labor_cost", "op_total_cost",
+]
+# Independent of quantity: shipped as (P,) and broadcast to (P, Q) as the engine does
+MATERIAL_RESULTS = ["material_base", "material_scrap", "material_total"]
+PART_RESULTS = [
+    f.name for f in dataclasses.fields(BatchQuoteResult)
+    if f.name not in ("inputs", "quantities", "margin_pct", *MATERIAL_RESULTS, *OPERATION_RESULTS)
+]
+
+
+def shard_bounds(n_parts: int, shards: int) -> List[Tuple[int, int]]:
+    """Split part rows [0, n_parts) into at most `shards` contiguous, near-equal ranges"""
+    shards = max(1, min(shards, n_parts))
+    edges = np.linspace(0, n_parts, shards + 1).astype(int)
+    return [(int(start), int(end)) for start, end in zip(edges[:-1], edges[1:])]
+
+
+def take_parts(inputs: BatchInputs, start: int, end: int) -> Tuple[BatchInputs, np.ndarray]:
+    """
+    Columns for part rows [start, end) and the operation rows they own.
+
+    Operations keep their relative order, so each part accumulates its
+    operations exactly as it would in the full batch.
+    """
+    op_rows = np.flatnonzero((inputs.op_part_index >= start) & (inputs.op_part_index < end))
+    shard = BatchInputs(
+        op_part_index=inputs.op_part_index[op_rows] - start,
+        **{name: getattr(inputs, name)[start:end] for name in PART_COLUMNS},
+        **{name: getattr(inputs, name)[op_rows] for name in OPERATION_COLUMNS},
+    )
+    return shard, op_rows
+
+
+def _price_shard(
+    shard: BatchInputs, quantities: np.ndarray, margin: np.ndarray, keep_operations: bool
+) -> Dict[str, Optional[np.ndarray]]:
+    """Worker side: price one shard and return its result arrays"""
+    result = calc_detailed_quote_batch(shard, quantities, margin, keep_operations=keep_operations)
+    arrays = {name: getattr(result, name) for name in PART_RESULTS}
+    arrays.update({name: np.ascontiguousarray(getattr(result, name)[:, 0]) for name in MATERIAL_RESULTS})
+    arrays.update({name: getattr(result, name) for name in OPERATION_RESULTS})
+    return arrays
+
+
+def merge_shards(
+    inputs: BatchInputs,
+    quantities: np.ndarray,
+    margin: np.ndarray,
+    shards: Sequence[Tuple[Tuple[int, int], np.ndarray, Dict[str, Optional[np.ndarray]]]],
+    keep_operations: bool,
+) -> BatchQuoteResult:
+    """Write shard results, ((start, end), op_rows, arrays), into one result for the whole batch"""
+    shape = (inputs.n_parts, len(quantities))
+    merged: Dict[str, Any] = {name: np.empty(shape) for name in PART_RESULTS}
+    material = {name: np.empty(inputs.n_parts) for name in MATERIAL_RESULTS}
+    for name in OPERATION_RESULTS:
+        merged[name] = np.empty((inputs.n_ops, len(quantities))) if keep_operations else None
+
+    for (start, end), op_rows, arrays in shards:
+        for name in PART_RESULTS:
+            merged[name][start:end] = arrays[name]
+        for name in MATERIAL_RESULTS:
+            material[name][start:end] = arrays[name]
+        if keep_operations:
+            for name in OPERATION_RESULTS:
+                merged[name][op_rows] = arrays[name]
+
+    merged.update({name: np.broadcast_to(values[:, None], shape) for name, values in material.items()})
+    return BatchQuoteResult(inputs=inputs, quantities=quantities, margin_pct=margin, **merged)
+
+
+class RepricingPool:
+    """Process pool that prices BatchInputs shard by shard"""
+
+    def __init__(self, workers: int = REPRICE_WORKERS, min_shard_parts: int = REPRICE_MIN_SHARD_PARTS):
+        self.workers = workers
+        self.min_shard_parts = max(1, min_shard_parts)
+        self._lock = threading.Lock()
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def shards_for(self, n_parts: int) -> int:
+        """Number of shards a batch of n_parts is split into (1: priced in process)"""
+        if self.workers < 1:
+            return 1
+        return max(1, min(self.workers, n_parts // self.min_shard_parts))
+
+    def _pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # spawn: the API process has threads (DB pools, job workers) that fork would copy mid-flight
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._executor
+
+    def submit(
+        self,
+        inputs: BatchInputs,
+        quantities: Sequence[int],
+        margin_pct: Union[float, Sequence[float]] = 0.15,
+        *,
+        keep_operations: bool = True,
+    ) -> "PendingBatch":
+        """
+        Start pricing a batch and return without waiting for it.
+
+        Small batches are priced right away in this process; larger ones are
+        sent to the workers shard by shard. PendingBatch.result() waits.
+        """
+        qty = np.asarray(quantities, dtype=np.int64).reshape(-1)
+        if qty.size and qty.min() < 1:
+            raise ValueError("Quantities must be at least 1")
+        margin = np.array(np.broadcast_to(np.asarray(margin_pct, dtype=np.float64), (inputs.n_parts,)))
+        pending = PendingBatch(self, inputs, qty, margin, keep_operations)
+
+        shards = self.shards_for(inputs.n_parts)
+        if shards == 1:
+            pending.done = calc_detailed_quote_batch(inputs, qty, margin, keep_operations=keep_operations)
+            return pending
+        try:
+            pool = self._pool()
+            for start, end in shard_bounds(inputs.n_parts, shards):
+                shard, op_rows = take_parts(inputs, start, end)
+                future = pool.submit(_price_shard, shard, qty, margin[start:end], keep_operations)
+                pending.shards.append(((start, end), op_rows, future))
+        except BrokenProcessPool:
+            pending.fall_back()
+        return pending
+
+    def calc(
+        self,
+        inputs: BatchInputs,
+        quantities: Sequence[int],
+        margin_pct: Union[float, Sequence[float]] = 0.15,
+        *,
+        keep_operations: bool = True,
+    ) -> BatchQuoteResult:
+        """
+        calc_detailed_quote_batch, sharded over the worker processes.
+
+        Takes the same arguments and returns the same result (same values,
+        bit for bit); small batches are priced in this process.
+        """
+        return self.submit(inputs, quantities, margin_pct, keep_operations=keep_operations).result()
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+class PendingBatch:
+    """A batch being priced by RepricingPool.submit()"""
+
+    def __init__(self, pool: RepricingPool, inputs: BatchInputs, quantities: np.ndarray, margin: np.ndarray, keep_operations: bool):
+        self.pool = pool
+        self.inputs = inputs
+        self.quantities = quantities
+        self.margin = margin
+        self.keep_operations = keep_operations
+        self.shards: List[Tuple[Tuple[int, int], np.ndarray, Future]] = []
+        self.done: Optional[BatchQuoteResult] = None
+
+    def fall_back(self) -> None:
+        """A worker died (e.g. killed for memory): price in process and start a fresh pool next time"""
+        logger.exception("Repricing worker pool broke; pricing %d parts in process", self.inputs.n_parts)
+        self.pool.shutdown()
+        self.done = calc_detailed_quote_batch(
+            self.inputs, self.quantities, self.margin, keep_operations=self.keep_operations
+        )
+
+    def result(self) -> BatchQuoteResult:
+        """Wait for every shard and merge them into one result"""
+        if self.done is None:
+            try:
+                pieces = [(bounds, op_rows, future.result()) for bounds, op_rows, future in self.shards]
+            except BrokenProcessPool:
+                self.fall_back()
+            else:
+                self.done = merge_shards(self.inputs, self.quantities, self.margin, pieces, self.keep_operations)
+        return self.done
+
+
+repricing_pool = RepricingPool()
+# Unset REPRICE_WORKERS: API requests are priced in process
+api_repricing_pool = RepricingPool(workers=REPRICE_WORKERS if _REPRICE_WORKERS_SETTING else 0)
@@ -0,0 +1,440 @@
+"""
+Synthetic large-scale data for load and scale testing
+
+Complements seed.py, which builds a small hand-written demo shop, with a
+parameterized generator for production-sized volumes: customers, materials,
+machines, parts with a realistic spread of routing lengths, and quotes with
+varying line counts. Values are drawn from a seeded NumPy generator, so the
+same arguments (including --end) always produce the same rows.
+
+Quote items are priced like quotes created through the API: the generated
+parts and rates are kept in memory as columns, and every line goes through
+the batch engine at its own quantity and margin, with the full breakdown
+(operations and part info) stored on the line: about 1.5 KB of JSON per
+line, and about 0.2 ms of CPU per line.
+
+Rows are written in chunks straight through the DBAPI connection, with
+COPY on PostgreSQL and executemany elsewhere. Ids are assigned by the
+generator (continuing after the highest existing id) so child rows can be
+written without reading anything back; PostgreSQL sequences are moved past
+them afterwards. Existing rows are left alone.
+
+Usage (from backend/):
+    python -m app.synthetic --parts 100000 --quotes 200000
+    python -m app.synthetic --parts 1000000 --quotes 1000000 --items-per-quote 5   # ~5M quote items
+    python -m app.synthetic --quotes 50000 --items-per-quote 20 --max-items-per-quote 200
+"""
+
+import argparse
+import io
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+from sqlalchemy.engine import Engine
+
+from .serialization import dumps
+from .services.quoting_batch import PART_FIELDS, BatchInputs, calc_detailed_quote_batch
+
+# Rows per generated chunk (parts or quotes); also fixes the draw order, so
+# changing it changes the data for a given seed
+CHUNK_SIZE = 50_000
+
+# Share of parts routed through 1, 2, ... 8 operations
+OP_COUNT_WEIGHTS = np.array([5, 15, 25, 22, 15, 9, 6, 3], dtype=np.float64)
+
+OPERATION_TYPES = ["roughing", "finishing", "machining", "deburr", "inspection"]
+OPERATION_TYPE_WEIGHTS = np.array([30, 30, 25, 10, 5], dtype=np.float64)
+
+MACHINE_TYPES = ["mill", "lathe", "5-axis", "edm", "grinder"]
+MACHINE_TYPE_WEIGHTS = np.array([45, 35, 10, 5, 5], dtype=np.float64)
+
+PART_FAMILIES = ["BRK", "SHF", "HSG", "PLT", "FLG", "BSH", "SPC", "MNF"]
+
+QUOTE_STATUSES = ["approved", "sent", "draft"]
+QUOTE_STATUS_WEIGHTS = np.array([60, 25, 15], dtype=np.float64)
+
+MARGINS = np.array([0.10, 0.15, 0.20, 0.25, 0.30])
+
+# Quote item columns and the batch engine results they hold, as create_quote stores them
+ITEM_RESULTS = {
+    "material_cost_unit": "material_total",
+    "machine_cost_unit": "machine_cost",
+    "labor_cost_unit": "labor_cost",
+    "tooling_cost_unit": "tooling_cost",
+    "programming_cost_unit": "programming_cost",
+    "inspection_cost_unit": "inspection_cost",
+    "consumables_cost_unit": "consumables_cost",
+    "overhead_cost_unit": "overhead_cost",
+    "unit_cost": "unit_cost",
+    "unit_price": "unit_price",
+    "setup_time_per_part": "setup_time_per_part",
+    "cycle_time_per_part": "cycle_time",
+    "allowance_time_per_part": "allowance_time",
+    "total_time_per_part": "total_time_per_part",
+}
+
+
+@dataclass
+class SyntheticConfig:
+    customers: int = 500
+    materials: int = 40
+    machines: int = 60
+    parts: int = 100_000
+    quotes: int = 200_000
+    items_per_quote: float = 5.0  # mean line count
+    max_items_per_quote: int = 40
+    days: int = 3 * 365  # created_at spread, ending at end
+    end: Optional[datetime] = None  # default: now
+    seed: int = 42
+
+
+@dataclass
+class SyntheticSummary:
+    """Id ranges and counts of the generated rows"""
+    customer_ids: range
+    material_ids: range
+    machine_ids: range
+    part_ids: range
+    quote_ids: range
+    operations: int
+    quote_items: int
+    created_from: datetime
+    created_to: datetime
+    elapsed_s: float
+
+
+class _BulkWriter:
+    """Chunked column-wise inserts over a raw DBAPI connection"""
+
+    def __init__(self, engine: Engine):
+        self.dialect = engine.dialect.name
+        self.connection = engine.raw_connection()
+        self.cursor = self.connection.cursor()
+
+    def max_id(self, table: str) -> int:
+        self.cursor.execute(f"SELECT MAX(id) FROM {table}")
+        return self.cursor.fetchone()[0] or 0
+
+    def insert(self, table: str, columns: Dict[str, Sequence]) -> None:
+        names = list(columns)
+        if self.dialect == "postgresql":
+            # COPY's text format treats backslashes as escapes (JSON strings contain them)
+            text_columns = [
+                col.astype(str) if isinstance(col, np.ndarray) else [value.replace("\\", "\\\\") for value in col]
+                for col in columns.values()
+            ]
+            buffer = io.StringIO()
+            buffer.writelines("\t".join(row) + "\n" for row in zip(*text_columns))
+            buffer.seek(0)
+            self.cursor.copy_expert(f"COPY {table} ({', '.join(names)}) FROM STDIN", buffer)
+        else:
+            value_columns = [col.tolist() if isinstance(col, np.ndarray) else col for col in columns.values()]
+            placeholders = ", ".join("?" for _ in names)
+            self.cursor.executemany(
+                f"INSERT INTO {table} ({', '.join(names)}) VALUES ({placeholders})",
+                zip(*value_columns),
+            )
+
+    def finish(self, tables: List[str]) -> None:
+        if self.dialect == "postgresql":
+            for table in tables:
+                self.cursor.execute(
+                    f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), (SELECT MAX(id) FROM {table}))"
+                )
+        # Fresh planner statistics for the new volume
+        self.cursor.execute("ANALYZE")
+        self.connection.commit()
+        self.connection.close()
+
+
+def _timestamps(rng: np.random.Generator, count: int, start: datetime, end: datetime, dialect: str) -> List[str]:
+    """count sorted timestamps in [start, end), formatted for the dialect"""
+    span_us = int((end - start).total_seconds() * 1_000_000)
+    offsets = np.sort(rng.integers(0, span_us, size=count))
+    stamps = np.datetime64(start.replace(tzinfo=None), "us") + offsets.astype("timedelta64[us]")
+    text = np.char.replace(np.datetime_as_string(stamps, unit="us"), "T", " ")
+    # SQLAlchemy stores SQLite datetimes as naive UTC strings
+    return (np.char.add(text, "+00") if dialect == "postgresql" else text).tolist()
+
+
+def _skewed_choice(rng: np.random.Generator, ids: range, size: int, exponent: float = 1.1) -> np.ndarray:
+    """Ids drawn with Zipf-like popularity: the first ids are the most common"""
+    weights = 1.0 / np.arange(1, len(ids) + 1) ** exponent
+    return ids.start + rng.choice(len(ids), size=size, p=weights / weights.sum())
+
+
+def _choice(rng: np.random.Generator, values: Sequence[str], weights: np.ndarray, size: int) -> np.ndarray:
+    return np.asarray(values)[rng.choice(len(values), size=size, p=weights / weights.sum())]
+
+
+class _PartCatalog:
+    """The generated parts and operations as columns, kept to price quote items"""
+
+    def __init__(self, parts: Dict[str, np.ndarray], operations: Dict[str, np.ndarray], material_names: np.ndarray):
+        self.part_number = parts.pop("part_number")
+        self.material_name = material_names
+        self.material_index = parts.pop("material_index")
+        self.op_count = parts.pop("op_count")
+        self.op_start = np.cumsum(self.op_count) - self.op_count
+        self.op_position = operations.pop("position")
+        self.op_type = operations.pop("operation_type")
+        self.parts = parts
+        self.operations = operations
+
+    def take(self, rows: np.ndarray) -> BatchInputs:
+        """BatchInputs with one part row per entry of rows (repeats allowed), with labels"""
+        counts = self.op_count[rows]
+        first = np.cumsum(counts) - counts
+        op_rows = np.repeat(self.op_start[rows] - first, counts) + np.arange(int(counts.sum()))
+        positions = self.op_position[op_rows]
+        op_types = self.op_type[op_rows].tolist()
+        return BatchInputs(
+            op_part_index=np.repeat(np.arange(len(rows)), counts),
+            op_name=[f"Op {10 * (position + 1)} - {op_type.title()}" for position, op_type in zip(positions.tolist(), op_types)],
+            op_sequence=(10 * (positions + 1)).tolist(),
+            op_type=op_types,
+            **{name: column[rows] for name, column in self.parts.items()},
+            **{name: column[op_rows] for name, column in self.operations.items()},
+        )
+
+    def price_items(self, rows: np.ndarray, quantity: np.ndarray, margin: np.ndarray) -> Dict[str, Sequence]:
+        """
+        Quote item columns for lines of parts `rows` at their quantity and
+        margin: one batch engine call per distinct quantity.
+        """
+        columns: Dict[str, Sequence] = {name: np.empty(len(rows)) for name in ITEM_RESULTS}
+        breakdowns: List[str] = [""] * len(rows)
+        order = np.argsort(quantity, kind="stable")
+        for lines in np.split(order, np.flatnonzero(np.diff(quantity[order])) + 1):
+            part_rows = rows[lines]
+            result = calc_detailed_quote_batch(self.take(part_rows), quantity[lines[:1]], margin[lines])
+            for name, attribute in ITEM_RESULTS.items():
+                columns[name][lines] = getattr(result, attribute)[:, 0]
+            for i, (line, row) in enumerate(zip(lines.tolist(), part_rows.tolist())):
+                breakdown = result.breakdown(i, 0).to_dict()
+                breakdown["part_info"] = {
+                    "part_number": str(self.part_number[row]),
+                    "description": None,
+                    "material_name": str(self.material_name[self.material_index[row]]),
+                }
+                breakdowns[line] = dumps(breakdown).decode()
+        columns["breakdown"] = breakdowns
+        columns["pricing_engine"] = ["detailed"] * len(rows)
+        return columns
+
+
+def generate(engine: Engine, config: SyntheticConfig) -> SyntheticSummary:
+    """Write a synthetic data set into the (already migrated) database behind engine"""
+    started = time.perf_counter()
+    rng = np.random.default_rng(config.seed)
+    writer = _BulkWriter(engine)
+    dialect = writer.dialect
+
+    created_to = config.end or datetime.now(timezone.utc).replace(microsecond=0)
+    created_from = created_to - timedelta(days=config.days)
+
+    def id_range(table: str, count: int) -> range:
+        first = writer.max_id(table) + 1
+        return range(first, first + count)
+
+    # ==================== REFERENCE DATA ====================
+    customer_ids = id_range("customers", config.customers)
+    writer.insert("customers", {
+        "id": np.arange(customer_ids.start, customer_ids.stop),
+        "name": [f"Synthetic Customer {i:05d}" for i in customer_ids],
+        "email": [f"buyer{i}@customer{i}.example" for i in customer_ids],
+        "created_at": _timestamps(rng, config.customers, created_from, created_to, dialect),
+    })
+
+    material_ids = id_range("materials", config.materials)
+    material_names = np.array([f"Synthetic Alloy {i:03d}" for i in material_ids])
+    material_costs = np.round(rng.lognormal(np.log(4.0), 0.8, config.materials), 2)
+    writer.insert("materials", {
+        "id": np.arange(material_ids.start, material_ids.stop),
+        "name": material_names.tolist(),
+        "cost_per_lb": material_costs,
+        "density_lb_in3": np.round(rng.uniform(0.05, 0.32, config.materials), 3),
+    })
+
+    machine_ids = id_range("machines", config.machines)
+    machine_rates = np.round(rng.uniform(55.0, 225.0, config.machines), 2)
+    machine_types = _choice(rng, MACHINE_TYPES, MACHINE_TYPE_WEIGHTS, config.machines)
+    labor_rates = np.round(rng.uniform(28.0, 55.0, config.machines), 2)
+    writer.insert("machines", {
+        "id": np.arange(machine_ids.start, machine_ids.stop),
+        "name": [f"Synthetic Machine {i:03d}" for i in machine_ids],
+        "machine_type": machine_types,
+        "machine_rate_per_hr": machine_rates,
+        "labor_rate_per_hr": labor_rates,
+    })
+
+    # ==================== PARTS & OPERATIONS ====================
+    part_ids = id_range("parts", config.parts)
+    next_operation_id = writer.max_id("operations") + 1
+    operation_count = 0
+    part_chunks: List[Dict[str, np.ndarray]] = []
+    operation_chunks: List[Dict[str, np.ndarray]] = []
+    for chunk_start in range(part_ids.start, part_ids.stop, CHUNK_SIZE):
+        ids = np.arange(chunk_start, min(chunk_start + CHUNK_SIZE, part_ids.stop))
+        n = len(ids)
+        families = np.asarray(PART_FAMILIES)[rng.integers(0, len(PART_FAMILIES), n)]
+        parts = {
+            "id": ids,
+            "part_number": np.array([f"{family}-{part_id:08d}" for family, part_id in zip(families, ids)]),
+            "material_id": _skewed_choice(rng, material_ids, n),
+            "stock_weight_lb": np.round(rng.lognormal(np.log(3.0), 1.0, n), 2),
+            "scrap_factor": np.round(rng.uniform(0.02, 0.15, n), 3),
+            "programming_time_hr": np.round(rng.gamma(2.0, 1.0, n), 2),
+            "programming_rate_per_hr": np.full(n, 75.0),
+            "first_article_inspection_hr": np.round(rng.uniform(0.0, 2.0, n), 2),
+            "overhead_rate_pct": np.round(rng.uniform(1.3, 1.8, n), 2),
+        }
+        writer.insert("parts", {**parts, "created_at": _timestamps(rng, n, created_from, created_to, dialect)})
+
+        op_counts = rng.choice(len(OP_COUNT_WEIGHTS), size=n, p=OP_COUNT_WEIGHTS / OP_COUNT_WEIGHTS.sum()) + 1
+        m = int(op_counts.sum())
+        op_part_ids = np.repeat(ids, op_counts)
+        # Position of each operation within its part: 0, 1, ... op_count - 1
+        positions = np.arange(m) - np.repeat(np.cumsum(op_counts) - op_counts, op_counts)
+        op_types = _choice(rng, OPERATION_TYPES, OPERATION_TYPE_WEIGHTS, m)
+        machine_index = rng.integers(0, config.machines, m)
+        operations = {
+            "setup_time_hr": np.round(rng.uniform(0.25, 3.0, m), 2),
+            "cycle_time_hr": np.round(rng.lognormal(np.log(0.15), 0.7, m), 3),
+            "allowance_pct": np.round(rng.uniform(0.05, 0.20, m), 2),
+            "tool_cost_per_part": np.round(rng.exponential(0.8, m), 2),
+            "tool_change_time_min": np.round(rng.uniform(0.0, 5.0, m), 1),
+            "inspection_time_min": np.round(rng.uniform(0.0, 4.0, m), 1),
+            "consumables_cost_per_part": np.round(rng.exponential(0.3, m), 2),
+        }
+        writer.insert("operations", {
+            "id": np.arange(next_operation_id, next_operation_id + m),
+            "part_id": op_part_ids,
+            "machine_id": machine_ids.start + machine_index,
+            "name": [f"Op {10 * (position + 1)} - {op_type.title()}" for position, op_type in zip(positions, op_types)],
+            "sequence": 10 * (positions + 1),
+            "operation_type": op_types,
+            **operations,
+        })
+        next_operation_id += m
+        operation_count += m
+
+        # Engine inputs for pricing the quote items, with the rates applied
+        part_chunks.append({
+            "part_number": parts["part_number"],
+            "material_index": parts["material_id"] - material_ids.start,
+            "op_count": op_counts,
+            "cost_per_lb": material_costs[parts["material_id"] - material_ids.start],
+            **{name: parts[name] for name in PART_FIELDS if name != "cost_per_lb"},
+        })
+        operation_chunks.append({
+            "position": positions,
+            "operation_type": op_types,
+            "machine_rate_per_hr": machine_rates[machine_index],
+            "labor_rate_per_hr": labor_rates[machine_index],
+            **operations,
+        })
+
+    catalog = _PartCatalog(
+        {name: np.concatenate([chunk[name] for chunk in part_chunks]) for name in part_chunks[0]},
+        {name: np.concatenate([chunk[name] for chunk in operation_chunks]) for name in operation_chunks[0]},
+        material_names,
+    ) if part_chunks else None
+    del part_chunks, operation_chunks
+
+    # ==================== QUOTES & ITEMS ====================
+    quote_ids = id_range("quotes", config.quotes)
+    next_item_id = writer.max_id("quote_items") + 1
+    item_count = 0
+    for chunk_start in range(quote_ids.start, quote_ids.stop, CHUNK_SIZE):
+        ids = np.arange(chunk_start, min(chunk_start + CHUNK_SIZE, quote_ids.stop))
+        n = len(ids)
+        writer.insert("quotes", {
+            "id": ids,
+            "customer_id": _skewed_choice(rng, customer_ids, n, exponent=0.8),
+            "quote_number": [f"SQ-{quote_id:08d}" for quote_id in ids],
+            "status": _choice(rng, QUOTE_STATUSES, QUOTE_STATUS_WEIGHTS, n),
+            "created_at": _timestamps(rng, n, created_from, created_to, dialect),
+        })
+
+        # Geometric line counts: most quotes are short, with a long tail
+        item_counts = np.minimum(
+            rng.geometric(1.0 / config.items_per_quote, n), config.max_items_per_quote
+        )
+        m = int(item_counts.sum())
+        quantity = np.maximum(np.round(rng.lognormal(np.log(25), 1.2, m)), 1).astype(np.int64)
+        margin = MARGINS[rng.integers(0, len(MARGINS), m)]
+        item_part_ids = _skewed_choice(rng, part_ids, m, exponent=0.6)
+
+        writer.insert("quote_items", {
+            "id": np.arange(next_item_id, next_item_id + m),
+            "quote_id": np.repeat(ids, item_counts),
+            "part_id": item_part_ids,
+            "quantity": quantity,
+            "margin_pct": margin,
+            **catalog.price_items(item_part_ids - part_ids.start, quantity, margin),
+        })
+        next_item_id += m
+        item_count += m
+
+    writer.finish(["customers", "materials", "machines", "parts", "operations", "quotes", "quote_items"])
+
+    return SyntheticSummary(
+        customer_ids=customer_ids,
+        material_ids=material_ids,
+        machine_ids=machine_ids,
+        part_ids=part_ids,
+        quote_ids=quote_ids,
+        operations=operation_count,
+        quote_items=item_count,
+        created_from=created_from,
+        created_to=created_to,
+        elapsed_s=time.perf_counter() - started,
+    )
+
+
+def main() -> None:
+    defaults = SyntheticConfig()
+    parser = argparse.ArgumentParser(description="Generate synthetic customers, parts and quotes")
+    parser.add_argument("--customers", type=int, default=defaults.customers)
+    parser.add_argument("--materials", type=int, default=defaults.materials)
+    parser.add_argument("--machines", type=int, default=defaults.machines)
+    parser.add_argument("--parts", type=int, default=defaults.parts)
+    parser.add_argument("--quotes", type=int, default=defaults.quotes)
+    parser.add_argument("--items-per-quote", type=float, default=defaults.items_per_quote, help="mean line count")
+    parser.add_argument("--max-items-per-quote", type=int, default=defaults.max_items_per_quote)
+    parser.add_argument("--days", type=int, default=defaults.days, help="created_at spread")
+    parser.add_argument("--end", type=datetime.fromisoformat, help="latest created_at (default: now, UTC)")
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    args = parser.parse_args()
+
+    from .db import engine
+    from .migrate import upgrade_database
+
+    upgrade_database()
+    summary = generate(engine, SyntheticConfig(
+        customers=args.customers,
+        materials=args.materials,
+        machines=args.machines,
+        parts=args.parts,
+        quotes=args.quotes,
+        items_per_quote=args.items_per_quote,
+        max_items_per_quote=args.max_items_per_quote,
+        days=args.days,
+        end=args.end.replace(tzinfo=args.end.tzinfo or timezone.utc) if args.end else None,
+        seed=args.seed,
+    ))
+
+    print(f"✓ Synthetic data generated in {summary.elapsed_s:.1f}s")
+    print(f"  - {len(summary.customer_ids)} customers")
+    print(f"  - {len(summary.material_ids)} materials")
+    print(f"  - {len(summary.machine_ids)} machines")
+    print(f"  - {len(summary.part_ids)} parts with {summary.operations} operations")
+    print(f"  - {len(summary.quote_ids)} quotes with {summary.quote_items} items")
+
+
+if __name__ == "__main__":
+    main()
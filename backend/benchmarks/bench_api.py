@@ -0,0 +1,299 @@
+"""
+API benchmark: latency percentiles, throughput and SQL counts per endpoint
+
+Boots the app in-process (httpx ASGI transport, no network), loads a
+synthetic data set at the requested scale (app.synthetic) and drives each
+endpoint scenario in turn at a fixed concurrency for a fixed duration.
+Each scenario first runs a few requests one at a time to count the SQL
+statements a request issues, then the timed load.
+
+Results are written as JSON so runs can be diffed between commits;
+--compare exits non-zero when a scenario's p95 latency regressed by more
+than --threshold or it issues more queries than the baseline.
+
+Usage (from backend/):
+    python -m benchmarks.bench_api --output bench.json
+    python -m benchmarks.bench_api --parts 50000 --quotes 50000 --concurrency 32 --duration 10
+    python -m benchmarks.bench_api --scenarios get_quote list_quotes --compare bench.json
+    DATABASE_URL=postgresql+psycopg2://... python -m benchmarks.bench_api --reuse-data
+
+Defaults to a throwaway SQLite database. The calculation cache stays on
+unless --no-cache is given; DB_MODE=async benchmarks the async routers.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+
+if "DATABASE_URL" not in os.environ:
+    _db_path = os.path.join(tempfile.mkdtemp(prefix="cncq-bench-"), "bench.db")
+    os.environ["DATABASE_URL"] = f"sqlite:///{_db_path}"
+if "--no-cache" in sys.argv:
+    os.environ["QUOTE_CACHE_MAX_ENTRIES"] = "0"
+
+import httpx
+from sqlalchemy import event, text
+
+from app.db import DB_MODE, async_engine, engine
+from app.main import app
+from app.migrate import upgrade_database
+from app.synthetic import SyntheticConfig, generate
+
+Request = Tuple[str, str, Optional[dict]]  # method, path, JSON body
+
+
+@dataclass
+class Ids:
+    customers: List[int]
+    materials: List[int]
+    parts: List[int]
+    quotes: List[int]
+
+
+def load_ids() -> Ids:
+    with engine.connect() as conn:
+        def ids(table: str) -> List[int]:
+            return [row[0] for row in conn.execute(text(f"SELECT id FROM {table} ORDER BY id"))]
+        return Ids(ids("customers"), ids("materials"), ids("parts"), ids("quotes"))
+
+
+def scenarios(ids: Ids) -> Dict[str, Callable[[random.Random], Request]]:
+    """Named request factories, one per endpoint exercised"""
+    return {
+        "list_parts": lambda r: ("GET", "/api/parts?limit=50", None),
+        "list_parts_by_material": lambda r: ("GET", f"/api/parts?limit=50&material_id={r.choice(ids.materials)}", None),
+        "get_part": lambda r: ("GET", f"/api/parts/{r.choice(ids.parts)}", None),
+        "list_customers": lambda r: ("GET", "/api/customers?limit=100", None),
+        "list_materials": lambda r: ("GET", "/api/materials", None),
+        "list_machines": lambda r: ("GET", "/api/machines", None),
+        "list_quotes": lambda r: ("GET", "/api/quotes?limit=50", None),
+        "list_quotes_by_customer": lambda r: ("GET", f"/api/quotes?limit=50&customer_id={r.choice(ids.customers)}", None),
+        "get_quote": lambda r: ("GET", f"/api/quotes/{r.choice(ids.quotes)}", None),
+        "get_quote_full": lambda r: ("GET", f"/api/quotes/{r.choice(ids.quotes)}?detail=full", None),
+        "calculate": lambda r: (
+            "POST", "/api/quotes/calculate", {"part_id": r.choice(ids.parts), "quantity": r.randint(1, 500)},
+        ),
+        "calculate_detailed": lambda r: (
+            "POST", "/api/quotes/calculate-detailed", {"part_id": r.choice(ids.parts), "quantity": r.randint(1, 500)},
+        ),
+        "calculate_full": lambda r: (
+            "POST", "/api/quotes/calculate-full", {"part_id": r.choice(ids.parts), "quantity": r.randint(1, 500)},
+        ),
+        "price_curve": lambda r: ("POST", "/api/quotes/price-curve", {"part_id": r.choice(ids.parts)}),
+        "calculate_batch_20": lambda r: ("POST", "/api/quotes/calculate-batch", {
+            "items": [{"part_id": r.choice(ids.parts), "quantities": [1, 10, 100]} for _ in range(20)],
+        }),
+        "create_quote_5_lines": lambda r: ("POST", "/api/quotes", {
+            "customer_id": r.choice(ids.customers),
+            "items": [{"part_id": r.choice(ids.parts), "quantity": r.randint(1, 500)} for _ in range(5)],
+        }),
+    }
+
+
+class StatementCounter:
+    """Counts SQL statements issued by the engine (serial requests only)"""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+
+
+def percentile(sorted_values: List[float], p: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(int(len(sorted_values) * p), len(sorted_values) - 1)]
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    make_request: Callable[[random.Random], Request],
+    *,
+    concurrency: int,
+    duration: float,
+    warmup: float,
+    seed: int,
+    counter: StatementCounter,
+    calibration_requests: int = 5,
+) -> dict:
+    rng = random.Random(seed)
+
+    # Queries per request, measured serially so nothing else is running
+    query_counts = []
+    for _ in range(calibration_requests):
+        method, path, body = make_request(rng)
+        before = counter.count
+        response = await client.request(method, path, json=body)
+        response.raise_for_status()
+        query_counts.append(counter.count - before)
+
+    async def load(seconds: float) -> Tuple[List[float], int, float]:
+        latencies: List[float] = []
+        errors = 0
+        deadline = time.perf_counter() + seconds
+
+        async def worker():
+            nonlocal errors
+            while time.perf_counter() < deadline:
+                method, path, body = make_request(rng)
+                start = time.perf_counter()
+                response = await client.request(method, path, json=body)
+                latencies.append(time.perf_counter() - start)
+                errors += response.status_code >= 400
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return latencies, errors, time.perf_counter() - started
+
+    if warmup > 0:
+        await load(warmup)
+    latencies, errors, elapsed = await load(duration)
+    latencies.sort()
+    ms = [latency * 1000 for latency in latencies]
+
+    return {
+        "requests": len(ms),
+        "errors": errors,
+        "throughput_rps": round(len(ms) / elapsed, 1),
+        "mean_ms": round(sum(ms) / len(ms), 2) if ms else 0.0,
+        "p50_ms": round(percentile(ms, 0.50), 2),
+        "p95_ms": round(percentile(ms, 0.95), 2),
+        "p99_ms": round(percentile(ms, 0.99), 2),
+        "max_ms": round(ms[-1], 2) if ms else 0.0,
+        # Most common count: the first request may also warm the rate catalog
+        "queries_per_request": max(set(query_counts), key=query_counts.count),
+    }
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> List[str]:
+    """Regressions of results against baseline, as printable lines"""
+    regressions = []
+    for name, current in results["scenarios"].items():
+        previous = baseline.get("scenarios", {}).get(name)
+        if previous is None:
+            continue
+        if current["queries_per_request"] > previous["queries_per_request"]:
+            regressions.append(
+                f"{name}: queries per request {previous['queries_per_request']} -> {current['queries_per_request']}"
+            )
+        if previous["p95_ms"] > 0 and current["p95_ms"] > previous["p95_ms"] * (1 + threshold):
+            regressions.append(f"{name}: p95 {previous['p95_ms']}ms -> {current['p95_ms']}ms")
+    return regressions
+
+
+async def run_all(args, ids: Ids) -> Dict[str, dict]:
+    available = scenarios(ids)
+    selected = args.scenarios or list(available)
+    unknown = set(selected) - set(available)
+    if unknown:
+        raise SystemExit(f"Unknown scenario(s): {', '.join(sorted(unknown))}")
+
+    # In async mode requests run on the async engine's underlying sync engine
+    counted = async_engine.sync_engine if async_engine is not None else engine
+    counter = StatementCounter()
+    event.listen(counted, "before_cursor_execute", counter)
+    transport = httpx.ASGITransport(app=app)
+    results = {}
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120) as client:
+            for name in selected:
+                results[name] = await run_scenario(
+                    client,
+                    available[name],
+                    concurrency=args.concurrency,
+                    duration=args.duration,
+                    warmup=args.warmup,
+                    seed=args.seed,
+                    counter=counter,
+                )
+                r = results[name]
+                print(
+                    f"{name:<26} {r['requests']:>7} {r['errors']:>6} {r['throughput_rps']:>8.1f} "
+                    f"{r['p50_ms']:>8.2f} {r['p95_ms']:>8.2f} {r['p99_ms']:>8.2f} {r['queries_per_request']:>8}"
+                )
+    finally:
+        event.remove(counted, "before_cursor_execute", counter)
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--parts", type=int, default=5000)
+    parser.add_argument("--quotes", type=int, default=5000)
+    parser.add_argument("--reuse-data", action="store_true", help="benchmark the existing rows, generate nothing")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=5.0, help="timed seconds per scenario")
+    parser.add_argument("--warmup", type=float, default=1.0, help="untimed seconds per scenario")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--scenarios", nargs="+", help="run only these scenarios")
+    parser.add_argument("--no-cache", action="store_true", help="disable the calculation cache")
+    parser.add_argument("--output", help="write results to this JSON file")
+    parser.add_argument("--compare", help="baseline JSON file to check for regressions")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed p95 regression (fraction)")
+    args = parser.parse_args()
+
+    upgrade_database()
+    if not args.reuse_data:
+        print(f"Generating {args.parts} parts and {args.quotes} quotes...")
+        generate(engine, SyntheticConfig(parts=args.parts, quotes=args.quotes, seed=args.seed))
+    ids = load_ids()
+
+    print(f"{'scenario':<26} {'reqs':>7} {'errors':>6} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'queries':>8}")
+    scenario_results = asyncio.run(run_all(args, ids))
+
+    results = {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "dialect": engine.dialect.name,
+            "db_mode": DB_MODE,
+            "cache": not args.no_cache,
+            "rows": {"parts": len(ids.parts), "quotes": len(ids.quotes), "customers": len(ids.customers)},
+            "concurrency": args.concurrency,
+            "duration_s": args.duration,
+            "seed": args.seed,
+        },
+        "scenarios": scenario_results,
+    }
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"Results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        if regressions:
+            print("FAIL: regressions against " + args.compare, file=sys.stderr)
+            for line in regressions:
+                print("  " + line, file=sys.stderr)
+            return 1
+        print(f"OK: no regressions against {args.compare}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,84 @@
+"""
+Regression benchmark: create_quote query count vs. line count
+
+Creates quotes with an increasing number of line items and records how
+many SQL statements each POST /api/quotes issues. The count must not grow
+with the number of lines; the script exits non-zero if it does.
+
+Usage (from backend/):
+    python -m benchmarks.bench_create_quote
+    DATABASE_URL=postgresql+psycopg2://... python -m benchmarks.bench_create_quote
+
+Defaults to a throwaway SQLite database.
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+if "DATABASE_URL" not in os.environ:
+    _db_path = os.path.join(tempfile.mkdtemp(prefix="cncq-bench-"), "bench.db")
+    os.environ["DATABASE_URL"] = f"sqlite:///{_db_path}"
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app.db import engine, SessionLocal
+from app.main import app
+from app.migrate import upgrade_database
+from app import models
+from app.seed import seed_database
+
+LINE_COUNTS = [1, 10, 50, 200]
+
+
+def main() -> int:
+    upgrade_database()
+    db = SessionLocal()
+    try:
+        seed_database(db)
+        part_ids = [part_id for (part_id,) in db.query(models.Part.id).order_by(models.Part.id)]
+        customer_id = db.query(models.Customer.id).first()[0]
+    finally:
+        db.close()
+
+    statements = []
+
+    def count_statement(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", count_statement)
+    client = TestClient(app)
+
+    # Warm the rate catalog so every measured request does the same work
+    client.post("/api/quotes/calculate", json={"part_id": part_ids[0], "quantity": 1})
+
+    results = []
+    for lines in LINE_COUNTS:
+        items = [
+            {"part_id": part_ids[i % len(part_ids)], "quantity": 10 + i, "margin_pct": 0.15}
+            for i in range(lines)
+        ]
+        statements.clear()
+        start = time.perf_counter()
+        response = client.post("/api/quotes", json={"customer_id": customer_id, "items": items})
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        response.raise_for_status()
+        assert len(response.json()["items"]) == lines
+        results.append((lines, len(statements), elapsed_ms))
+
+    print(f"{'lines':>6} {'queries':>8} {'ms':>9}")
+    for lines, queries, elapsed_ms in results:
+        print(f"{lines:>6} {queries:>8} {elapsed_ms:>9.1f}")
+
+    query_counts = {queries for _, queries, _ in results}
+    if len(query_counts) != 1:
+        print("FAIL: query count depends on line count", file=sys.stderr)
+        return 1
+    print("OK: query count is independent of line count")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
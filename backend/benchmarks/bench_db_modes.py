@@ -0,0 +1,169 @@
+"""
+Load benchmark: sync (psycopg2 + threadpool) vs async (asyncpg) database mode
+
+Starts the API under uvicorn once per DB_MODE and drives the same request
+mix at each concurrency level, after an unmeasured warm-up that opens the
+pool's connections: quote detail, detailed calculation and a page of
+parts. The calculation cache is disabled so every request goes to
+the database. Prints throughput and latency percentiles side by side.
+
+Usage (from backend/):
+    python -m benchmarks.bench_db_modes
+    python -m benchmarks.bench_db_modes --concurrency 50 200 400 --duration 20
+    DATABASE_URL=postgresql+psycopg2://... python -m benchmarks.bench_db_modes
+
+Defaults to a throwaway SQLite database (async mode then needs aiosqlite);
+point DATABASE_URL at PostgreSQL for numbers that mean anything.
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+if "DATABASE_URL" not in os.environ:
+    _db_path = os.path.join(tempfile.mkdtemp(prefix="cncq-bench-"), "bench.db")
+    os.environ["DATABASE_URL"] = f"sqlite:///{_db_path}"
+
+import httpx
+
+from app.db import SessionLocal
+from app import models
+from app.migrate import upgrade_database
+from app.seed import seed_database
+
+MODES = ("sync", "async")
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(mode: str, port: int, pool_size: int, max_overflow: int) -> subprocess.Popen:
+    env = dict(
+        os.environ,
+        DB_MODE=mode,
+        DB_POOL_SIZE=str(pool_size),
+        DB_MAX_OVERFLOW=str(max_overflow),
+        QUOTE_CACHE_MAX_ENTRIES="0",
+    )
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        env=env,
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline and server.poll() is None:
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/health").status_code == 200:
+                return server
+        except httpx.TransportError:
+            time.sleep(0.2)
+    server.terminate()
+    raise RuntimeError(f"{mode} server did not start")
+
+
+def request_mix(part_ids: List[int], quote_ids: List[int]):
+    """Endless cycle of (method, path, body) tuples"""
+    i = 0
+    while True:
+        yield "GET", f"/api/quotes/{quote_ids[i % len(quote_ids)]}?detail=full", None
+        yield "POST", "/api/quotes/calculate-detailed", {"part_id": part_ids[i % len(part_ids)], "quantity": 10 + i % 90}
+        yield "GET", "/api/parts?limit=20", None
+        i += 1
+
+
+async def run_load(base_url: str, concurrency: int, duration: float, part_ids, quote_ids) -> Dict:
+    latencies: List[float] = []
+    errors = 0
+    mix = request_mix(part_ids, quote_ids)
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        deadline = time.perf_counter() + duration
+
+        async def worker():
+            nonlocal errors
+            while time.perf_counter() < deadline:
+                method, path, body = next(mix)
+                start = time.perf_counter()
+                try:
+                    response = await client.request(method, path, json=body)
+                    ok = response.status_code == 200
+                except httpx.HTTPError:
+                    ok = False
+                latencies.append(time.perf_counter() - start)
+                errors += not ok
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+
+    def percentile(p: float) -> float:
+        return latencies[min(int(len(latencies) * p), len(latencies) - 1)] * 1000 if latencies else 0.0
+
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": len(latencies) / elapsed,
+        "p50": percentile(0.50),
+        "p95": percentile(0.95),
+        "p99": percentile(0.99),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[10, 100, 300])
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per level")
+    parser.add_argument("--warmup", type=float, default=3.0, help="unmeasured seconds per level (fills the pool)")
+    parser.add_argument("--pool-size", type=int, default=20)
+    parser.add_argument("--max-overflow", type=int, default=10)
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    args = parser.parse_args()
+
+    upgrade_database()
+    db = SessionLocal()
+    try:
+        seed_database(db)
+        part_ids = [part_id for (part_id,) in db.query(models.Part.id).order_by(models.Part.id)]
+        quote_ids = [quote_id for (quote_id,) in db.query(models.Quote.id).order_by(models.Quote.id)]
+    finally:
+        db.close()
+
+    results = {}
+    for mode in args.modes:
+        port = free_port()
+        server = start_server(mode, port, args.pool_size, args.max_overflow)
+        try:
+            base_url = f"http://127.0.0.1:{port}"
+            for concurrency in args.concurrency:
+                asyncio.run(run_load(base_url, concurrency, args.warmup, part_ids, quote_ids))
+                results[(mode, concurrency)] = asyncio.run(
+                    run_load(base_url, concurrency, args.duration, part_ids, quote_ids)
+                )
+        finally:
+            server.terminate()
+            server.wait()
+
+    print(f"{'mode':>6} {'conc':>5} {'requests':>9} {'errors':>7} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for concurrency in args.concurrency:
+        for mode in args.modes:
+            r = results[(mode, concurrency)]
+            print(
+                f"{mode:>6} {concurrency:>5} {r['requests']:>9} {r['errors']:>7} {r['rps']:>8.1f} "
+                f"{r['p50']:>8.1f} {r['p95']:>8.1f} {r['p99']:>8.1f}"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,313 @@
+"""
+Microbenchmark: quoting engines per call, by operation count
+
+Builds synthetic parts with 1 to 200 operations and, for each engine,
+measures the time per call, the memory it allocates (tracemalloc peak
+during the call and what the result keeps alive) and the cost of
+serializing the result with to_dict(). No database or app is involved.
+
+Engines:
+    unit_cost     services.quoting.calc_unit_cost
+    detailed      services.quoting_enhanced.calc_detailed_quote
+    unified       services.quoting_enhanced.calc_unified_quote
+    batch         services.quoting_batch.calc_detailed_quote_batch, one part
+    price_curve   services.price_curve.PartCostModel + price_curve, one quantity
+The batch engine is also timed the way repricing uses it: every part at
+several quantities in one call, reported per (part, quantity) pair.
+
+Before timing anything, a differential check prices the same parts with
+every engine and fails (exit 1) unless unit cost, unit price and extended
+totals agree within CENT_TOLERANCE. The closed-form cost model
+(PartCostModel, calc_cost_model_batch) groups its sums differently, so it
+is only held to that tolerance; the detailed, unified and batch engines
+and the price curve columns must match calc_detailed_quote's rounded
+output exactly, and the batch engine's unrounded totals bit for bit. calc_unit_cost is compared with the unified summary only:
+it leaves out tool change, inspection, tooling and overhead by design, so
+it never matches the detailed engines.
+
+Usage (from backend/):
+    python -m benchmarks.bench_engines
+    python -m benchmarks.bench_engines --ops 1 10 200 --iterations 2000 --output engines.json
+    python -m benchmarks.bench_engines --check-only
+"""
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Tuple
+
+from app.services.price_curve import PartCostModel, price_curve
+from app.services.quoting import calc_unit_cost
+from app.services.quoting_batch import BatchInputs, calc_cost_model_batch, calc_detailed_quote_batch
+from app.services.quoting_enhanced import calc_detailed_quote, calc_unified_quote
+
+OP_COUNTS = [1, 5, 20, 50, 200]
+QUANTITIES = [1, 3, 25, 100, 1000, 10000]
+MARGIN_PCT = 0.15
+PARTS_PER_SIZE = 20
+
+# Half a cent: values that differ by less round to the same cent or to
+# neighbouring cents only because they straddle a rounding boundary
+CENT_TOLERANCE = 0.005
+
+# Unrounded totals the batch engine must reproduce bit for bit
+EXACT_FIELDS = ("unit_cost", "unit_price", "extended_cost", "extended_price", "profit_amount")
+
+
+def make_part(rng: random.Random, n_ops: int) -> Dict:
+    """Part inputs in the keyword format of calc_detailed_quote, plus ops"""
+    ops = []
+    for sequence in range(1, n_ops + 1):
+        ops.append({
+            "name": f"Op {sequence}",
+            "sequence": sequence,
+            "operation_type": rng.choice(["machining", "turning", "inspection", "finishing"]),
+            "setup_time_hr": round(rng.uniform(0.1, 3.0), 3),
+            "cycle_time_hr": round(rng.uniform(0.01, 1.5), 4),
+            "allowance_pct": round(rng.uniform(0.0, 0.3), 3),
+            "tool_change_time_min": round(rng.uniform(0.0, 5.0), 2),
+            "inspection_time_min": round(rng.uniform(0.0, 3.0), 2),
+            "tool_cost_per_part": round(rng.uniform(0.0, 4.0), 2),
+            "consumables_cost_per_part": round(rng.uniform(0.0, 1.5), 2),
+            "machine_rate_per_hr": round(rng.uniform(45.0, 185.0), 2),
+            "labor_rate_per_hr": round(rng.uniform(25.0, 65.0), 2),
+        })
+    return {
+        "stock_weight_lb": round(rng.uniform(0.1, 60.0), 3),
+        "cost_per_lb": round(rng.uniform(0.8, 45.0), 2),
+        "scrap_factor": round(rng.uniform(0.0, 0.2), 3),
+        "programming_time_hr": round(rng.uniform(0.0, 8.0), 2),
+        "programming_rate_per_hr": 75.0,
+        "first_article_inspection_hr": round(rng.uniform(0.0, 2.0), 2),
+        "overhead_rate_pct": round(rng.uniform(1.2, 1.8), 2),
+        "ops": ops,
+    }
+
+
+# name -> (calculate(part, quantity), serialize(result))
+Engine = Tuple[Callable[[Dict, int], object], Callable[[object], dict]]
+
+
+def _unit_cost(part: Dict, quantity: int):
+    return calc_unit_cost(
+        quantity=quantity,
+        stock_weight_lb=part["stock_weight_lb"],
+        cost_per_lb=part["cost_per_lb"],
+        scrap_factor=part["scrap_factor"],
+        ops=part["ops"],
+        margin_pct=MARGIN_PCT,
+    )
+
+
+def _batch_one(part: Dict, quantity: int):
+    return calc_detailed_quote_batch(BatchInputs.from_parts([part]), [quantity], MARGIN_PCT)
+
+
+def _price_curve_one(part: Dict, quantity: int):
+    return PartCostModel.from_inputs(**part), price_curve(part, [quantity], MARGIN_PCT)
+
+
+ENGINES: Dict[str, Engine] = {
+    "unit_cost": (_unit_cost, lambda result: result.to_dict()),
+    "detailed": (
+        lambda part, quantity: calc_detailed_quote(quantity=quantity, margin_pct=MARGIN_PCT, **part),
+        lambda result: result.to_dict(),
+    ),
+    "unified": (
+        lambda part, quantity: calc_unified_quote(quantity=quantity, margin_pct=MARGIN_PCT, **part),
+        lambda result: {"summary": result.summary.to_dict(), "detailed": result.detailed.to_dict()},
+    ),
+    "batch": (_batch_one, lambda result: result.breakdown(0, 0).to_dict()),
+    "price_curve": (_price_curve_one, lambda result: {"model": result[0].to_dict(), "curve": result[1]}),
+}
+
+
+def differential_check(parts: List[Dict]) -> List[str]:
+    """Price every part at every quantity with every engine; return mismatches"""
+    mismatches = []
+    inputs = BatchInputs.from_parts(parts)
+    batch = calc_detailed_quote_batch(inputs, QUANTITIES, MARGIN_PCT)
+    model_fixed, model_variable = calc_cost_model_batch(inputs)
+
+    def expect_equal(label: str, values: Dict[str, float]):
+        reference_name, reference = next(iter(values.items()))
+        for name, value in values.items():
+            if abs(value - reference) >= CENT_TOLERANCE:
+                mismatches.append(f"{label}: {name}={value:.6f} vs {reference_name}={reference:.6f}")
+
+    for p, part in enumerate(parts):
+        model = PartCostModel.from_inputs(**part)
+        curve = price_curve(part, QUANTITIES, MARGIN_PCT)
+        for q, quantity in enumerate(QUANTITIES):
+            label = f"part {p} ({len(part['ops'])} ops) x {quantity}"
+            detailed = calc_detailed_quote(quantity=quantity, margin_pct=MARGIN_PCT, **part)
+            unified = calc_unified_quote(quantity=quantity, margin_pct=MARGIN_PCT, **part)
+            summary = _unit_cost(part, quantity)
+            model_unit_cost = model.variable_unit_cost + model.fixed_cost / quantity
+            model_batch_unit_cost = float(model_variable[p] + model_fixed[p] / quantity)
+
+            expect_equal(f"{label} unit_cost", {
+                "detailed": detailed.unit_cost,
+                "unified": unified.detailed.unit_cost,
+                "batch": float(batch.unit_cost[p, q]),
+                "cost_model": model_unit_cost,
+                "cost_model_batch": model_batch_unit_cost,
+            })
+            expect_equal(f"{label} unit_price", {
+                "detailed": detailed.unit_price,
+                "unified": unified.detailed.unit_price,
+                "batch": float(batch.unit_price[p, q]),
+                "cost_model": model_unit_cost * (1.0 + MARGIN_PCT),
+            })
+            expect_equal(f"{label} extended_cost", {
+                "detailed": detailed.extended_cost,
+                "unified": unified.detailed.extended_cost,
+                "batch": float(batch.extended_cost[p, q]),
+                "cost_model": model_unit_cost * quantity,
+            })
+            expect_equal(f"{label} extended_price", {
+                "detailed": detailed.extended_price,
+                "unified": unified.detailed.extended_price,
+                "batch": float(batch.extended_price[p, q]),
+                "cost_model": model_unit_cost * (1.0 + MARGIN_PCT) * quantity,
+            })
+            expect_equal(f"{label} summary unit_cost", {
+                "unit_cost": summary.unit_cost,
+                "unified": unified.summary.unit_cost,
+            })
+            expect_equal(f"{label} summary unit_price", {
+                "unit_cost": summary.unit_price,
+                "unified": unified.summary.unit_price,
+            })
+
+            # The detailed engines promise identical responses, not just cents
+            expected = detailed.to_dict()
+            if expected != unified.detailed.to_dict():
+                mismatches.append(f"{label}: unified to_dict() differs from detailed")
+            if expected != batch.breakdown(p, q).to_dict():
+                mismatches.append(f"{label}: batch to_dict() differs from detailed")
+            exact = {name: getattr(detailed, name) for name in EXACT_FIELDS}
+            if exact != {name: float(getattr(batch, name)[p, q]) for name in EXACT_FIELDS}:
+                mismatches.append(f"{label}: batch differs from detailed before rounding")
+            curve_point = {name: curve[name][q] for name in ("unit_cost", "unit_price", "extended_cost", "extended_price")}
+            if curve_point != {name: expected["summary"][name] for name in curve_point}:
+                mismatches.append(f"{label}: price curve {curve_point} differs from detailed summary")
+    return mismatches
+
+
+def time_per_call(fn: Callable, args: List[Tuple], iterations: int, repeats: int) -> float:
+    """Best-of-repeats mean microseconds per call, cycling through args"""
+    calls = [args[i % len(args)] for i in range(iterations)]
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for call_args in calls:
+            fn(*call_args)
+        best = min(best, time.perf_counter() - start)
+    return best / iterations * 1e6
+
+
+def allocations_per_call(fn: Callable, args: List[Tuple]) -> Tuple[float, float]:
+    """Median (peak, retained) bytes allocated by one call, under tracemalloc"""
+    peaks, retained = [], []
+    tracemalloc.start()
+    try:
+        for call_args in args:
+            tracemalloc.reset_peak()
+            before, _ = tracemalloc.get_traced_memory()
+            result = fn(*call_args)
+            current, peak = tracemalloc.get_traced_memory()
+            peaks.append(peak - before)
+            retained.append(current - before)
+            del result
+    finally:
+        tracemalloc.stop()
+    return statistics.median(peaks), statistics.median(retained)
+
+
+def bench_engine(engine: Engine, parts: List[Dict], iterations: int, repeats: int) -> dict:
+    calculate, serialize = engine
+    args = [(part, QUANTITIES[i % len(QUANTITIES)]) for i, part in enumerate(parts)]
+    results = [(calculate(*call_args),) for call_args in args]
+    peak, retained = allocations_per_call(calculate, args)
+    return {
+        "call_us": round(time_per_call(calculate, args, iterations, repeats), 2),
+        "to_dict_us": round(time_per_call(serialize, results, iterations, repeats), 2),
+        "peak_kib": round(peak / 1024, 1),
+        "retained_kib": round(retained / 1024, 1),
+    }
+
+
+def bench_batch_repricing(parts: List[Dict], repeats: int) -> dict:
+    """All parts at all QUANTITIES in one batch call, per (part, quantity) pair"""
+    inputs = BatchInputs.from_parts(parts)
+    pairs = len(parts) * len(QUANTITIES)
+
+    def run():
+        return calc_detailed_quote_batch(inputs, QUANTITIES, MARGIN_PCT, keep_operations=False)
+
+    peak, retained = allocations_per_call(run, [()])
+    return {
+        "pair_us": round(time_per_call(run, [()], 1, repeats) / pairs, 2),
+        "peak_kib": round(peak / 1024, 1),
+        "retained_kib": round(retained / 1024, 1),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--ops", type=int, nargs="+", default=OP_COUNTS, help="operation counts to benchmark")
+    parser.add_argument("--iterations", type=int, default=500, help="calls per timing repeat")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--check-only", action="store_true", help="run the differential check only")
+    parser.add_argument("--output", help="write results to this JSON file")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    parts_by_size = {n_ops: [make_part(rng, n_ops) for _ in range(PARTS_PER_SIZE)] for n_ops in args.ops}
+
+    all_parts = [part for parts in parts_by_size.values() for part in parts]
+    mismatches = differential_check(all_parts)
+    checked = len(all_parts) * len(QUANTITIES)
+    if mismatches:
+        print(f"FAIL: engines disagree on {len(mismatches)} value(s):", file=sys.stderr)
+        for line in mismatches[:20]:
+            print("  " + line, file=sys.stderr)
+        return 1
+    print(f"OK: all engines agree on {checked} (part, quantity) pairs")
+    if args.check_only:
+        return 0
+
+    results: Dict[str, Dict[str, dict]] = {name: {} for name in ENGINES}
+    results["batch_repricing"] = {}
+
+    print(f"\n{'engine':<12} {'ops':>5} {'call us':>10} {'to_dict us':>11} {'peak KiB':>9} {'kept KiB':>9}")
+    for name, engine in ENGINES.items():
+        for n_ops, parts in parts_by_size.items():
+            r = results[name][str(n_ops)] = bench_engine(engine, parts, args.iterations, args.repeats)
+            print(
+                f"{name:<12} {n_ops:>5} {r['call_us']:>10.2f} {r['to_dict_us']:>11.2f} "
+                f"{r['peak_kib']:>9.1f} {r['retained_kib']:>9.1f}"
+            )
+
+    print(f"\nbatch repricing: {PARTS_PER_SIZE} parts x {len(QUANTITIES)} quantities per call")
+    print(f"{'ops':>5} {'us/pair':>10} {'peak KiB':>9} {'kept KiB':>9}")
+    for n_ops, parts in parts_by_size.items():
+        r = results["batch_repricing"][str(n_ops)] = bench_batch_repricing(parts, args.repeats)
+        print(f"{n_ops:>5} {r['pair_us']:>10.2f} {r['peak_kib']:>9.1f} {r['retained_kib']:>9.1f}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"seed": args.seed, "iterations": args.iterations, "engines": results}, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"\nResults written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
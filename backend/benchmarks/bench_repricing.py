@@ -0,0 +1,120 @@
+"""
+Benchmark: parallel repricing, by worker count
+
+Prices one large synthetic catalog with the batch engine in process and
+then through app.services.repricing.RepricingPool with 1, 2, 4, ... worker
+processes, and reports throughput and speedup over the in-process run.
+Every pooled result is first checked to be identical, array for array, to
+the in-process one (exit 1 otherwise). No database or app is involved.
+
+Each pool is warmed up with one untimed call, so worker start-up is not
+counted. The speedup tops out at the number of cores; --keep-operations
+adds the per-operation arrays (what calculate-batch with detail "full"
+needs), which roughly doubles what the workers send back.
+
+Usage (from backend/):
+    python -m benchmarks.bench_repricing
+    python -m benchmarks.bench_repricing --parts 400000 --workers 1 8 16 32 --output repricing.json
+"""
+
+import argparse
+import dataclasses
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from typing import Dict, List
+
+import numpy as np
+
+from app.services.quoting_batch import BatchInputs, calc_detailed_quote_batch
+from app.services.repricing import RepricingPool
+
+from .bench_engines import make_part
+
+QUANTITIES = [1, 10, 50, 100, 500, 1000]
+MARGIN_PCT = 0.15
+
+
+def default_workers() -> List[int]:
+    cores = os.cpu_count() or 1
+    counts = [1]
+    while counts[-1] * 2 <= cores:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != cores:
+        counts.append(cores)
+    return counts
+
+
+def same_result(a, b) -> bool:
+    for f in dataclasses.fields(a):
+        if f.name == "inputs":
+            continue
+        x, y = getattr(a, f.name), getattr(b, f.name)
+        if (x is None) != (y is None) or (x is not None and not np.array_equal(x, y)):
+            return False
+    return True
+
+
+def best_of(repeats: int, run) -> float:
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--parts", type=int, default=100_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=default_workers())
+    parser.add_argument("--keep-operations", action="store_true")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="write results to this JSON file")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    # Routing lengths spread like app.synthetic's (mostly 2-5 operations)
+    op_counts = rng.choices(range(1, 9), weights=[5, 15, 25, 22, 15, 9, 6, 3], k=args.parts)
+    inputs = BatchInputs.from_parts([make_part(rng, n_ops) for n_ops in op_counts])
+    pairs = inputs.n_parts * len(QUANTITIES)
+    keep = args.keep_operations
+    print(f"{inputs.n_parts} parts, {inputs.n_ops} operations, {len(QUANTITIES)} quantities, "
+          f"{os.cpu_count()} cores, keep_operations={keep}")
+
+    reference = calc_detailed_quote_batch(inputs, QUANTITIES, MARGIN_PCT, keep_operations=keep)
+    serial_s = best_of(args.repeats, lambda: calc_detailed_quote_batch(inputs, QUANTITIES, MARGIN_PCT, keep_operations=keep))
+    results: Dict[str, dict] = {"in_process": {"seconds": serial_s, "pairs_per_s": pairs / serial_s}}
+
+    print(f"\n{'workers':>8} {'seconds':>9} {'pairs/s':>12} {'speedup':>8}")
+    print(f"{'-':>8} {serial_s:>9.3f} {pairs / serial_s:>12,.0f} {1.0:>8.2f}")
+    for workers in args.workers:
+        pool = RepricingPool(workers=workers, min_shard_parts=1)
+        try:
+            result = pool.calc(inputs, QUANTITIES, MARGIN_PCT, keep_operations=keep)
+            if not same_result(reference, result):
+                print(f"FAIL: {workers} workers priced differently from the in-process engine", file=sys.stderr)
+                return 1
+            seconds = best_of(args.repeats, lambda: pool.calc(inputs, QUANTITIES, MARGIN_PCT, keep_operations=keep))
+        finally:
+            pool.shutdown()
+        results[str(workers)] = {"seconds": seconds, "pairs_per_s": pairs / seconds, "speedup": serial_s / seconds}
+        print(f"{workers:>8} {seconds:>9.3f} {pairs / seconds:>12,.0f} {serial_s / seconds:>8.2f}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({
+                "parts": inputs.n_parts, "operations": inputs.n_ops, "quantities": QUANTITIES,
+                "cores": os.cpu_count(), "keep_operations": keep, "seed": args.seed, "runs": results,
+            }, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"\nResults written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,182 @@
+"""
+Serialization benchmark: fast JSON path vs the previous response_model path
+
+For each heavy endpoint, rebuilds the response the way it used to be
+produced: ORM objects validated through the response model
+(or the returned dict through Dict[str, Any]), dumped in JSON mode and
+encoded by Starlette's JSONResponse. It then checks the endpoint's current
+body is byte-for-byte the same and times both ways of going from database
+(or engine result) to bytes. One operation is given a cycle time that
+prints in exponent notation, to cover the stdlib fallback.
+
+Exits 1 if any body differs.
+
+Usage (from backend/):
+    python -m benchmarks.bench_serialization
+    python -m benchmarks.bench_serialization --parts 20000 --quotes 20000 --repeats 20
+    DATABASE_URL=postgresql+psycopg2://... python -m benchmarks.bench_serialization --reuse-data
+
+Defaults to a throwaway SQLite database.
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+if "DATABASE_URL" not in os.environ:
+    _db_path = os.path.join(tempfile.mkdtemp(prefix="cncq-bench-"), "bench.db")
+    os.environ["DATABASE_URL"] = f"sqlite:///{_db_path}"
+
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+from pydantic import TypeAdapter
+from sqlalchemy.orm import selectinload
+
+from app import models
+from app.db import SessionLocal, engine
+from app.main import app
+from app.migrate import upgrade_database
+from app.pagination import PageParams, encode_cursor
+from app.routers import parts, quotes
+from app.serialization import dumps
+from app.synthetic import SyntheticConfig, generate
+
+PAGE = 500
+
+
+def legacy_render(adapter: TypeAdapter, value: Any) -> bytes:
+    """What FastAPI produced with a response_model and JSONResponse"""
+    content = adapter.dump_python(adapter.validate_python(value, from_attributes=True), mode="json", by_alias=True)
+    return JSONResponse(content).body
+
+
+def best_ms(fn: Callable[[], Any], repeats: int) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def list_cases(db, exponent_part_id: int) -> Dict[str, Tuple[Callable[[], bytes], Callable[[], bytes]]]:
+    """name -> (legacy, current): each queries a page and returns the body"""
+    parts_adapter = TypeAdapter(List[parts.PartResponse])
+    quotes_adapter = TypeAdapter(List[quotes.QuoteResponse])
+    page = PageParams(limit=PAGE, cursor=None, include_total=False)
+    # The page after the part whose operation needs the stdlib encoder
+    next_page = PageParams(limit=PAGE, cursor=encode_cursor(exponent_part_id), include_total=False)
+
+    def legacy_parts(after_id: int = 0):
+        rows = db.query(models.Part).options(selectinload(models.Part.operations)).filter(
+            models.Part.id > after_id
+        ).order_by(models.Part.id).limit(PAGE).all()
+        body = legacy_render(parts_adapter, rows)
+        db.expunge_all()
+        return body
+
+    def legacy_quotes():
+        rows = db.query(models.Quote).options(selectinload(models.Quote.items)).order_by(models.Quote.id.desc()).limit(PAGE).all()
+        body = legacy_render(quotes_adapter, rows)
+        db.expunge_all()
+        return body
+
+    return {
+        f"list_parts limit={PAGE}": (
+            lambda: legacy_parts(exponent_part_id),
+            lambda: parts.list_parts(response=Response(), page=next_page, db=db).body,
+        ),
+        "list_parts w/ exponent": (
+            legacy_parts,
+            lambda: parts.list_parts(response=Response(), page=page, db=db).body,
+        ),
+        f"list_quotes limit={PAGE}": (
+            legacy_quotes,
+            lambda: quotes.list_quotes(response=Response(), page=page, db=db).body,
+        ),
+    }
+
+
+def calculation_cases(client: TestClient, part_id: int) -> Dict[str, Tuple[Any, TypeAdapter, bytes]]:
+    """name -> (result content, legacy response model adapter, current body)"""
+    any_dict = TypeAdapter(Dict[str, Any])
+    requests = {
+        "calculate": ("/api/quotes/calculate", {"part_id": part_id, "quantity": 25}, TypeAdapter(quotes.CalculateResponse)),
+        "calculate_detailed": ("/api/quotes/calculate-detailed", {"part_id": part_id, "quantity": 25}, any_dict),
+        "calculate_full": ("/api/quotes/calculate-full", {"part_id": part_id, "quantity": 25}, any_dict),
+        "price_curve 500 points": (
+            "/api/quotes/price-curve", {"part_id": part_id, "quantity_range": {"start": 1, "stop": 500}}, any_dict,
+        ),
+    }
+    cases = {}
+    for name, (path, body, adapter) in requests.items():
+        response = client.post(path, json=body)
+        response.raise_for_status()
+        cases[name] = (json.loads(response.content), adapter, response.content)
+    return cases
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--parts", type=int, default=2000)
+    parser.add_argument("--quotes", type=int, default=2000)
+    parser.add_argument("--reuse-data", action="store_true", help="benchmark the existing rows, generate nothing")
+    parser.add_argument("--repeats", type=int, default=10)
+    args = parser.parse_args()
+
+    upgrade_database()
+    if not args.reuse_data:
+        print(f"Generating {args.parts} parts and {args.quotes} quotes...")
+        generate(engine, SyntheticConfig(parts=args.parts, quotes=args.quotes))
+
+    db = SessionLocal()
+    failures = []
+    print(f"\n{'case':<26} {'bytes':>9} {'before ms':>10} {'after ms':>9} {'speedup':>8}  identical")
+    try:
+        # A value json.dumps writes as 1e-05 and orjson as 0.00001
+        first_part = db.query(models.Part).order_by(models.Part.id).first()
+        db.query(models.Operation).filter(models.Operation.id == first_part.operations[0].id).update(
+            {"cycle_time_hr": 0.00001}
+        )
+        db.commit()
+        # The heaviest part on the first page, for the calculation endpoints
+        heavy_part_id = max(
+            db.query(models.Part).options(selectinload(models.Part.operations)).order_by(models.Part.id).limit(PAGE),
+            key=lambda part: len(part.operations),
+        ).id
+        db.expunge_all()
+
+        for name, (legacy, current) in list_cases(db, first_part.id).items():
+            before, after = legacy(), current()
+            identical = before == after
+            if not identical:
+                failures.append(name)
+            legacy_ms, current_ms = best_ms(legacy, args.repeats), best_ms(current, args.repeats)
+            print(f"{name:<26} {len(after):>9} {legacy_ms:>10.2f} {current_ms:>9.2f} {legacy_ms / current_ms:>7.1f}x  {identical}")
+
+        with TestClient(app) as client:
+            for name, (content, adapter, body) in calculation_cases(client, heavy_part_id).items():
+                identical = legacy_render(adapter, content) == body
+                if not identical:
+                    failures.append(name)
+                # Both sides start from the engine's dict; only encoding differs
+                legacy_ms = best_ms(lambda: legacy_render(adapter, content), args.repeats)
+                current_ms = best_ms(lambda: dumps(content), args.repeats)
+                print(f"{name:<26} {len(body):>9} {legacy_ms:>10.3f} {current_ms:>9.3f} {legacy_ms / current_ms:>7.1f}x  {identical}")
+    finally:
+        db.close()
+
+    if failures:
+        print(f"FAIL: bodies differ for {', '.join(failures)}", file=sys.stderr)
+        return 1
+    print("\nOK: all bodies byte-identical")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
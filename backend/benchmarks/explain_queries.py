@@ -0,0 +1,190 @@
+"""
+Index check: EXPLAIN every query the hot endpoints issue
+
+Migrates a database, fills it with enough synthetic parts and quotes
+(app.synthetic) for the planner to prefer index scans over sequential
+scans, then calls each
+endpoint through the API, captures the SQL it runs and EXPLAINs it with
+the same parameters. Each case names the index it is expected to use; the
+script exits non-zero if a plan does not use it.
+
+Usage (from backend/):
+    python -m benchmarks.explain_queries
+    python -m benchmarks.explain_queries --parts 50000 --quotes 50000 --verbose
+    DATABASE_URL=postgresql+psycopg2://... python -m benchmarks.explain_queries
+
+Defaults to a throwaway SQLite database. Run against an empty database:
+the synthetic rows are not cleaned up.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import List, Optional, Set
+
+if "DATABASE_URL" not in os.environ:
+    _db_path = os.path.join(tempfile.mkdtemp(prefix="cncq-explain-"), "explain.db")
+    os.environ["DATABASE_URL"] = f"sqlite:///{_db_path}"
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app.db import engine
+from app.main import app
+from app.migrate import upgrade_database
+from app.synthetic import SyntheticConfig, generate
+
+# Tables large enough that a sequential scan is worth reporting
+LARGE_TABLES = ("parts", "operations", "quotes", "quote_items")
+
+
+@dataclass
+class Case:
+    name: str
+    method: str
+    path: str
+    body: Optional[dict] = None
+    # Any one of these indexes counts as a pass
+    expect: Set[str] = field(default_factory=set)
+    # Dialects whose planner cannot use the index for this query
+    skip_dialects: Set[str] = field(default_factory=set)
+
+
+def synthesize(parts: int, quotes: int, seed: int) -> dict:
+    """Generate the data set and pick the ids each case queries"""
+    summary = generate(engine, SyntheticConfig(parts=parts, quotes=quotes, seed=seed))
+    return {
+        "customer_id": summary.customer_ids[len(summary.customer_ids) // 2],
+        # Material popularity is skewed; the last one is rare, so filtering on it is selective
+        "material_id": summary.material_ids[-1],
+        "part_id": summary.part_ids[len(summary.part_ids) // 2],
+        "part_number_prefix": f"BRK-{summary.part_ids[len(summary.part_ids) // 2] // 1000:05d}",
+        "quote_id": summary.quote_ids[len(summary.quote_ids) // 2],
+        "recent": (summary.created_to - timedelta(days=1)).strftime("%Y-%m-%dT%H:%M:%SZ"),
+    }
+
+
+def build_cases(ids: dict) -> List[Case]:
+    return [
+        Case("calculate (part + operations)", "POST", "/api/quotes/calculate",
+             {"part_id": ids["part_id"], "quantity": 10},
+             expect={"ix_operations_part_id_sequence"}),
+        Case("create quote (bulk part load)", "POST", "/api/quotes",
+             {"customer_id": ids["customer_id"], "items": [{"part_id": ids["part_id"], "quantity": 5}]},
+             expect={"ix_operations_part_id_sequence"}),
+        Case("get quote with items", "GET", f"/api/quotes/{ids['quote_id']}?detail=full",
+             expect={"ix_quote_items_quote_id"}),
+        Case("list quotes by customer", "GET", f"/api/quotes?customer_id={ids['customer_id']}",
+             expect={"ix_quotes_customer_id_id"}),
+        Case("list quotes by status", "GET", "/api/quotes?status=sent",
+             # A quarter of all quotes are sent: walking the primary key backwards
+             # and filtering fills a page as cheaply as the status index
+             expect={"ix_quotes_status_id", "quotes_pkey"}),
+        Case("list a customer's drafts", "GET", f"/api/quotes?status=draft&customer_id={ids['customer_id']}",
+             expect={"ix_quotes_draft_customer_id_id"}),
+        Case("list recent quotes", "GET", f"/api/quotes?created_from={ids['recent']}",
+             # SQLite's planner walks the primary key to avoid sorting rather than
+             # estimating the range's selectivity
+             expect={"ix_quotes_created_at"}, skip_dialects={"sqlite"}),
+        Case("list quote items (page of quotes)", "GET", "/api/quotes?limit=50",
+             expect={"ix_quote_items_quote_id"}),
+        Case("list parts by material", "GET", f"/api/parts?material_id={ids['material_id']}",
+             expect={"ix_parts_material_id_id"}),
+        Case("list parts with operations", "GET", "/api/parts?limit=50",
+             expect={"ix_operations_part_id_sequence"}),
+        Case("list parts by number prefix", "GET", f"/api/parts?part_number_prefix={ids['part_number_prefix']}",
+             # SQLite's LIKE is case-insensitive and cannot use a plain index
+             expect={"ix_parts_part_number_pattern"}, skip_dialects={"sqlite"}),
+        Case("list recent parts", "GET", f"/api/parts?created_from={ids['recent']}",
+             expect={"ix_parts_created_at"}, skip_dialects={"sqlite"}),
+    ]
+
+
+def explain(statement: str, parameters) -> List[str]:
+    """Plan lines for one captured statement"""
+    with engine.connect() as conn:
+        if engine.dialect.name == "sqlite":
+            rows = conn.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters)
+            return [row[-1] for row in rows]
+        rows = conn.exec_driver_sql("EXPLAIN " + statement, parameters)
+        return [row[0] for row in rows]
+
+
+def full_scans(plan: List[str]) -> List[str]:
+    scans = []
+    for line in plan:
+        for table in LARGE_TABLES:
+            if line.strip() == f"SCAN {table}" or f"Seq Scan on {table} " in line + " ":
+                scans.append(table)
+    return scans
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--parts", type=int, default=20000)
+    parser.add_argument("--quotes", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=SyntheticConfig.seed)
+    parser.add_argument("--verbose", "-v", action="store_true", help="print every plan")
+    args = parser.parse_args()
+
+    upgrade_database()
+    print(f"Generating {args.parts} parts and {args.quotes} quotes...")
+    ids = synthesize(args.parts, args.quotes, args.seed)
+
+    captured = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if not executemany and statement.lstrip().upper().startswith("SELECT"):
+            captured.append((statement, parameters))
+
+    client = TestClient(app)
+    # Warm the rate catalog so its loads are not attributed to the first case
+    client.post("/api/quotes/calculate", json={"part_id": ids["part_id"], "quantity": 1})
+
+    dialect = engine.dialect.name
+    failures = 0
+    for case in build_cases(ids):
+        captured.clear()
+        event.listen(engine, "before_cursor_execute", capture)
+        try:
+            response = client.request(case.method, case.path, json=case.body)
+        finally:
+            event.remove(engine, "before_cursor_execute", capture)
+        response.raise_for_status()
+
+        plans = [explain(statement, parameters) for statement, parameters in captured]
+        plan_text = "\n".join(line for plan in plans for line in plan)
+        used = sorted(name for name in case.expect if name in plan_text)
+        scans = sorted({table for plan in plans for table in full_scans(plan)})
+
+        if dialect in case.skip_dialects:
+            status = "skip"
+        elif used:
+            status = "ok"
+        else:
+            status = "FAIL"
+            failures += 1
+
+        detail = ", ".join(used) or "expected " + " or ".join(sorted(case.expect))
+        if scans:
+            detail += f"; table scan of {', '.join(scans)}"
+        print(f"{status:>5}  {case.name:<36} {len(captured):>2} queries  {detail}")
+
+        if args.verbose or status == "FAIL":
+            for (statement, _), plan in zip(captured, plans):
+                print("       " + " ".join(statement.split())[:160])
+                for line in plan:
+                    print("         " + line)
+
+    if failures:
+        print(f"FAIL: {failures} case(s) did not use the expected index", file=sys.stderr)
+        return 1
+    print("OK: every query uses its index")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
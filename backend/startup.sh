@@ -3,14 +3,15 @@ set -e
 
 echo "Starting CNC Quoting Backend..."
 
-# Create tables and seed database
+# Apply schema migrations
+echo "Migrating database schema..."
+python -m app.migrate
+
+# Seed database
 python -c "
-from app.db import Base, engine, SessionLocal
+from app.db import SessionLocal
 from app.seed import seed_database
 
-print('Creating database tables...')
-Base.metadata.create_all(bind=engine)
-
 print('Seeding database...')
 db = SessionLocal()
 try:
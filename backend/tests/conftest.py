@@ -0,0 +1,48 @@
+"""
+Shared fixtures: the app, in-process, over a seeded database
+
+The suite runs against a throwaway SQLite database unless DATABASE_URL is
+set (point it at an empty PostgreSQL database to test that dialect).
+DB_MODE=async runs the same tests through the async routers.
+
+Usage (from backend/):
+    python -m pytest
+    DB_MODE=async python -m pytest
+"""
+
+import os
+import tempfile
+
+if "DATABASE_URL" not in os.environ:
+    _db_path = os.path.join(tempfile.mkdtemp(prefix="cncq-test-"), "test.db")
+    os.environ["DATABASE_URL"] = f"sqlite:///{_db_path}"
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from app.db import SessionLocal, engine
+from app.main import app
+from app.migrate import upgrade_database
+from app.seed import seed_database
+
+
+@pytest.fixture(scope="session")
+def client():
+    upgrade_database()
+    db = SessionLocal()
+    try:
+        seed_database(db)
+    finally:
+        db.close()
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture
+def execute():
+    """Run SQL outside the API, as another worker or a script would"""
+    def execute(sql: str, **params):
+        with engine.begin() as connection:
+            return connection.execute(text(sql), params)
+    return execute
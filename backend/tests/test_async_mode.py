@@ -0,0 +1,28 @@
+import importlib.util
+import os
+import subprocess
+import sys
+
+import pytest
+
+from app.db import DB_MODE
+
+# Everything that goes through the app; the rest does not depend on DB_MODE
+API_TESTS = ["test_http_cache.py", "test_jobs.py", "test_pagination.py", "test_quote_cache.py", "test_quote_session.py"]
+
+
+@pytest.mark.skipif(DB_MODE == "async", reason="this run is already in async mode")
+@pytest.mark.skipif(
+    "DATABASE_URL" in os.environ and not os.environ["DATABASE_URL"].startswith("sqlite"),
+    reason="needs a second database: run DB_MODE=async python -m pytest instead",
+)
+@pytest.mark.skipif(importlib.util.find_spec("aiosqlite") is None, reason="async mode on SQLite needs aiosqlite")
+def test_api_in_async_mode(tmp_path):
+    """The API tests again, through the async routers, on a database of their own"""
+    tests = os.path.dirname(os.path.abspath(__file__))
+    env = {**os.environ, "DB_MODE": "async", "DATABASE_URL": f"sqlite:///{tmp_path / 'async.db'}"}
+    run = subprocess.run(
+        [sys.executable, "-m", "pytest", "-q", "-p", "no:cacheprovider", *(os.path.join(tests, name) for name in API_TESTS)],
+        cwd=os.path.dirname(tests), env=env, capture_output=True, text=True,
+    )
+    assert run.returncode == 0, run.stdout[-4000:] + run.stderr[-2000:]
@@ -0,0 +1,32 @@
+import random
+
+import numpy as np
+import pytest
+
+from app.services.quoting_batch import BatchInputs, calc_detailed_quote_batch
+from app.services.repricing import _price_shard, merge_shards, shard_bounds, take_parts
+from benchmarks.bench_engines import MARGIN_PCT, QUANTITIES, differential_check, make_part
+
+
+@pytest.mark.parametrize("n_ops", [1, 5, 50])
+def test_engines_agree(n_ops):
+    rng = random.Random(n_ops)
+    parts = [make_part(rng, n_ops) for _ in range(10)]
+    assert differential_check(parts) == []
+
+
+def test_sharded_batch_matches_single_call():
+    rng = random.Random(7)
+    inputs = BatchInputs.from_parts([make_part(rng, rng.randint(1, 12)) for _ in range(30)])
+    quantities = np.asarray(QUANTITIES, dtype=np.int64)
+    margin = np.full(inputs.n_parts, MARGIN_PCT)
+
+    shards = []
+    for start, end in shard_bounds(inputs.n_parts, 4):
+        shard, op_rows = take_parts(inputs, start, end)
+        shards.append(((start, end), op_rows, _price_shard(shard, quantities, margin[start:end], True)))
+    merged = merge_shards(inputs, quantities, margin, shards, keep_operations=True)
+    whole = calc_detailed_quote_batch(inputs, quantities, margin)
+
+    for name in ("unit_cost", "unit_price", "extended_price", "material_total", "op_total_cost"):
+        assert np.array_equal(getattr(merged, name), getattr(whole, name)), name
@@ -0,0 +1,56 @@
+import pytest
+
+
+@pytest.mark.parametrize("path", ["/api/machines", "/api/materials", "/api/customers", "/api/parts", "/api/parts/1"])
+def test_matching_etag_answers_304(client, path):
+    response = client.get(path)
+    assert response.status_code == 200
+    etag = response.headers["etag"]
+    assert response.headers["cache-control"] == "no-cache"
+
+    cached = client.get(path, headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.headers["etag"] == etag
+    assert cached.content == b""
+    assert client.get(path, headers={"If-None-Match": f"W/{etag}"}).status_code == 304
+    assert client.get(path, headers={"If-None-Match": '"stale"'}).status_code == 200
+
+
+def test_etag_carries_the_negotiated_coding(client):
+    gzip = client.get("/api/parts", headers={"Accept-Encoding": "gzip"})
+    identity = client.get("/api/parts", headers={"Accept-Encoding": "identity"})
+    assert gzip.headers["content-encoding"] == "gzip"
+    assert "content-encoding" not in identity.headers
+    assert gzip.headers["etag"].endswith('-gzip"')
+    assert gzip.headers["etag"] != identity.headers["etag"]
+
+    # A 304 carries the ETag of the representation this request would get
+    cached = client.get("/api/parts", headers={"Accept-Encoding": "gzip", "If-None-Match": gzip.headers["etag"]})
+    assert cached.status_code == 304
+    assert cached.headers["etag"] == gzip.headers["etag"]
+    other = client.get("/api/parts", headers={"Accept-Encoding": "identity", "If-None-Match": gzip.headers["etag"]})
+    assert other.status_code == 200
+
+
+def test_write_through_the_api_changes_the_etag(client):
+    etag = client.get("/api/parts/1").headers["etag"]
+    part = client.get("/api/parts/1").json()
+    assert client.put("/api/parts/1", json={"description": "etag test"}).status_code == 200
+    response = client.get("/api/parts/1", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    client.put("/api/parts/1", json={"description": part["description"]})
+
+
+def test_write_outside_the_api_changes_the_etag(client, execute):
+    etag = client.get("/api/machines").headers["etag"]
+    execute("UPDATE machines SET description = description WHERE id = 1")
+    response = client.get("/api/machines", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+
+
+def test_unrelated_write_keeps_the_etag(client):
+    etag = client.get("/api/machines").headers["etag"]
+    client.put("/api/parts/1", json={"stock_weight_lb": client.get("/api/parts/1").json()["stock_weight_lb"]})
+    assert client.get("/api/machines", headers={"If-None-Match": etag}).status_code == 304
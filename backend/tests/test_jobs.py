@@ -0,0 +1,82 @@
+import json
+import time
+
+import pytest
+
+from app import jobs
+
+QUOTE = {"customer_id": 1, "items": [{"part_id": 1, "quantity": 5}, {"part_id": 2, "quantity": 10}, {"part_id": 3, "quantity": 1}]}
+
+
+def _wait(client, job_id, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = client.get(f"/api/quotes/jobs/{job_id}").json()
+        if job["status"] in jobs.FINISHED:
+            return job
+        time.sleep(0.02)
+    raise AssertionError(f"job {job_id} did not finish")
+
+
+def _quote_count(execute):
+    return execute("SELECT COUNT(*) FROM quotes").scalar()
+
+
+def test_job_saves_the_quote(client):
+    submitted = client.post("/api/quotes/jobs", json=QUOTE)
+    assert submitted.status_code == 202
+    job = _wait(client, submitted.json()["id"])
+    assert job["status"] == jobs.SUCCEEDED
+    assert job["done"] == job["total"] == len(QUOTE["items"])
+
+    quote = client.get(f"/api/quotes/{job['result']['quote_id']}").json()
+    assert [item["part_id"] for item in quote["items"]] == [1, 2, 3]
+
+
+def test_job_failure_carries_the_endpoint_error(client):
+    job = _wait(client, client.post("/api/quotes/jobs", json={**QUOTE, "customer_id": 999999}).json()["id"])
+    assert job["status"] == jobs.FAILED
+    assert job["error"] == "Customer not found"
+
+
+# 1: after the first line item; 4: the last check, after the insert and before the commit
+@pytest.mark.parametrize("cancel_at_call", [1, 4])
+def test_cancelled_job_writes_nothing(client, execute, monkeypatch, cancel_at_call):
+    calls = []
+    progress = jobs.Job.progress
+
+    def cancel_during(job, done):
+        calls.append(done)
+        if len(calls) == cancel_at_call:
+            client.post(f"/api/quotes/jobs/{job.id}/cancel")
+        progress(job, done)
+
+    monkeypatch.setattr(jobs.Job, "progress", cancel_during)
+    before = _quote_count(execute)
+    job = _wait(client, client.post("/api/quotes/jobs", json=QUOTE).json()["id"])
+    assert job["status"] == jobs.CANCELLED
+    assert _quote_count(execute) == before
+
+    monkeypatch.undo()
+    retry = client.post(f"/api/quotes/jobs/{job['id']}/retry")
+    assert retry.status_code == 202
+    assert retry.json()["attempt"] == 2 and retry.json()["retry_of"] == job["id"]
+    assert _wait(client, retry.json()["id"])["status"] == jobs.SUCCEEDED
+    assert _quote_count(execute) == before + 1
+
+
+def test_finished_jobs_cannot_be_cancelled_or_retried(client):
+    job = _wait(client, client.post("/api/quotes/jobs", json=QUOTE).json()["id"])
+    assert client.post(f"/api/quotes/jobs/{job['id']}/cancel").status_code == 409
+    assert client.post(f"/api/quotes/jobs/{job['id']}/retry").status_code == 409
+    assert client.get("/api/quotes/jobs/unknown").status_code == 404
+
+
+def test_events_end_with_done(client):
+    job_id = client.post("/api/quotes/jobs", json=QUOTE).json()["id"]
+    with client.stream("GET", f"/api/quotes/jobs/{job_id}/events") as response:
+        assert response.headers["content-type"].startswith("text/event-stream")
+        events = [line for line in response.iter_lines() if line.startswith("event: ")]
+    assert events[-1] == "event: done"
+    assert set(events[:-1]) <= {"event: progress"}
+    assert json.loads(client.get(f"/api/quotes/jobs/{job_id}").text)["status"] == jobs.SUCCEEDED
@@ -0,0 +1,80 @@
+import pytest
+from alembic import command
+from sqlalchemy import create_engine, inspect, text
+
+from app import db as app_db
+from app import migrate
+from app.models import Base
+
+# Created only where they help (see the models)
+POSTGRESQL_ONLY_INDEXES = {"ix_parts_part_number_pattern"}
+
+
+@pytest.fixture
+def database(tmp_path, monkeypatch):
+    """An empty SQLite database that the migration helpers (and Alembic's env) use"""
+    url = f"sqlite:///{tmp_path / 'migrations.db'}"
+    engine = create_engine(url)
+    monkeypatch.setattr(app_db, "engine", engine)
+    monkeypatch.setattr(migrate, "engine", engine)
+    monkeypatch.setattr(migrate, "DATABASE_URL", url)
+    yield engine
+    engine.dispose()
+
+
+def _revision(engine):
+    with engine.connect() as connection:
+        return connection.execute(text("SELECT version_num FROM alembic_version")).scalar()
+
+
+def _head():
+    from alembic.script import ScriptDirectory
+    return ScriptDirectory.from_config(migrate.alembic_config()).get_current_head()
+
+
+def _assert_current_schema(engine):
+    inspector = inspect(engine)
+    for table in Base.metadata.sorted_tables:
+        assert {column.name for column in table.columns} <= {column["name"] for column in inspector.get_columns(table.name)}, table.name
+        expected = {index.name for index in table.indexes}
+        if engine.dialect.name != "postgresql":
+            expected -= POSTGRESQL_ONLY_INDEXES
+        assert expected <= {index["name"] for index in inspector.get_indexes(table.name)}, table.name
+
+    with engine.begin() as connection:
+        counters = dict(connection.execute(text("SELECT kind, generation FROM revision_counters")).all())
+        assert set(counters) == {"customer", "machine", "material", "part"}
+        connection.execute(text("INSERT INTO customers (name) VALUES ('Migration test')"))
+        assert connection.execute(text("SELECT generation FROM revision_counters WHERE kind = 'customer'")).scalar() == counters["customer"] + 1
+
+
+def test_empty_database_upgrades_to_head(database):
+    migrate.upgrade_database()
+    assert _revision(database) == _head()
+    _assert_current_schema(database)
+
+
+def test_create_all_database_is_stamped_and_upgraded(database):
+    # The current models, created without migrations, already have every index and table
+    Base.metadata.create_all(database)
+    migrate.upgrade_database()
+    assert _revision(database) == _head()
+    _assert_current_schema(database)
+
+
+def test_baseline_database_without_history_is_upgraded(database):
+    # The schema as create_all made it before migrations existed
+    command.upgrade(migrate.alembic_config(), migrate.BASELINE_REVISION)
+    with database.begin() as connection:
+        connection.execute(text("DROP TABLE alembic_version"))
+    migrate.upgrade_database()
+    assert _revision(database) == _head()
+    _assert_current_schema(database)
+
+
+def test_downgrade_and_upgrade_again(database):
+    migrate.upgrade_database()
+    command.downgrade(migrate.alembic_config(), "0002")
+    assert "revision_counters" not in inspect(database).get_table_names()
+    migrate.upgrade_database()
+    _assert_current_schema(database)
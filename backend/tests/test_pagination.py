@@ -0,0 +1,47 @@
+from app.pagination import NEXT_CURSOR_HEADER, TOTAL_COUNT_HEADER
+
+
+def _all_pages(client, path, limit):
+    ids, cursor, pages = [], None, 0
+    while True:
+        params = {"limit": limit, **({"cursor": cursor} if cursor else {})}
+        response = client.get(path, params=params)
+        assert response.status_code == 200
+        page = response.json()
+        assert len(page) <= limit
+        ids.extend(row["id"] for row in page)
+        pages += 1
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if cursor is None:
+            return ids, pages
+
+
+def test_parts_pages_cover_every_part_once(client):
+    everything = client.get("/api/parts", params={"limit": 500, "include_total": True})
+    total = int(everything.headers[TOTAL_COUNT_HEADER])
+    assert total == len(everything.json())
+
+    ids, pages = _all_pages(client, "/api/parts", limit=4)
+    assert ids == sorted(ids)
+    assert len(ids) == len(set(ids)) == total
+    assert pages == -(-total // 4)
+
+
+def test_quotes_pages_cover_every_quote_once(client):
+    ids, _ = _all_pages(client, "/api/quotes", limit=3)
+    assert len(ids) == len(set(ids))
+    # Newest first
+    assert ids == sorted(ids, reverse=True)
+
+
+def test_filters_apply_across_pages(client):
+    material_id = client.get("/api/parts", params={"limit": 1}).json()[0]["material_id"]
+    ids, _ = _all_pages(client, f"/api/parts?material_id={material_id}", limit=1)
+    expected = [part["id"] for part in client.get("/api/parts", params={"limit": 500}).json() if part["material_id"] == material_id]
+    assert ids == expected
+
+
+def test_invalid_cursor_and_limit(client):
+    assert client.get("/api/parts", params={"cursor": "not-a-cursor"}).status_code == 400
+    assert client.get("/api/parts", params={"limit": 0}).status_code == 422
+    assert client.get("/api/parts", params={"limit": 501}).status_code == 422
@@ -0,0 +1,85 @@
+import pytest
+
+CALCULATE = {"part_id": 2, "quantity": 10, "margin_pct": 0.15}
+
+
+def _stats(client):
+    return client.get("/api/quotes/cache/stats").json()
+
+
+def _unit_cost(client):
+    return client.post("/api/quotes/calculate-detailed", json=CALCULATE).json()["summary"]["unit_cost"]
+
+
+def test_repeat_calculation_is_a_hit(client):
+    first = client.post("/api/quotes/calculate-detailed", json=CALCULATE)
+    hits = _stats(client)["hits"]
+    second = client.post("/api/quotes/calculate-detailed", json=CALCULATE)
+    assert second.content == first.content
+    assert _stats(client)["hits"] == hits + 1
+
+
+def test_part_update_invalidates(client):
+    before = _unit_cost(client)
+    weight = client.get("/api/parts/2").json()["stock_weight_lb"]
+    client.put("/api/parts/2", json={"stock_weight_lb": weight * 2})
+    try:
+        assert _unit_cost(client) > before
+    finally:
+        client.put("/api/parts/2", json={"stock_weight_lb": weight})
+    assert _unit_cost(client) == before
+
+
+def test_operation_update_invalidates(client):
+    before = _unit_cost(client)
+    operation = client.get("/api/parts/2").json()["operations"][0]
+    fields = {key: value for key, value in operation.items() if key not in ("id", "part_id")}
+    client.put(f"/api/parts/2/operations/{operation['id']}", json={**fields, "cycle_time_hr": fields["cycle_time_hr"] * 3})
+    try:
+        assert _unit_cost(client) > before
+    finally:
+        client.put(f"/api/parts/2/operations/{operation['id']}", json=fields)
+    assert _unit_cost(client) == before
+
+
+@pytest.mark.parametrize("sql", [
+    "UPDATE operations SET cycle_time_hr = cycle_time_hr * {factor} WHERE part_id = 2",
+    "UPDATE materials SET cost_per_lb = cost_per_lb * {factor}",
+    "UPDATE machines SET machine_rate_per_hr = machine_rate_per_hr * {factor}",
+])
+def test_write_outside_the_api_invalidates(client, execute, sql):
+    before = _unit_cost(client)
+    execute(sql.format(factor=2))
+    try:
+        assert _unit_cost(client) > before
+    finally:
+        execute(sql.format(factor=0.5))
+    assert _unit_cost(client) == pytest.approx(before)
+
+
+def test_overrides_price_unsaved_edits(client):
+    part = client.get("/api/parts/2").json()
+    operation = part["operations"][0]
+    before = client.post("/api/quotes/calculate-detailed", json=CALCULATE).json()
+
+    overrides = {
+        "operations": [{"id": operation["id"], "cycle_time_hr": operation["cycle_time_hr"] * 2}],
+        "material_cost_per_lb": {str(part["material_id"]): 100.0},
+    }
+    edited = client.post("/api/quotes/calculate-detailed", json={**CALCULATE, "overrides": overrides}).json()
+    assert edited["summary"]["unit_cost"] > before["summary"]["unit_cost"]
+
+    # Nothing was written and the cached result is untouched
+    assert client.get("/api/parts/2").json() == part
+    assert client.post("/api/quotes/calculate-detailed", json=CALCULATE).json() == before
+
+
+def test_overrides_reject_unknown_ids(client):
+    for overrides, detail in [
+        ({"operations": [{"id": 999999, "cycle_time_hr": 1}]}, "Operations [999999] do not belong to part 2"),
+        ({"machine_rates": {"999999": {"machine_rate_per_hr": 1}}}, "Machines [999999] not found"),
+        ({"material_cost_per_lb": {"999999": 1}}, "Materials [999999] not found"),
+    ]:
+        response = client.post("/api/quotes/calculate-detailed", json={**CALCULATE, "overrides": overrides})
+        assert response.status_code == 400
+        assert response.json()["detail"] == detail
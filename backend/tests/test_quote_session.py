@@ -0,0 +1,103 @@
+from app.routers import quote_session
+from app.routers.quote_session import REMOVED_KEY, diff
+
+
+def _subscribe(ws, **message):
+    ws.send_json({"type": "subscribe", "seq": 1, "part_id": 3, "quantity": 10, **message})
+    snapshot = ws.receive_json()
+    assert snapshot["type"] == "snapshot"
+    return snapshot
+
+
+def test_diff_sends_only_changes():
+    old = {"summary": {"unit_cost": 1.0, "unit_price": 1.15}, "operations": [1], "gone": 0}
+    new = {"summary": {"unit_cost": 2.0, "unit_price": 1.15}, "operations": [1]}
+    assert diff(old, new) == {"summary": {"unit_cost": 2.0}, REMOVED_KEY: ["gone"]}
+    assert diff(new, new) == {}
+
+
+def test_snapshot_matches_calculate_full(client):
+    expected = client.post("/api/quotes/calculate-full", json={"part_id": 3, "quantity": 10, "margin_pct": 0.15}).json()
+    with client.websocket_connect("/ws/quote-session") as ws:
+        snapshot = _subscribe(ws)
+    assert snapshot["seq"] == 1
+    assert snapshot["lines"][0]["result"] == expected
+
+
+def test_update_answers_with_a_delta(client):
+    with client.websocket_connect("/ws/quote-session") as ws:
+        result = _subscribe(ws)["lines"][0]["result"]
+        ws.send_json({"type": "update", "seq": 2, "quantity": 100})
+        delta = ws.receive_json()
+        assert delta["type"] == "delta" and delta["seq"] == 2
+        line = delta["lines"]["0"]
+        assert line["detailed"]["summary"]["quantity"] == 100
+        assert line["summary"]["unit_cost"] < result["summary"]["unit_cost"]
+
+        # No change, no fields
+        ws.send_json({"type": "update", "seq": 3, "quantity": 100})
+        assert ws.receive_json() == {"type": "delta", "seq": 3, "lines": {}}
+
+
+def test_overrides_accumulate_until_reset(client):
+    with client.websocket_connect("/ws/quote-session") as ws:
+        base = _subscribe(ws)["lines"][0]["result"]["summary"]["unit_cost"]
+        ws.send_json({"type": "update", "seq": 2, "overrides": {"part": {"stock_weight_lb": 100}}})
+        heavier = ws.receive_json()["lines"]["0"]["summary"]["unit_cost"]
+        ws.send_json({"type": "update", "seq": 3, "overrides": {"part": {"scrap_factor": 0.5}}})
+        heavier_scrap = ws.receive_json()["lines"]["0"]["summary"]["unit_cost"]
+        assert base < heavier < heavier_scrap
+        ws.send_json({"type": "update", "seq": 4, "reset": True})
+        assert ws.receive_json()["lines"]["0"]["summary"]["unit_cost"] == base
+
+
+def test_invalid_messages_keep_the_session(client):
+    with client.websocket_connect("/ws/quote-session") as ws:
+        ws.send_json({"type": "update", "seq": 1})
+        assert ws.receive_json()["detail"] == "Subscribe before sending updates"
+        ws.send_text("not json")
+        assert ws.receive_json() == {"type": "error", "seq": None, "detail": "Message is not JSON"}
+        ws.send_bytes(b"{}")
+        assert ws.receive_json()["detail"] == "Binary frames are not supported"
+        _subscribe(ws)
+        ws.send_json({"type": "update", "seq": 2, "line": 5})
+        assert ws.receive_json() == {"type": "error", "seq": 2, "detail": "No line 5"}
+
+
+def test_write_by_another_worker_reprices(client, execute):
+    with client.websocket_connect("/ws/quote-session") as ws:
+        base = _subscribe(ws)["lines"][0]["result"]["summary"]["unit_cost"]
+        execute("UPDATE materials SET cost_per_lb = cost_per_lb * 2")
+        try:
+            ws.send_json({"type": "update", "seq": 2, "margin_pct": 0.15})
+            assert ws.receive_json()["lines"]["0"]["summary"]["unit_cost"] > base
+        finally:
+            execute("UPDATE materials SET cost_per_lb = cost_per_lb * 0.5")
+
+
+def test_machine_created_after_subscribe_is_accepted(client, execute):
+    with client.websocket_connect("/ws/quote-session") as ws:
+        _subscribe(ws)
+        machine_id = client.post("/api/machines", json={
+            "name": "Session test mill", "machine_type": "mill", "machine_rate_per_hr": 90, "labor_rate_per_hr": 40,
+        }).json()["id"]
+        try:
+            ws.send_json({"type": "update", "seq": 2, "overrides": {"machine_rates": {str(machine_id): {"machine_rate_per_hr": 95}}}})
+            assert ws.receive_json()["type"] == "delta"
+            ws.send_json({"type": "update", "seq": 3, "overrides": {"machine_rates": {"999999": {"machine_rate_per_hr": 95}}}})
+            assert ws.receive_json() == {"type": "error", "seq": 3, "detail": "Machines [999999] not found"}
+        finally:
+            execute("DELETE FROM machines WHERE id = :id", id=machine_id)
+
+
+def test_unexpected_failure_answers_with_an_error_frame(client, monkeypatch):
+    def fail(self, db, part_ids):
+        raise RuntimeError("database unavailable")
+
+    with client.websocket_connect("/ws/quote-session") as ws:
+        with monkeypatch.context() as patch:
+            patch.setattr(quote_session.QuoteSession, "load", fail)
+            ws.send_json({"type": "subscribe", "seq": 1, "part_id": 3})
+            assert ws.receive_json() == {"type": "error", "seq": 1, "detail": quote_session.INTERNAL_ERROR}
+        # The connection is still usable
+        _subscribe(ws)
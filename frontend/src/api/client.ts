@@ -141,6 +141,67 @@ export interface DetailedQuoteBreakdown {
   part_info: PartInfo
 }
 
+// Unsaved edits priced by calculate-detailed without writing anything
+export interface QuoteOverrides {
+  part?: Partial<Omit<Part, 'id' | 'operations'>>
+  operations?: (Partial<Omit<Operation, 'id'>> & { id: number })[]
+  add_operations?: Omit<Operation, 'id'>[]
+  remove_operations?: number[]
+  machine_rates?: Record<number, { machine_rate_per_hr?: number; labor_rate_per_hr?: number }>
+  material_cost_per_lb?: Record<number, number>
+}
+
+export type QuoteSection = 'summary' | 'detailed' | 'operations'
+
+export interface FullQuoteCalculation {
+  summary?: QuoteBreakdown
+  detailed?: DetailedQuoteBreakdown
+}
+
+export interface BatchCalculateItem {
+  part_id?: number
+  part_number?: string
+  quantities: number[]
+  margin_pct?: number
+}
+
+export interface BatchCalculateResult {
+  index: number
+  part_id?: number
+  part_number?: string
+  description?: string
+  material_name?: string
+  results?: Partial<DetailedQuoteBreakdown>[]
+  error?: string
+}
+
+export interface PriceCurveColumns {
+  quantity: number[]
+  unit_cost: number[]
+  unit_price: number[]
+  extended_cost: number[]
+  extended_price: number[]
+  fixed_share_pct: number[]
+}
+
+export interface OptimalBatch {
+  fixed_share_target_pct: number
+  break_even_quantity: number | null
+  economic_order_quantity: number | null
+  suggested_batch_size: number | null
+}
+
+export interface PriceCurve {
+  part_info: PartInfo
+  margin_pct: number
+  cost_model: {
+    fixed: Record<string, number>
+    per_unit: Record<string, number>
+  }
+  price_breaks: PriceCurveColumns
+  optimal_batch: OptimalBatch
+}
+
 export interface QuoteItem {
   id: number
   part_id: number
@@ -151,6 +212,17 @@ export interface QuoteItem {
   labor_cost_unit: number
   unit_cost: number
   unit_price: number
+  tooling_cost_unit: number
+  programming_cost_unit: number
+  inspection_cost_unit: number
+  consumables_cost_unit: number
+  overhead_cost_unit: number
+  setup_time_per_part: number
+  cycle_time_per_part: number
+  allowance_time_per_part: number
+  total_time_per_part: number
+  // Present with detail=full; null for quotes saved before breakdowns were stored
+  breakdown?: DetailedQuoteBreakdown | null
 }
 
 export interface Quote {
@@ -162,6 +234,24 @@ export interface Quote {
   items: QuoteItem[]
 }
 
+export interface QuoteViewPart {
+  id: number
+  part_number: string
+  description?: string
+  material_id: number
+  material_name: string
+}
+
+export interface QuoteViewItem extends QuoteItem {
+  part: QuoteViewPart
+}
+
+// Everything the quote page shows: quote, customer, items with their part and stored breakdown
+export interface QuoteView extends Omit<Quote, 'items'> {
+  customer: Customer
+  items: QuoteViewItem[]
+}
+
 async function fetchJSON<T>(path: string, options?: RequestInit): Promise<T> {
   const res = await fetch(`${API_BASE}${path}`, {
     ...options,
@@ -179,9 +269,61 @@ async function fetchJSON<T>(path: string, options?: RequestInit): Promise<T> {
   return res.json()
 }
 
+export interface Page<T> {
+  items: T[]
+  nextCursor: string | null
+  total: number | null
+}
+
+export interface PageQuery {
+  limit?: number
+  cursor?: string | null
+  include_total?: boolean
+  [filter: string]: string | number | boolean | null | undefined
+}
+
+// List endpoints return one page as an array; the cursor and total count come back as headers
+async function fetchPage<T>(path: string, query: PageQuery = {}): Promise<Page<T>> {
+  const params = new URLSearchParams()
+  Object.entries(query).forEach(([key, value]) => {
+    if (value !== undefined && value !== null && value !== '') params.set(key, String(value))
+  })
+
+  const res = await fetch(`${API_BASE}${path}?${params}`, {
+    headers: { 'Content-Type': 'application/json' },
+  })
+
+  if (!res.ok) {
+    const text = await res.text()
+    throw new Error(text || `HTTP ${res.status}`)
+  }
+
+  const total = res.headers.get('X-Total-Count')
+  return {
+    items: await res.json(),
+    nextCursor: res.headers.get('X-Next-Cursor'),
+    total: total === null ? null : parseInt(total),
+  }
+}
+
+// Largest page the API serves
+const MAX_PAGE_SIZE = 500
+
+// Every row of a list endpoint, following X-Next-Cursor page by page; for catalogs and pickers
+async function fetchAll<T>(path: string, query: PageQuery = {}): Promise<T[]> {
+  const items: T[] = []
+  let cursor: string | null = null
+  do {
+    const page: Page<T> = await fetchPage<T>(path, { ...query, limit: MAX_PAGE_SIZE, cursor })
+    items.push(...page.items)
+    cursor = page.nextCursor
+  } while (cursor)
+  return items
+}
+
 export const api = {
   // Customers
-  getCustomers: () => fetchJSON<Customer[]>('/api/customers'),
+  getCustomers: () => fetchAll<Customer>('/api/customers'),
   createCustomer: (data: Omit<Customer, 'id'>) =>
     fetchJSON<Customer>('/api/customers', {
       method: 'POST',
@@ -189,7 +331,7 @@ export const api = {
     }),
 
   // Materials
-  getMaterials: () => fetchJSON<Material[]>('/api/materials'),
+  getMaterials: () => fetchAll<Material>('/api/materials'),
   createMaterial: (data: Omit<Material, 'id'>) =>
     fetchJSON<Material>('/api/materials', {
       method: 'POST',
@@ -197,7 +339,7 @@ export const api = {
     }),
 
   // Machines
-  getMachines: () => fetchJSON<Machine[]>('/api/machines'),
+  getMachines: () => fetchAll<Machine>('/api/machines'),
   createMachine: (data: Omit<Machine, 'id'>) =>
     fetchJSON<Machine>('/api/machines', {
       method: 'POST',
@@ -205,7 +347,9 @@ export const api = {
     }),
 
   // Parts
-  getParts: () => fetchJSON<Part[]>('/api/parts'),
+  getParts: () => fetchAll<Part>('/api/parts'),
+  getPartsPage: (query: PageQuery & { part_number_prefix?: string; material_id?: number }) =>
+    fetchPage<Part>('/api/parts', query),
   getPart: (id: number) => fetchJSON<Part>(`/api/parts/${id}`),
   createPart: (data: Omit<Part, 'id'>) =>
     fetchJSON<Part>('/api/parts', {
@@ -230,14 +374,53 @@ export const api = {
       body: JSON.stringify(data),
     }),
 
-  calculateDetailedQuote: (data: { part_id: number; quantity: number; margin_pct: number }) =>
+  calculateDetailedQuote: (data: {
+    part_id: number
+    quantity: number
+    margin_pct: number
+    overrides?: QuoteOverrides
+  }, signal?: AbortSignal) =>
     fetchJSON<DetailedQuoteBreakdown>('/api/quotes/calculate-detailed', {
       method: 'POST',
       body: JSON.stringify(data),
+      signal,
+    }),
+
+  calculateFullQuote: (data: {
+    part_id: number
+    quantity: number
+    margin_pct: number
+    include?: QuoteSection[]
+  }) =>
+    fetchJSON<FullQuoteCalculation>('/api/quotes/calculate-full', {
+      method: 'POST',
+      body: JSON.stringify(data),
+    }),
+
+  calculateBatch: (items: BatchCalculateItem[], detail: 'summary' | 'full' = 'full') =>
+    fetchJSON<BatchCalculateResult[]>('/api/quotes/calculate-batch', {
+      method: 'POST',
+      body: JSON.stringify({ items, detail }),
+    }),
+
+  getPriceCurve: (data: {
+    part_id: number
+    margin_pct: number
+    quantities?: number[]
+    quantity_range?: { start: number; stop: number; step?: number }
+    annual_demand?: number
+  }) =>
+    fetchJSON<PriceCurve>('/api/quotes/price-curve', {
+      method: 'POST',
+      body: JSON.stringify(data),
     }),
 
   getQuotes: () => fetchJSON<Quote[]>('/api/quotes'),
-  getQuote: (id: number) => fetchJSON<Quote>(`/api/quotes/${id}`),
+  getQuotesPage: (query: PageQuery & { status?: string; customer_id?: number }) =>
+    fetchPage<Quote>('/api/quotes', query),
+  getQuote: (id: number, detail: 'summary' | 'full' = 'summary') =>
+    fetchJSON<Quote>(`/api/quotes/${id}?detail=${detail}`),
+  getQuoteView: (id: number) => fetchJSON<QuoteView>(`/api/quotes/${id}/view`),
   createQuote: (data: {
     customer_id: number
     notes?: string
@@ -0,0 +1,124 @@
+import { useEffect, useRef, useState } from 'react'
+import { FullQuoteCalculation, QuoteOverrides, QuoteSection } from './client'
+
+const API_BASE = import.meta.env.VITE_API_BASE || 'http://localhost:8000'
+const SESSION_URL = `${API_BASE.replace(/^http/, 'ws')}/ws/quote-session`
+
+interface SessionLine {
+  part_id: number
+  quantity: number
+  margin_pct: number
+  result: FullQuoteCalculation
+}
+
+type ServerMessage =
+  | { type: 'snapshot'; seq: number | null; lines: SessionLine[] }
+  | { type: 'delta'; seq: number | null; lines: Record<string, Record<string, unknown>> }
+  | { type: 'error'; seq: number | null; detail: unknown }
+
+// Keys a delta object drops are listed under this key (never a result field)
+const REMOVED_KEY = '$removed'
+
+const isObject = (value: unknown): value is Record<string, unknown> =>
+  typeof value === 'object' && value !== null && !Array.isArray(value)
+
+// Apply a delta: nested objects change key by key, anything else (null included) replaces
+function applyDelta<T>(target: T, changes: Record<string, unknown>): T {
+  const result: Record<string, unknown> = { ...(target as Record<string, unknown>) }
+  Object.entries(changes).forEach(([key, value]) => {
+    if (key === REMOVED_KEY) {
+      ;(value as string[]).forEach((removed) => delete result[removed])
+    } else if (isObject(value) && isObject(result[key])) {
+      result[key] = applyDelta(result[key], value)
+    } else {
+      result[key] = value
+    }
+  })
+  return result as T
+}
+
+interface Options {
+  partId: number | null
+  quantity: number
+  marginPct: number
+  include: QuoteSection[]
+  overrides?: QuoteOverrides
+}
+
+/**
+ * Live pricing of one part over /ws/quote-session.
+ *
+ * Subscribes when the part changes and sends only the edited inputs
+ * afterwards; the server answers with the breakdown fields that changed.
+ */
+export function useQuoteSession({ partId, quantity, marginPct, include, overrides }: Options) {
+  const [result, setResult] = useState<FullQuoteCalculation | null>(null)
+  const [error, setError] = useState<string | null>(null)
+  const socket = useRef<WebSocket | null>(null)
+  const seq = useRef(0)
+  const sent = useRef({ quantity, marginPct, include: include.join(), overrides })
+  // The inputs as of the latest render, for the socket's open handler
+  const latest = useRef({ quantity, marginPct, include, overrides })
+  latest.current = { quantity, marginPct, include, overrides }
+
+  // One connection per part: subscribe with the inputs current when it opens
+  useEffect(() => {
+    setResult(null)
+    if (!partId) return
+    const ws = new WebSocket(SESSION_URL)
+    socket.current = ws
+    ws.onopen = () => {
+      const { quantity, marginPct, include, overrides } = latest.current
+      sent.current = { quantity, marginPct, include: include.join(), overrides }
+      ws.send(
+        JSON.stringify({ type: 'subscribe', part_id: partId, quantity, margin_pct: marginPct, include })
+      )
+      if (overrides) {
+        seq.current += 1
+        ws.send(JSON.stringify({ type: 'update', seq: seq.current, line: 0, reset: true, overrides }))
+      }
+    }
+    ws.onmessage = (event) => {
+      const message: ServerMessage = JSON.parse(event.data)
+      if (message.type === 'snapshot') {
+        setResult(message.lines[0].result)
+        setError(null)
+      } else if (message.type === 'delta') {
+        const changes = message.lines['0']
+        if (changes) setResult((current) => (current ? applyDelta(current, changes) : current))
+        setError(null)
+      } else {
+        setError(typeof message.detail === 'string' ? message.detail : JSON.stringify(message.detail))
+      }
+    }
+    ws.onerror = () => setError('Live pricing connection failed')
+    return () => {
+      ws.close()
+      socket.current = null
+    }
+    // Inputs changing later are sent as updates below
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, [partId])
+
+  // Send only the inputs that changed since the last message
+  useEffect(() => {
+    const ws = socket.current
+    if (!ws || ws.readyState !== WebSocket.OPEN || !(quantity > 0)) return
+    const update: Record<string, unknown> = { type: 'update', line: 0 }
+    if (quantity !== sent.current.quantity) update.quantity = quantity
+    if (marginPct !== sent.current.marginPct) update.margin_pct = marginPct
+    if (include.join() !== sent.current.include) update.include = include
+    if (overrides !== sent.current.overrides) {
+      // Overrides are the full set of unsaved edits, so replace the previous ones
+      update.reset = true
+      update.overrides = overrides ?? {}
+    }
+    if (Object.keys(update).length === 2) return
+    seq.current += 1
+    update.seq = seq.current
+    sent.current = { quantity, marginPct, include: include.join(), overrides }
+    ws.send(JSON.stringify(update))
+  }, [quantity, marginPct, include, overrides])
+
+  return { result, error }
+}
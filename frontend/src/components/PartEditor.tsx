@@ -1,4 +1,4 @@
-import { useState } from 'react'
+import { useEffect, useState } from 'react'
 import {
   Box,
   Button,
@@ -18,7 +18,7 @@ import {
 } from '@mui/material'
 import { ExpandMore, Delete, Add } from '@mui/icons-material'
 import { useMutation, useQueryClient, useQuery } from '@tanstack/react-query'
-import { api, Part, Machine } from '../api/client'
+import { api, Part, Machine, DetailedQuoteBreakdown } from '../api/client'
 
 interface Props {
   part: Part | null
@@ -26,6 +26,9 @@ interface Props {
   onClose: () => void
 }
 
+// Wait for typing to pause before re-pricing the preview
+const PREVIEW_DELAY_MS = 300
+
 const OPERATION_TYPES = [
   { value: 'roughing', label: 'Roughing' },
   { value: 'finishing', label: 'Finishing' },
@@ -57,6 +60,36 @@ export default function PartEditor({ part, open, onClose }: Props) {
     queryFn: api.getMachines,
   })
 
+  // Live price preview of the unsaved edits (priced server-side, nothing is written)
+  const [previewQuantity, setPreviewQuantity] = useState(100)
+  const [preview, setPreview] = useState<DetailedQuoteBreakdown | null>(null)
+
+  useEffect(() => {
+    if (!part || !open || !(previewQuantity > 0)) return
+    // Aborted when the inputs change again, so a slow stale response cannot overwrite a newer one
+    const controller = new AbortController()
+    const timer = setTimeout(() => {
+      api
+        .calculateDetailedQuote(
+          {
+            part_id: part.id,
+            quantity: previewQuantity,
+            margin_pct: 0.15,
+            overrides: { part: partData, operations },
+          },
+          controller.signal
+        )
+        .then(setPreview)
+        .catch(() => {
+          if (!controller.signal.aborted) setPreview(null)
+        })
+    }, PREVIEW_DELAY_MS)
+    return () => {
+      clearTimeout(timer)
+      controller.abort()
+    }
+  }, [part, open, partData, operations, previewQuantity])
+
   const updateMutation = useMutation({
     mutationFn: async (data: any) => {
       if (!part) return
@@ -208,6 +241,36 @@ export default function PartEditor({ part, open, onClose }: Props) {
 
         <Divider sx={{ my: 3 }} />
 
+        {/* Price preview of the unsaved edits */}
+        <Box sx={{ display: 'flex', alignItems: 'center', gap: 3, mb: 1 }}>
+          <TextField
+            label="Preview Quantity"
+            type="number"
+            size="small"
+            value={previewQuantity}
+            onChange={(e) => setPreviewQuantity(parseInt(e.target.value))}
+            inputProps={{ min: 1 }}
+          />
+          {preview && (
+            <>
+              <Typography>
+                Unit Cost: <strong>${preview.summary.unit_cost.toFixed(2)}</strong>
+              </Typography>
+              <Typography>
+                Unit Price: <strong>${preview.summary.unit_price.toFixed(2)}</strong>
+              </Typography>
+              <Typography>
+                Extended: <strong>${preview.summary.extended_price.toFixed(2)}</strong>
+              </Typography>
+              <Typography color="text.secondary">
+                {preview.time_breakdown.total_time_per_part.toFixed(3)} hr/part
+              </Typography>
+            </>
+          )}
+        </Box>
+
+        <Divider sx={{ my: 3 }} />
+
         {/* Operations */}
         <Typography variant="h6" sx={{ mb: 2 }}>
           Operations
@@ -1,5 +1,5 @@
 import { useState } from 'react'
-import { useQuery } from '@tanstack/react-query'
+import { useInfiniteQuery } from '@tanstack/react-query'
 import {
   Box,
   Button,
@@ -8,21 +8,36 @@ import {
   CardActions,
   Chip,
   Grid,
+  TextField,
   Typography,
 } from '@mui/material'
 import { Edit, Settings } from '@mui/icons-material'
 import { api, Part } from '../api/client'
 import PartEditor from '../components/PartEditor'
 
+const PAGE_SIZE = 50
+
 export default function Parts() {
   const [selectedPart, setSelectedPart] = useState<Part | null>(null)
   const [editorOpen, setEditorOpen] = useState(false)
+  const [partNumberPrefix, setPartNumberPrefix] = useState('')
 
-  const { data: parts = [], isLoading } = useQuery({
-    queryKey: ['parts'],
-    queryFn: api.getParts,
+  const { data, isLoading, fetchNextPage, hasNextPage, isFetchingNextPage } = useInfiniteQuery({
+    queryKey: ['parts', 'pages', partNumberPrefix],
+    queryFn: ({ pageParam }) =>
+      api.getPartsPage({
+        cursor: pageParam,
+        limit: PAGE_SIZE,
+        include_total: pageParam === null,
+        part_number_prefix: partNumberPrefix,
+      }),
+    initialPageParam: null as string | null,
+    getNextPageParam: (lastPage) => lastPage.nextCursor,
   })
 
+  const parts = data?.pages.flatMap((page) => page.items) ?? []
+  const total = data?.pages[0]?.total
+
   const handleEdit = (part: Part) => {
     setSelectedPart(part)
     setEditorOpen(true)
@@ -33,8 +48,6 @@ export default function Parts() {
     setSelectedPart(null)
   }
 
-  if (isLoading) return <Typography>Loading...</Typography>
-
   return (
     <Box>
       <Box sx={{ display: 'flex', justifyContent: 'space-between', alignItems: 'center', mb: 3 }}>
@@ -44,6 +57,22 @@ export default function Parts() {
         </Typography>
       </Box>
 
+      <Box sx={{ display: 'flex', alignItems: 'center', gap: 2, mb: 3 }}>
+        <TextField
+          size="small"
+          label="Part number starts with"
+          value={partNumberPrefix}
+          onChange={(e) => setPartNumberPrefix(e.target.value)}
+        />
+        {total != null && (
+          <Typography variant="body2" color="text.secondary">
+            Showing {parts.length} of {total}
+          </Typography>
+        )}
+      </Box>
+
+      {isLoading && <Typography>Loading...</Typography>}
+
       <Grid container spacing={2}>
         {parts.map((part) => (
           <Grid item xs={12} md={6} lg={4} key={part.id}>
@@ -109,6 +138,14 @@ export default function Parts() {
         ))}
       </Grid>
 
+      {hasNextPage && (
+        <Box sx={{ display: 'flex', justifyContent: 'center', mt: 3 }}>
+          <Button variant="outlined" onClick={() => fetchNextPage()} disabled={isFetchingNextPage}>
+            {isFetchingNextPage ? 'Loading...' : 'Load more'}
+          </Button>
+        </Box>
+      )}
+
       <PartEditor
         part={selectedPart}
         open={editorOpen}
@@ -1,4 +1,4 @@
-import { useState, useEffect } from 'react'
+import { useState } from 'react'
 import { useQuery, useMutation, useQueryClient } from '@tanstack/react-query'
 import { useNavigate } from 'react-router-dom'
 import {
@@ -17,7 +17,8 @@ import {
   ToggleButtonGroup,
 } from '@mui/material'
 import { Save, ViewList, ViewModule } from '@mui/icons-material'
-import { api, QuoteBreakdown, DetailedQuoteBreakdown } from '../api/client'
+import { api, QuoteBreakdown, DetailedQuoteBreakdown, QuoteSection } from '../api/client'
+import { useQuoteSession } from '../api/quoteSession'
 import CostBreakdown from '../components/CostBreakdown'
 import DetailedCostBreakdown from '../components/DetailedCostBreakdown'
 
@@ -30,8 +31,6 @@ export default function QuoteBuilder() {
   const [quantity, setQuantity] = useState(100)
   const [marginPct, setMarginPct] = useState(0.15)
   const [notes, setNotes] = useState('')
-  const [breakdown, setBreakdown] = useState<QuoteBreakdown | null>(null)
-  const [detailedBreakdown, setDetailedBreakdown] = useState<DetailedQuoteBreakdown | null>(null)
   const [viewMode, setViewMode] = useState<'simple' | 'detailed'>('detailed')
   const [error, setError] = useState('')
 
@@ -56,31 +55,19 @@ export default function QuoteBuilder() {
     },
   })
 
-  // Real-time calculation
-  useEffect(() => {
-    if (partId && quantity > 0) {
-      const params = {
-        part_id: partId as number,
-        quantity,
-        margin_pct: marginPct,
-      }
-
-      // Fetch simple breakdown
-      api
-        .calculateQuote(params)
-        .then(setBreakdown)
-        .catch(() => setBreakdown(null))
-
-      // Fetch detailed breakdown
-      api
-        .calculateDetailedQuote(params)
-        .then(setDetailedBreakdown)
-        .catch(() => setDetailedBreakdown(null))
-    } else {
-      setBreakdown(null)
-      setDetailedBreakdown(null)
-    }
-  }, [partId, quantity, marginPct])
+  // Real-time calculation over a live pricing session: edits are sent as deltas
+  // and only the changed breakdown fields come back
+  const include: QuoteSection[] =
+    viewMode === 'detailed' ? ['summary', 'detailed', 'operations'] : ['summary']
+  const { result, error: pricingError } = useQuoteSession({
+    partId: partId ? (partId as number) : null,
+    quantity,
+    marginPct,
+    include,
+  })
+  const breakdown: QuoteBreakdown | null = (quantity > 0 && result?.summary) || null
+  const detailedBreakdown: DetailedQuoteBreakdown | null =
+    (quantity > 0 && viewMode === 'detailed' && result?.detailed) || null
 
   const handleSave = () => {
     if (!customerId || !partId) {
@@ -113,6 +100,12 @@ export default function QuoteBuilder() {
         </Alert>
       )}
 
+      {pricingError && (
+        <Alert severity="warning" sx={{ mb: 2 }}>
+          Live pricing: {pricingError}
+        </Alert>
+      )}
+
       <Card sx={{ mb: 3 }}>
         <CardContent>
           <Typography variant="h6" sx={{ mb: 2 }}>
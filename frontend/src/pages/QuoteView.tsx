@@ -1,6 +1,9 @@
 import { useQuery } from '@tanstack/react-query'
 import { useParams, useNavigate } from 'react-router-dom'
 import {
+  Accordion,
+  AccordionDetails,
+  AccordionSummary,
   Box,
   Button,
   Card,
@@ -17,24 +20,20 @@ import {
   TableRow,
   Typography,
 } from '@mui/material'
-import { ArrowBack } from '@mui/icons-material'
+import { ArrowBack, ExpandMore } from '@mui/icons-material'
 import { api } from '../api/client'
+import DetailedCostBreakdown from '../components/DetailedCostBreakdown'
 
 export default function QuoteView() {
   const { id } = useParams<{ id: string }>()
   const navigate = useNavigate()
 
   const { data: quote, isLoading } = useQuery({
-    queryKey: ['quote', id],
-    queryFn: () => api.getQuote(parseInt(id!)),
+    queryKey: ['quote-view', id],
+    queryFn: () => api.getQuoteView(parseInt(id!)),
     enabled: !!id,
   })
 
-  const { data: parts = [] } = useQuery({
-    queryKey: ['parts'],
-    queryFn: api.getParts,
-  })
-
   if (isLoading) return <Typography>Loading...</Typography>
   if (!quote) return <Typography>Quote not found</Typography>
 
@@ -52,7 +51,7 @@ export default function QuoteView() {
           <Box sx={{ display: 'flex', justifyContent: 'space-between', alignItems: 'start', mb: 2 }}>
             <Box>
               <Typography variant="h4">{quote.quote_number || `Quote #${quote.id}`}</Typography>
-              <Typography color="text.secondary">Customer ID: {quote.customer_id}</Typography>
+              <Typography color="text.secondary">{quote.customer.name}</Typography>
             </Box>
             <Chip label={quote.status} color="primary" />
           </Box>
@@ -82,12 +81,12 @@ export default function QuoteView() {
           </TableHead>
           <TableBody>
             {quote.items.map((item) => {
-              const part = parts.find((p) => p.id === item.part_id)
+              const { part } = item
               return (
                 <TableRow key={item.id}>
                   <TableCell>
-                    {part?.part_number || `Part #${item.part_id}`}
-                    {part?.description && (
+                    {part.part_number}
+                    {part.description && (
                       <Typography variant="caption" display="block" color="text.secondary">
                         {part.description}
                       </Typography>
@@ -113,6 +112,29 @@ export default function QuoteView() {
         </Table>
       </TableContainer>
 
+      {/* Breakdowns stored when the quote was saved */}
+      {quote.items.some((item) => item.breakdown) && (
+        <Box sx={{ mb: 3 }}>
+          <Typography variant="h6" sx={{ mb: 1 }}>
+            Detailed Breakdown
+          </Typography>
+          {quote.items.map((item) =>
+            item.breakdown ? (
+              <Accordion key={item.id}>
+                <AccordionSummary expandIcon={<ExpandMore />}>
+                  <Typography>
+                    {item.breakdown.part_info.part_number} &times; {item.quantity}
+                  </Typography>
+                </AccordionSummary>
+                <AccordionDetails>
+                  <DetailedCostBreakdown breakdown={item.breakdown} />
+                </AccordionDetails>
+              </Accordion>
+            ) : null
+          )}
+        </Box>
+      )}
+
       <Grid container spacing={2}>
         <Grid item xs={12} md={6}>
           <Card>
@@ -1,4 +1,5 @@
-import { useQuery } from '@tanstack/react-query'
+import { useState } from 'react'
+import { useInfiniteQuery } from '@tanstack/react-query'
 import { useNavigate } from 'react-router-dom'
 import {
   Box,
@@ -6,20 +7,38 @@ import {
   Card,
   CardContent,
   Chip,
+  FormControl,
   Grid,
+  InputLabel,
+  MenuItem,
+  Select,
   Typography,
 } from '@mui/material'
 import { Add } from '@mui/icons-material'
 import { api } from '../api/client'
 
+const PAGE_SIZE = 30
+
 export default function Quotes() {
   const navigate = useNavigate()
+  const [status, setStatus] = useState('')
 
-  const { data: quotes = [], isLoading } = useQuery({
-    queryKey: ['quotes'],
-    queryFn: api.getQuotes,
+  const { data, isLoading, fetchNextPage, hasNextPage, isFetchingNextPage } = useInfiniteQuery({
+    queryKey: ['quotes', 'pages', status],
+    queryFn: ({ pageParam }) =>
+      api.getQuotesPage({
+        cursor: pageParam,
+        limit: PAGE_SIZE,
+        include_total: pageParam === null,
+        status,
+      }),
+    initialPageParam: null as string | null,
+    getNextPageParam: (lastPage) => lastPage.nextCursor,
   })
 
+  const quotes = data?.pages.flatMap((page) => page.items) ?? []
+  const total = data?.pages[0]?.total
+
   if (isLoading) return <Typography>Loading...</Typography>
 
   return (
@@ -35,6 +54,23 @@ export default function Quotes() {
         </Button>
       </Box>
 
+      <Box sx={{ display: 'flex', alignItems: 'center', gap: 2, mb: 3 }}>
+        <FormControl size="small" sx={{ minWidth: 160 }}>
+          <InputLabel>Status</InputLabel>
+          <Select value={status} label="Status" onChange={(e) => setStatus(e.target.value)}>
+            <MenuItem value="">All</MenuItem>
+            <MenuItem value="draft">Draft</MenuItem>
+            <MenuItem value="sent">Sent</MenuItem>
+            <MenuItem value="approved">Approved</MenuItem>
+          </Select>
+        </FormControl>
+        {total != null && (
+          <Typography variant="body2" color="text.secondary">
+            Showing {quotes.length} of {total}
+          </Typography>
+        )}
+      </Box>
+
       <Grid container spacing={2}>
         {quotes.map((quote) => (
           <Grid item xs={12} md={6} lg={4} key={quote.id}>
@@ -69,6 +105,14 @@ export default function Quotes() {
         ))}
       </Grid>
 
+      {hasNextPage && (
+        <Box sx={{ display: 'flex', justifyContent: 'center', mt: 3 }}>
+          <Button variant="outlined" onClick={() => fetchNextPage()} disabled={isFetchingNextPage}>
+            {isFetchingNextPage ? 'Loading...' : 'Load more'}
+          </Button>
+        </Box>
+      )}
+
       {quotes.length === 0 && (
         <Card>
           <CardContent>